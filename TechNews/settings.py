@@ -42,11 +42,13 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters'
 ]
 
 MIDDLEWARE = [
+    'news.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -139,11 +141,67 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 50
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The cache holds the data generation, crawl progress and response cache shared by the API and
+# Celery processes, so deployments set CACHE_URL; the per-process LocMemCache suits tests only.
+
+if os.environ.get('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached news or tag response is kept; responses are invalidated earlier on data changes.
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 10 * 60))
+# Number of rows the streaming news export reads from the database cursor at a time.
+API_EXPORT_CHUNK_SIZE = int(os.environ.get('API_EXPORT_CHUNK_SIZE', 2000))
+
+# Requests slower than this many milliseconds are logged with their slowest SQL; an empty value disables the log.
+API_SLOW_REQUEST_MS = os.environ.get('API_SLOW_REQUEST_MS', '500').strip()
+API_SLOW_REQUEST_MS = float(API_SLOW_REQUEST_MS) if API_SLOW_REQUEST_MS else None
+
+# Crawler
+# 'selenium' drives a headless Chrome; 'http' downloads pages concurrently and falls back to Selenium.
+CRAWLER_ENGINE = os.environ.get('CRAWLER_ENGINE', 'selenium')
+CRAWLER_HTTP_CONCURRENCY = int(os.environ.get('CRAWLER_HTTP_CONCURRENCY', 8))
+CRAWLER_HTTP_TIMEOUT = float(os.environ.get('CRAWLER_HTTP_TIMEOUT', 15))
+# Warm browsers kept per worker process and the number of pages after which a browser is restarted.
+CRAWLER_BROWSER_POOL_SIZE = int(os.environ.get('CRAWLER_BROWSER_POOL_SIZE', 1))
+CRAWLER_BROWSER_MAX_PAGES = int(os.environ.get('CRAWLER_BROWSER_MAX_PAGES', 500))
+# Seconds a browser waits for the title or news links of a page to be rendered before reading its html.
+CRAWLER_BROWSER_RENDER_TIMEOUT = float(os.environ.get('CRAWLER_BROWSER_RENDER_TIMEOUT', 5))
+# Number of news links crawled by one task of a distributed (crawl --parallel) run.
+CRAWLER_FANOUT_BATCH_SIZE = int(os.environ.get('CRAWLER_FANOUT_BATCH_SIZE', 25))
+# Number of crawled news saved together in one transaction.
+CRAWLER_BATCH_SIZE = int(os.environ.get('CRAWLER_BATCH_SIZE', 50))
+# Max number of tag labels whose ids are cached by every crawler process.
+CRAWLER_TAG_CACHE_SIZE = int(os.environ.get('CRAWLER_TAG_CACHE_SIZE', 10000))
+# Directory keeping the html of crawled news pages for the reparse command; unset disables the snapshots.
+CRAWLER_SNAPSHOT_DIR = os.environ.get('CRAWLER_SNAPSHOT_DIR')
+CRAWLER_SNAPSHOT_SEGMENT_SIZE = int(os.environ.get('CRAWLER_SNAPSHOT_SEGMENT_SIZE', 64 * 1024 * 1024))
+# Number of days, today included, whose per-tag news counts are kept for the popular tags.
+TAG_DAILY_COUNT_DAYS = int(os.environ.get('TAG_DAILY_COUNT_DAYS', 30))
+
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+# Chords of distributed crawls need a result backend; the broker's Redis is used unless one is set.
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BEAT_SCHEDULE = {
     'crawl_zoomit_unseen_news': {
         'task': 'news.tasks.crawl_zoomit_unseen_news',
         'schedule': 3 * 60
+    },
+    'prune_tag_daily_counts': {
+        'task': 'news.tasks.prune_tag_daily_counts',
+        'schedule': 60 * 60
     }
 }
\ No newline at end of file
@@ -0,0 +1,14 @@
+#!/bin/bash
+# Removes the Prometheus multiprocess files which earlier processes of this container left in
+# PROMETHEUS_MULTIPROC_DIR, then runs the given command. The directory is shared by several
+# containers, so only the files named after this host (see news.metrics.process_identifier) are removed.
+
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    echo "Clearing the metrics of previous processes of $(hostname)."
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    rm -f "$PROMETHEUS_MULTIPROC_DIR"/*_"$(hostname)"-*.db
+fi
+
+if [ $# -gt 0 ]; then
+    exec "$@"
+fi
@@ -1,7 +1,9 @@
 #!/bin/bash
 
+./clear-metrics.sh
+
 echo "Apply database migrations."
 python manage.py migrate
 
 echo "Starting server"
-gunicorn TechNews.wsgi:application --bind 0.0.0.0:8000 --workers 3
\ No newline at end of file
+gunicorn TechNews.wsgi:application --config gunicorn.conf.py
\ No newline at end of file
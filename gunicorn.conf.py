@@ -0,0 +1,15 @@
+# Gunicorn configuration of the API server, used by docker-entrypoint.sh.
+# https://docs.gunicorn.org/en/stable/settings.html
+import os
+import socket
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 3))
+
+
+def child_exit(server, worker):
+    """Drops the live metrics of an exited worker from the Prometheus multiprocess directory."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        # Same file identifier as news.metrics.process_identifier.
+        multiprocess.mark_process_dead(f'{socket.gethostname()}-{worker.pid}')
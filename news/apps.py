@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
+        from .instrumentation import install_query_recorder
+        from django.db.backends.signals import connection_created
+        connection_created.connect(install_query_recorder, dispatch_uid='news.install_query_recorder')
@@ -0,0 +1,73 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.decorators import classonlymethod
+from django.views import View
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class AsyncReadOnlyView(View):
+    """
+    Asynchronous Django view serving the list or detail action of a read-only DRF viewset.
+    The viewset's queryset, filters, pagination, serializer, response cache and conditional
+    GET handling are reused, so responses are the same as those of the synchronous routes,
+    but pages, counts and objects are read through Django's async ORM and the cache through
+    its async API. Under an ASGI server a worker keeps serving other requests while one
+    waits for the database, so slow clients and long searches do not occupy a whole worker.
+    Filter validation (e.g. the ids of ``?tags=``) runs in a thread, as filtersets are synchronous.
+
+    Attributes:
+        viewset_class: Read-only viewset providing the queryset, filters, pagination and serializer.
+        action: 'list' or 'retrieve'.
+    """
+    viewset_class = None
+    action = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Async views are not CSRF protected by DRF's APIView.as_view, so it is disabled like there.
+        view.csrf_exempt = True
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        viewset = self.viewset_class(action_map={'get': self.action, 'head': self.action}, format_kwarg=None)
+        viewset.get = viewset.head = getattr(viewset, self.action)
+        viewset.renderer_classes = [JSONRenderer]
+        viewset.args, viewset.kwargs = args, kwargs
+        viewset.request = drf_request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.headers = viewset.default_response_headers
+
+        try:
+            # Authentication, permissions, throttling and content negotiation, as APIView.dispatch runs them.
+            await sync_to_async(viewset.initial)(drf_request, *args, **kwargs)
+            handler = self.list if self.action == 'list' else self.retrieve
+            response = await viewset.aconditional_response(
+                lambda request: viewset.acached_response(lambda request: handler(viewset, request), request),
+                drf_request
+            )
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+        return viewset.finalize_response(drf_request, response, *args, **kwargs)
+
+    @staticmethod
+    async def list(viewset, request):
+        queryset = await sync_to_async(viewset.filter_queryset)(viewset.get_queryset())
+        page = await viewset.paginator.apaginate_queryset(queryset, request, view=viewset)
+        serializer = viewset.get_serializer(page, many=True)
+        return viewset.get_paginated_response(serializer.data)
+
+    @staticmethod
+    async def retrieve(viewset, request):
+        queryset = await sync_to_async(viewset.filter_queryset)(viewset.get_queryset())
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        try:
+            instance = await queryset.filter(**{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]}).afirst()
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound()
+        if instance is None:
+            raise NotFound(f'No {queryset.model._meta.object_name} matches the given query.')
+
+        serializer = viewset.get_serializer(instance)
+        return Response(serializer.data)
@@ -0,0 +1,127 @@
+from news.models import News, Tag
+from news.pagination import KeysetPagination
+from news.utils.stage_timings import StageTimings
+from .database import QueryCounter
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from itertools import cycle, islice
+from random import Random
+from typing import Dict, List
+from urllib.parse import urlencode
+import time
+
+
+class ApiBenchmark:
+    """
+    Latency benchmark of the news API endpoints against the data of the current database.
+    Requests are served in-process by the Django test client, so the measured latency is
+    the time a gunicorn sync worker spends on a request, without network overhead. The
+    request paths of every scenario are picked from the stored data with a seeded random
+    generator, so runs over the same dataset request the same paths.
+
+    Attributes:
+        requests: Number of requests of every scenario.
+        warm_cache: Keeps cached responses between requests instead of measuring the uncached path.
+        depth: Relative position in the archive of the deep pagination scenarios.
+        seed: Seed of the random generator picking the request paths.
+        SCENARIOS: Request paths a run can take. 'deep_page' requests a page number at the given
+                   depth, 'deep_cursor' requests the keyset cursor of the same position.
+    """
+    SCENARIOS = ('news_list', 'news_detail', 'deep_page', 'deep_cursor', 'search', 'tag_filter', 'tag_list', 'popular_tags')
+    SAMPLES = 20
+
+    def __init__(self, requests=200, warm_cache=False, depth=0.9, seed=0) -> None:
+        self.requests = requests
+        self.warm_cache = warm_cache
+        self.depth = depth
+        self.seed = seed
+        self.client = Client(HTTP_HOST='localhost')
+        self.paths: Dict[str, List[str]] = {}
+
+    def prepare(self) -> None:
+        """Picks the request paths of every scenario from the stored news and tags."""
+        random = Random(self.seed)
+        news_list = reverse('news-list')
+        news = News.objects.order_by('-date', 'id')
+        count = news.count()
+        if not count:
+            raise ValueError('The database has no news to benchmark.')
+
+        bounds = News.objects.order_by('id').values_list('id', flat=True)
+        first, last = bounds.first(), bounds.last()
+        ids = [bounds.filter(id__gte=random.randint(first, last)).first() for _ in range(self.SAMPLES)]
+        titles = News.objects.filter(id__in=ids).values_list('title', flat=True)
+        words = sorted({word for title in titles for word in title.split() if len(word) > 2 and not word.isdigit()})
+        tags = Tag.objects.order_by('-news_count', 'id').values_list('id', flat=True)
+
+        offset = int((count - 1) * self.depth)
+        page_size = KeysetPagination.page_size
+        cursor = KeysetPagination.cursor_value(news.values_list('date', 'id')[offset])
+        self.paths = {
+            'news_list': [news_list],
+            'news_detail': [reverse('news-detail', args=[pk]) for pk in ids],
+            'deep_page': [f'{news_list}?{urlencode({"page": offset // page_size + 1})}'],
+            'deep_cursor': [f'{news_list}?{urlencode({"cursor": cursor})}'],
+            'search': [f'{news_list}?{urlencode({"search": word})}' for word in random.sample(words, min(len(words), self.SAMPLES))],
+            'tag_filter': [f'{news_list}?{urlencode({"tags": pk})}' for pk in tags[:self.SAMPLES]],
+            'tag_list': [reverse('tag-list')],
+            'popular_tags': [reverse('tag-popular'), f"{reverse('tag-popular')}?{urlencode({'sort': 'recent', 'days': 7})}"],
+        }
+
+    def run(self, scenario='news_list') -> Dict:
+        """Sends the requests of one scenario and returns their latency and query counts."""
+        if scenario not in self.SCENARIOS:
+            raise ValueError(f'Unknown scenario {scenario!r}.')
+        if not self.paths:
+            self.prepare()
+
+        latencies, queries, errors = [], [], 0
+        for path in islice(cycle(self.paths[scenario] or [None]), self.requests):
+            if path is None:
+                break  # e.g. no tags to filter by
+            if not self.warm_cache:
+                cache.clear()
+            counter = QueryCounter()
+            start = time.perf_counter()
+            with connection.execute_wrapper(counter):
+                response = self.client.get(path)
+            latencies.append(time.perf_counter() - start)
+            queries.append(counter.count)
+            errors += response.status_code != 200
+
+        ordered = sorted(latencies)
+        total = sum(ordered)
+        return {
+            'scenario': scenario,
+            'requests': len(ordered),
+            'errors': errors,
+            'p50_ms': StageTimings.percentile(ordered, 50) * 1000,
+            'p95_ms': StageTimings.percentile(ordered, 95) * 1000,
+            'p99_ms': StageTimings.percentile(ordered, 99) * 1000,
+            'mean_ms': total / len(ordered) * 1000 if ordered else 0.0,
+            # A sync worker serves one request at a time, so its throughput is the inverse of the mean latency.
+            'throughput_per_worker': len(ordered) / total if total else 0.0,
+            'queries_per_request': sum(queries) / len(queries) if queries else 0.0,
+            'max_queries': max(queries, default=0),
+        }
+
+
+def find_regressions(result, baseline, tolerance=0.15) -> List[str]:
+    """
+    Compares an API benchmark result with a baseline result of the same scenario and returns
+    a description of every metric which got worse by more than the tolerance.
+    """
+    regressions = []
+    for metric in ('p95_ms', 'p99_ms'):
+        if result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f'{metric} rose from {baseline[metric]:.2f} to {result[metric]:.2f}')
+    if result['throughput_per_worker'] < baseline['throughput_per_worker'] * (1 - tolerance):
+        regressions.append(
+            f"throughput_per_worker dropped from {baseline['throughput_per_worker']:.1f} "
+            f"to {result['throughput_per_worker']:.1f}"
+        )
+    if result['max_queries'] > baseline['max_queries']:
+        regressions.append(f"max_queries rose from {baseline['max_queries']} to {result['max_queries']}")
+    return regressions
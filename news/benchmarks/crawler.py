@@ -0,0 +1,91 @@
+from news.models import CrawlState, News, Tag
+from news.utils.crawlers import get_crawler
+from news.utils.tag_cache import get_tag_cache
+from .database import QueryCounter, flush_tables
+from .fixture_site import FixtureSite
+from django.db import connection
+from contextlib import redirect_stdout
+from typing import Dict, List
+import io
+import resource
+import time
+
+
+class CrawlerBenchmark:
+    """
+    End-to-end benchmark of a crawler engine. Every run empties the news tables, serves a
+    FixtureSite imitating the Zoomit archive from a local HTTP server and crawls it into
+    the database, measuring throughput, database queries and the crawler's stage timings.
+
+    Attributes:
+        engine: Crawler engine, a key of CRAWLER_ENGINES.
+        pages: Number of archive pages of the fixture site.
+        news_per_page: Number of news listed on every archive page.
+        crawler_kwargs: Keyword arguments of the crawler constructor.
+        SCENARIOS: Crawl paths a run can take. 'range' crawls every archive page by range,
+                   'unseen' crawls the archive from the first page until a stored news.
+    """
+    SCENARIOS = ('range', 'unseen')
+
+    def __init__(self, engine='http', pages=10, news_per_page=20, **crawler_kwargs) -> None:
+        self.engine = engine
+        self.pages = pages
+        self.news_per_page = news_per_page
+        self.crawler_kwargs = crawler_kwargs
+
+    def run(self, scenario='range') -> Dict:
+        """Runs one crawl of the given scenario and returns its measurements."""
+        if scenario not in self.SCENARIOS:
+            raise ValueError(f'Unknown scenario {scenario!r}.')
+        flush_tables(News, Tag, CrawlState)
+        get_tag_cache().clear()
+
+        site = FixtureSite(pages=self.pages, news_per_page=self.news_per_page).start()
+        counter = QueryCounter()
+        try:
+            crawler = get_crawler(self.engine, **self.crawler_kwargs)
+            start = time.perf_counter()
+            with connection.execute_wrapper(counter), redirect_stdout(io.StringIO()):
+                if scenario == 'range':
+                    crawler.crawl_over_a_range(1, self.pages, archive=site.archive_url, resume=False)
+                else:
+                    crawler.crawl_unseen_news(stop=self.pages, archive=site.archive_url)
+                crawler.quit()
+            elapsed = time.perf_counter() - start
+        finally:
+            site.stop()
+
+        articles = News.objects.count()
+        return {
+            'engine': self.engine,
+            'scenario': scenario,
+            'seconds': elapsed,
+            'pages': len(site.requests),
+            'articles': articles,
+            'pages_per_second': len(site.requests) / elapsed,
+            'articles_per_second': articles / elapsed,
+            'queries': counter.count,
+            'queries_per_article': counter.count / articles if articles else float(counter.count),
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'stages': crawler.timings.summary(),
+        }
+
+    def best_of(self, scenario='range', repeat=3) -> Dict:
+        """Runs a scenario repeatedly and returns the run with the highest article throughput."""
+        return max((self.run(scenario) for _ in range(repeat)), key=lambda result: result['articles_per_second'])
+
+
+def find_regressions(result, baseline, tolerance=0.15) -> List[str]:
+    """
+    Compares a benchmark result with a baseline result of the same scenario and returns a
+    description of every metric which got worse by more than the tolerance.
+    """
+    regressions = []
+    for metric in ('pages_per_second', 'articles_per_second'):
+        if result[metric] < baseline[metric] * (1 - tolerance):
+            regressions.append(f'{metric} dropped from {baseline[metric]:.1f} to {result[metric]:.1f}')
+    if result['queries_per_article'] > baseline['queries_per_article'] * (1 + tolerance):
+        regressions.append(
+            f"queries_per_article rose from {baseline['queries_per_article']:.2f} to {result['queries_per_article']:.2f}"
+        )
+    return regressions
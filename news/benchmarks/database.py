@@ -0,0 +1,43 @@
+from django.core.management.color import no_style
+from django.db import connection
+from contextlib import contextmanager
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """
+    Creates and migrates the test database, points the default connection at it for the
+    duration of the block and destroys it afterwards, so benchmarks never write to real data.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def flush_tables(*models) -> None:
+    """Empties the tables of the given models, and their many-to-many tables, with one TRUNCATE."""
+    tables = []
+    for model in models:
+        tables.append(model._meta.db_table)
+        tables.extend(field.remote_field.through._meta.db_table for field in model._meta.local_many_to_many)
+    connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables, allow_cascade=True))
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries run on a connection.
+    Usage: ``with connection.execute_wrapper(counter): ...``
+
+    Attributes:
+        count: Number of queries executed so far.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
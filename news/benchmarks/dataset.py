@@ -0,0 +1,173 @@
+from news.cache import bump_generation
+from news.models import News, Tag
+from news.utils.persian_calendar import PersianCalendar
+from django.db import connection, transaction
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import accumulate
+from queue import Empty, Queue
+from random import Random
+from threading import Lock
+from typing import Callable, List, Optional
+import csv
+import io
+import math
+
+WORDS = (
+    'گوشی', 'هوشمند', 'پردازنده', 'اپل', 'سامسونگ', 'شیائومی', 'لپ‌تاپ', 'باتری', 'دوربین', 'نمایشگر',
+    'هوش', 'مصنوعی', 'خودرو', 'برقی', 'فضا', 'ماهواره', 'اینترنت', 'امنیت', 'بازی', 'کنسول',
+    'نرم‌افزار', 'سخت‌افزار', 'تراشه', 'شبکه', 'فناوری', 'پژوهش', 'دانشمندان', 'عرضه', 'قیمت', 'جدید',
+    'شرکت', 'کاربران', 'نسخه', 'به‌روزرسانی', 'سیستم‌عامل', 'اندروید', 'ویندوز', 'حافظه', 'ذخیره‌سازی', 'سرعت',
+    'عملکرد', 'طراحی', 'صفحه', 'نمایش', 'شارژ', 'سریع', 'بی‌سیم', 'ساعت', 'هدفون', 'تبلت',
+    'گرافیک', 'کارت', 'مانیتور', 'رباتیک', 'پهپاد', 'موشک', 'ناسا', 'مریخ', 'ماه', 'ستاره',
+    'زمین', 'اقلیم', 'انرژی', 'خورشیدی', 'داده', 'حریم', 'خصوصی', 'هکرها', 'حمله', 'سایبری',
+    'استارتاپ', 'سرمایه‌گذاری', 'بازار', 'فروش', 'رشد', 'گزارش', 'تحلیل', 'بررسی', 'مقایسه', 'معرفی',
+    'رونمایی', 'مدل', 'پرچم‌دار', 'اقتصادی', 'میان‌رده', 'ویژگی', 'قابلیت', 'امکان', 'توسعه', 'برنامه',
+    'اپلیکیشن', 'پیام‌رسان', 'شبکه‌های', 'اجتماعی', 'ویدیو', 'پخش', 'آنلاین', 'ابری', 'سرور', 'مرکز',
+)
+CONNECTORS = ('و', 'در', 'از', 'به', 'با', 'برای', 'که', 'این', 'را', 'است', 'می‌شود', 'خواهد', 'شد', 'بود', 'های')
+
+
+class SyntheticDataset:
+    """
+    Generator of synthetic news and tags shaped like the crawled Zoomit archive, for scale
+    and performance testing. News texts are Persian sentences of realistic length, dates
+    are spread over the given number of years of the Persian calendar used by the crawler,
+    and the popularity of tags follows a Zipf distribution, so a few tags are linked to a
+    large part of the archive. Rows are written through PostgreSQL COPY, one transaction per
+    batch, with news ids reserved from the id sequence so the tag links are copied as well.
+    Apart from the news ids, the generated data does not depend on the number of workers.
+
+    Attributes:
+        news_count: Number of news to generate.
+        tag_count: Number of tags to generate.
+        years: Number of years the news dates are spread over, ending now.
+        words: Mean number of words of a news text.
+        tags_per_news: Mean number of tags of a news.
+        zipf_exponent: Exponent of the Zipf distribution of tag popularity.
+        seed: Seed of the random generator, so the same arguments generate the same data.
+    """
+    SENTENCES = 2000
+
+    def __init__(self, news_count, tag_count, years=5, words=300, tags_per_news=4, zipf_exponent=1.1, seed=0) -> None:
+        self.news_count = news_count
+        self.tag_count = tag_count
+        self.years = years
+        self.words = words
+        self.tags_per_news = tags_per_news
+        self.zipf_exponent = zipf_exponent
+        self.seed = seed
+        self.random = Random(seed)
+        # Texts are assembled from a fixed pool of sentences, which is much faster than picking every word.
+        vocabulary = WORDS + CONNECTORS
+        self.sentences = [
+            ' '.join(self.random.choices(vocabulary, k=self.random.randint(8, 20))) + '.'
+            for _ in range(self.SENTENCES)
+        ]
+
+    def generate(self, batch_size=10000, workers=1, progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Inserts the tags and news and returns the number of inserted news. With several workers,
+        batches are inserted concurrently over one database connection per worker thread, since
+        computing the search vectors of the news in the database dominates the run time.
+        progress is called with the number of inserted news after every batch.
+        """
+        tag_ids = self.create_tags()
+        # Tag ids are ordered by rank: the first tag is the most popular one.
+        cum_weights = list(accumulate(1 / rank ** self.zipf_exponent for rank in range(1, len(tag_ids) + 1)))
+        end = PersianCalendar.currnet_persian_datetime()
+        batches = Queue()
+        for number, start in enumerate(range(0, self.news_count, batch_size)):
+            batches.put((number, min(batch_size, self.news_count - start)))
+
+        created = 0
+        lock = Lock()
+
+        def work():
+            nonlocal created
+            while True:
+                try:
+                    number, count = batches.get_nowait()
+                except Empty:
+                    return
+                self.insert_batch(number, count, tag_ids, cum_weights, end)
+                with lock:
+                    created += count
+                    if progress is not None:
+                        progress(created)
+
+        if workers == 1:
+            work()
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                for future in [executor.submit(self.in_own_connection, work) for _ in range(workers)]:
+                    future.result()
+
+        # Rows inserted by COPY send no signals, so cached responses are invalidated here.
+        bump_generation()
+        return created
+
+    def insert_batch(self, number, count, tag_ids, cum_weights, end) -> None:
+        """Inserts one batch of news and their tag links in a transaction."""
+        # Every batch has its own generator, so the data does not depend on the number of workers.
+        random = Random(f'{self.seed}-{number}')
+        seconds = int(timedelta(days=365 * self.years).total_seconds())
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+                [News._meta.db_table, 'id', count]
+            )
+            news_rows, link_rows = [], []
+            for (pk,) in cursor.fetchall():
+                text = self.text(random)
+                date = end - timedelta(seconds=random.randrange(seconds))
+                title = ' '.join(random.choices(WORDS, k=random.randint(5, 10)))
+                news_rows.append((
+                    pk, f'{title} {pk}', text, f'https://www.zoomit.ir/synthetic/{pk}/', date.isoformat(),
+                    News.compute_content_hash(text)
+                ))
+                if tag_ids:
+                    count_tags = max(1, round(random.gauss(self.tags_per_news, self.tags_per_news / 3)))
+                    for tag_id in set(random.choices(tag_ids, cum_weights=cum_weights, k=count_tags)):
+                        link_rows.append((pk, tag_id))
+
+            self.copy(cursor, News._meta.db_table, ('id', 'title', 'text', 'resource', 'date', 'content_hash'), news_rows)
+            self.copy(cursor, News.tags.through._meta.db_table, ('news_id', 'tag_id'), link_rows)
+
+    @staticmethod
+    def in_own_connection(function) -> None:
+        """Runs the function in a worker thread and closes the database connection the thread opened."""
+        try:
+            function()
+        finally:
+            connection.close()
+
+    def create_tags(self) -> List[int]:
+        """Inserts the tags and returns their ids, most popular first. Existing tags with the same labels are reused."""
+        labels = [f'{WORDS[number % len(WORDS)]} {number // len(WORDS) + 1}' for number in range(self.tag_count)]
+        Tag.objects.bulk_create([Tag(tag_label=label) for label in labels], batch_size=5000, ignore_conflicts=True)
+        ids = {}
+        for start in range(0, len(labels), 5000):
+            ids.update(Tag.objects.filter(tag_label__in=labels[start:start + 5000]).values_list('tag_label', 'id'))
+        ranked = [ids[label] for label in labels]
+        # Popularity is unrelated to the label, as in the crawled archive.
+        self.random.shuffle(ranked)
+        return ranked
+
+    def text(self, random=None) -> str:
+        """Returns a news text of a log-normally distributed length around the mean number of words."""
+        random = random or self.random
+        words = min(self.words * 10, max(30, random.lognormvariate(math.log(self.words), 0.5)))
+        sentences = random.choices(self.sentences, k=max(2, round(words / 14)))
+        return '\n'.join(' '.join(sentences[start:start + 5]) for start in range(0, len(sentences), 5))
+
+    @staticmethod
+    def copy(cursor, table, columns, rows) -> None:
+        """Writes the rows into the table with one COPY FROM STDIN."""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        cursor.copy_expert(
+            f"COPY {quote(table)} ({', '.join(quote(column) for column in columns)}) FROM STDIN (FORMAT csv)", buffer
+        )
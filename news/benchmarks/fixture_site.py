@@ -0,0 +1,120 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from threading import Thread
+
+ARCHIVE_PAGE = """<html><body><div>{links}</div></body></html>"""
+
+ARCHIVE_LINK = (
+    '<a class="link__CustomNextLink-sc-1r7l32j-0 eoKbWT BrowseArticleListItemDesktop__WrapperLink-zb6c6m-6 bzMtyO"'
+    ' href="{href}"><h3>{title}</h3></a>'
+)
+
+NEWS_PAGE = """<html><body>
+<h1 class="typography__StyledDynamicTypographyComponent-t787b7-0 jQMKGt">{title}</h1>
+<span class="typography__StyledDynamicTypographyComponent-t787b7-0 fTxyQo fa">{date}</span>
+<div>
+  <span class="typography__StyledDynamicTypographyComponent-t787b7-0 cHbulB">{tag}</span>
+  <span class="typography__StyledDynamicTypographyComponent-t787b7-0 bLZGOP">فناوری</span>
+</div>
+<p class="typography__StyledDynamicTypographyComponent-t787b7-0 fZZfUi ParagraphElement__ParagraphBase-sc-1soo3i3-0 gOVZGU">
+  متن خبر شماره {number} درباره <b>فناوری</b>
+</p>
+<h2 class="typography__StyledDynamicTypographyComponent-t787b7-0 cAPRcR HeadingTwo__HeadingTwoBase-sc-3nstjw-1 aMVhn">بخش دوم</h2>
+<p class="typography__StyledDynamicTypographyComponent-t787b7-0 fZZfUi ParagraphElement__ParagraphBase-sc-1soo3i3-0 gOVZGU">پایان خبر {number}</p>
+</body></html>"""
+
+SCRIPT_ONLY_PAGE = """<html><body><div id="__next"></div><script src="/app.js"></script></body></html>"""
+
+
+class _FixtureServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections of concurrent crawlers, which then wait a second to retry.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FixtureSite:
+    """
+    Local HTTP server imitating the Zoomit archive for crawler tests and benchmarks. Archive page n lists
+    the news numbered from (n - 1) * news_per_page, newest first like the real archive.
+    News numbers listed in script_only are served without server-rendered content.
+
+    Attributes:
+        pages: Number of archive pages.
+        news_per_page: Number of news links on every archive page.
+        script_only: News numbers whose pages need JavaScript.
+        requests: Paths requested from the server.
+    """
+
+    def __init__(self, pages=2, news_per_page=3, script_only=()) -> None:
+        self.pages = pages
+        self.news_per_page = news_per_page
+        self.script_only = set(script_only)
+        self.requests = []
+        self.server = _FixtureServer(('127.0.0.1', 0), self._handler_class())
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def archive_url(self) -> str:
+        return self.base_url + '/archive/'
+
+    def news_url(self, number) -> str:
+        return f'{self.base_url}/news/{number}/'
+
+    def start(self) -> 'FixtureSite':
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def render(self, path) -> tuple:
+        """Returns the status code and html of the given path."""
+        url = urlparse(path)
+        if url.path == '/archive/':
+            page_number = int(parse_qs(url.query).get('pageNumber', ['1'])[0])
+            if not 1 <= page_number <= self.pages:
+                return 200, ARCHIVE_PAGE.format(links='')
+            first = (page_number - 1) * self.news_per_page
+            links = ''.join(
+                ARCHIVE_LINK.format(href=f'/news/{number}/', title=f'خبر {number}')
+                for number in range(first, first + self.news_per_page)
+            )
+            return 200, ARCHIVE_PAGE.format(links=links)
+
+        parts = url.path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'news' and parts[1].isdigit():
+            number = int(parts[1])
+            if number in self.script_only:
+                return 200, SCRIPT_ONLY_PAGE
+            return 200, NEWS_PAGE.format(
+                title=f'خبر آزمایشی {number}',
+                date=f'شنبه ۲۷ مرداد ۱۴۰۳ - ۱۲:{59 - number % 60:02d}',  # lower numbers are newer
+                tag=f'برچسب {number % 2}',
+                number=number,
+            )
+        return 404, '<html><body>Not Found</body></html>'
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests.append(self.path)
+                status, body = site.render(self.path)
+                content = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
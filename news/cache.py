@@ -0,0 +1,250 @@
+from .models import News
+from .metrics import RESPONSE_CACHE
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag, urlencode
+from rest_framework.response import Response
+from datetime import datetime
+from hashlib import md5
+import time
+from typing import Dict, Optional, Tuple
+
+GENERATION_KEY = 'news:generation'
+HITS_KEY = 'news:cache:hits'
+MISSES_KEY = 'news:cache:misses'
+VALIDATORS_KEY = 'news:validators'
+CHANGED_KEY = 'news:changed'
+
+
+def _initial_generation() -> int:
+    """
+    Returns a starting value for the generation counter. It is based on the clock, so a
+    counter which was evicted from the cache never restarts at a value already used in keys.
+    """
+    return time.time_ns() // 1000
+
+
+def get_generation() -> int:
+    """Returns the current data generation. Every change of news or tags moves it forward."""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+async def aget_generation() -> int:
+    """Asynchronous version of get_generation."""
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, _initial_generation(), timeout=None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+def bump_generation() -> None:
+    """Moves the data generation forward, which invalidates every cached response at once, and records the change time."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=None)
+    cache.set(CHANGED_KEY, int(time.time()), timeout=None)
+
+
+def get_last_change() -> int:
+    """
+    Returns the Unix time in seconds of the last data change. If it is unknown, e.g. evicted
+    from the cache, the current time is recorded, so clients never get a false 304.
+    """
+    changed = cache.get(CHANGED_KEY)
+    if changed is None:
+        cache.add(CHANGED_KEY, int(time.time()), timeout=None)
+        changed = cache.get(CHANGED_KEY)
+    return changed
+
+
+async def aget_last_change() -> int:
+    """Asynchronous version of get_last_change."""
+    changed = await cache.aget(CHANGED_KEY)
+    if changed is None:
+        await cache.aadd(CHANGED_KEY, int(time.time()), timeout=None)
+        changed = await cache.aget(CHANGED_KEY)
+    return changed
+
+
+def _increment(key: str) -> None:
+    """Increments a statistics counter, creating it when missing."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+async def _aincrement(key: str) -> None:
+    """Asynchronous version of _increment."""
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 1, timeout=None)
+
+
+def cache_stats() -> Dict[str, float]:
+    """Returns the hit and miss counters of the response cache."""
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = counters.get(HITS_KEY, 0), counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+        'generation': get_generation(),
+    }
+
+
+class CachedResponseMixin:
+    """
+    ViewSet mixin caching the data of list and detail responses. Cache keys contain
+    the current data generation, so a bump_generation call (made by model signals and
+    the crawler) makes every stale entry unreachable without waiting for its timeout.
+
+    Attributes:
+        cache_timeout: Seconds a cached response is kept.
+        cache_key_prefix: Prefix of the response cache keys.
+    """
+    cache_timeout = getattr(settings, 'API_CACHE_TIMEOUT', 300)
+    cache_key_prefix = 'news:response'
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs) -> Response:
+        """Returns the cached response data if available, otherwise calls the handler and caches its data."""
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            _increment(HITS_KEY)
+            RESPONSE_CACHE.labels('hit').inc()
+            return Response(data)
+
+        _increment(MISSES_KEY)
+        RESPONSE_CACHE.labels('miss').inc()
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=self.cache_timeout)
+        return response
+
+    async def acached_response(self, handler, request) -> Response:
+        """Asynchronous version of cached_response for an async handler returning a Response."""
+        key = self.get_cache_key(request, await aget_generation())
+        data = await cache.aget(key)
+        if data is not None:
+            await _aincrement(HITS_KEY)
+            RESPONSE_CACHE.labels('hit').inc()
+            return Response(data)
+
+        await _aincrement(MISSES_KEY)
+        RESPONSE_CACHE.labels('miss').inc()
+        response = await handler(request)
+        if response.status_code == 200:
+            await cache.aset(key, response.data, timeout=self.cache_timeout)
+        return response
+
+    def get_cache_key(self, request, generation=None) -> str:
+        """Builds the cache key from the data generation, the host, the path and the normalized query string."""
+        query = urlencode(sorted(
+            (key, value) for key, values in request.query_params.lists() for value in values
+        ))
+        digest = md5(f'{request.get_host()}{request.path}?{query}'.encode('utf-8')).hexdigest()
+        if generation is None:
+            generation = get_generation()
+        return f'{self.cache_key_prefix}:{generation}:{digest}'
+
+
+def get_newest_news() -> Tuple[Optional[datetime], int]:
+    """
+    Returns the date and id of the newest news item. The result is cached per data
+    generation, so polling clients do not touch the database until the data changes.
+    """
+    generation = get_generation()
+    key = f'{VALIDATORS_KEY}:{generation}'
+    newest = cache.get(key)
+    if newest is None:
+        newest = News.objects.order_by('-date', 'id').values_list('date', 'id').first() or (None, 0)
+        cache.set(key, newest, timeout=CachedResponseMixin.cache_timeout)
+    return newest
+
+
+async def aget_newest_news() -> Tuple[Optional[datetime], int]:
+    """Asynchronous version of get_newest_news."""
+    generation = await aget_generation()
+    key = f'{VALIDATORS_KEY}:{generation}'
+    newest = await cache.aget(key)
+    if newest is None:
+        newest = await News.objects.order_by('-date', 'id').values_list('date', 'id').afirst() or (None, 0)
+        await cache.aset(key, newest, timeout=CachedResponseMixin.cache_timeout)
+    return newest
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering conditional list and detail requests. The ETag and
+    Last-Modified validators are built from the data generation, the newest news item
+    and the time of the last data change, so ``If-None-Match`` and ``If-Modified-Since``
+    requests are answered with 304 before any queryset is evaluated or serialized.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Returns 304 if the client's copy is still current, otherwise the handler's response with validators."""
+        etag, last_modified = self.get_validators(request)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.headers['ETag'] = etag
+            if last_modified is not None:
+                response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+    async def aconditional_response(self, handler, request):
+        """Asynchronous version of conditional_response for an async handler."""
+        etag, last_modified = self.build_validators(
+            request, await aget_newest_news(), await aget_generation(), await aget_last_change()
+        )
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = await handler(request)
+        if response.status_code == 200:
+            response.headers['ETag'] = etag
+            if last_modified is not None:
+                response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_validators(self, request) -> Tuple[str, Optional[int]]:
+        """Returns the ETag and the Last-Modified timestamp of the current data."""
+        return self.build_validators(request, get_newest_news(), get_generation(), get_last_change())
+
+    @staticmethod
+    def build_validators(request, newest, generation, changed) -> Tuple[str, Optional[int]]:
+        """
+        Builds the validators. Last-Modified is the time of the last data change instead of the
+        newest news date: tag changes, deletions and backfilled older news do not move that date,
+        which is moreover stored in the Persian calendar. Changes within the same second are
+        only told apart by the ETag, which takes precedence when a client sends both.
+        """
+        _, newest_id = newest
+        etag = quote_etag(f'{generation}-{newest_id}-{request.accepted_renderer.format}')
+        return etag, changed
@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+import time
+
+_current: ContextVar[Optional['RequestMetrics']] = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Measurements of a single request. An instance is installed as the current recorder of the
+    request's context by ServerTimingMiddleware, so code deeper in the stack records its stages
+    through ``measure`` and its SQL through ``record_query`` without holding a reference.
+
+    Attributes:
+        query_count: Number of executed SQL statements.
+        sql_time: Total duration of the SQL statements in seconds.
+        slowest_sql: Duration in seconds and text of the slowest SQL statement.
+        stages: Total duration in seconds of the measured stages by name.
+    """
+
+    def __init__(self) -> None:
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.slowest_sql: Tuple[float, str] = (0.0, '')
+        self.stages: Dict[str, float] = {}
+        self._active: List[str] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.sql_time += duration
+            if duration > self.slowest_sql[0]:
+                self.slowest_sql = (duration, sql)
+
+    @contextmanager
+    def measure(self, stage):
+        """Context manager adding the duration of the block to the stage. Nested blocks of the same stage count once."""
+        if stage in self._active:
+            yield
+            return
+        self._active.append(stage)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - start
+            self._active.remove(stage)
+
+    @contextmanager
+    def activate(self):
+        """Context manager making this the recorder of the current context."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Returns the recorder of the request being handled, or None outside of an instrumented request."""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper passing the statement to the recorder of the current context, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    """
+    connection_created receiver installing ``record_query`` on every new database connection.
+    Connections are per thread, and the ORM calls of async views run in other threads than the
+    middleware, so the wrapper is installed once per connection instead of per request.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure(stage):
+    """Context manager recording the duration of the block under the stage of the current request, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+    else:
+        with metrics.measure(stage):
+            yield
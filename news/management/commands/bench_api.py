@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...benchmarks.api import ApiBenchmark, find_regressions
+from ...benchmarks.database import benchmark_database, flush_tables
+from ...benchmarks.dataset import SyntheticDataset
+from ...models import News, Tag
+from contextlib import nullcontext
+import json
+
+
+class Command(BaseCommand):
+    """
+    Custom Django command for benchmarking the latency of the news API.
+
+    Attributes:
+        help: A description of what the command does and how to use it.
+    """
+    help = """Seeds a test database with a large news archive and reports p50/p95/p99 latency, throughput per
+              gunicorn worker and queries per request of the list, detail, deep pagination, search, tag filter
+              and tag list endpoints.
+              Example: python3 manage.py bench_api --keepdb --output api.json --> Saves the results as a baseline.
+              Example: python3 manage.py bench_api --keepdb --baseline api.json --> Fails if a result regressed."""
+
+    def add_arguments(self, parser) -> None:
+        """Adds arguments to the command parser for specifying the benchmark."""
+
+        parser.add_argument('--scenario', choices=ApiBenchmark.SCENARIOS + ('all',), default='all', help='The endpoint scenario')
+        parser.add_argument('--news', type=int, default=1_000_000, help='Number of news of the seeded dataset')
+        parser.add_argument('--tags', type=int, default=50_000, help='Number of tags of the seeded dataset')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--warm-cache', action='store_true', help='Keep cached responses between requests')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the seeded test database for the next run')
+        parser.add_argument('--existing', action='store_true', help='Benchmark the configured database as it is, without seeding')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare the results with a JSON file written by --output')
+        parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative regression against the baseline')
+
+    def handle(self, *args, **kwargs) -> None:
+        """Runs the scenarios, prints their results and compares them with the baseline."""
+
+        benchmark = ApiBenchmark(kwargs['requests'], warm_cache=kwargs['warm_cache'])
+        scenarios = ApiBenchmark.SCENARIOS if kwargs['scenario'] == 'all' else (kwargs['scenario'],)
+
+        with nullcontext() if kwargs['existing'] else benchmark_database(keepdb=kwargs['keepdb']):
+            dataset = self._dataset_size()
+            if not kwargs['existing'] and dataset != {'news': kwargs['news'], 'tags': kwargs['tags']}:
+                # A kept database of another size, or of an interrupted run, is seeded again from scratch.
+                if dataset['news'] or dataset['tags']:
+                    self.stdout.write(f"Dropping the stored {dataset['news']} news and {dataset['tags']} tags...")
+                    flush_tables(News, Tag)
+                self.stdout.write(f"Seeding {kwargs['news']} news and {kwargs['tags']} tags...")
+                SyntheticDataset(kwargs['news'], kwargs['tags']).generate()
+                dataset = self._dataset_size()
+            benchmark.prepare()
+            results = {scenario: benchmark.run(scenario) for scenario in scenarios}
+
+        for result in results.values():
+            self._write_result(result)
+
+        if kwargs.get('output'):
+            with open(kwargs['output'], 'w') as file:
+                json.dump({'dataset': dataset, 'scenarios': results}, file, indent=2)
+
+        if kwargs.get('baseline'):
+            with open(kwargs['baseline']) as file:
+                baseline = json.load(file)
+            if baseline.get('dataset') != dataset:
+                raise CommandError(
+                    f"The baseline was measured on {baseline.get('dataset')}, not on {dataset}; "
+                    f"record a new baseline with --output."
+                )
+            regressions = [
+                f'{scenario}: {regression}'
+                for scenario, result in results.items() if scenario in baseline['scenarios']
+                for regression in find_regressions(result, baseline['scenarios'][scenario], kwargs['tolerance'])
+            ]
+            if regressions:
+                raise CommandError('Benchmark regressed:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regression against the baseline.'))
+
+    @staticmethod
+    def _dataset_size() -> dict:
+        """Returns the number of news and tags of the benchmarked database."""
+        return {'news': News.objects.count(), 'tags': Tag.objects.count()}
+
+    def _write_result(self, result) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{result['scenario']} scenario"))
+        self.stdout.write(
+            f"  {result['requests']} requests ({result['errors']} errors): p50 {result['p50_ms']:.2f}ms  "
+            f"p95 {result['p95_ms']:.2f}ms  p99 {result['p99_ms']:.2f}ms  mean {result['mean_ms']:.2f}ms"
+        )
+        self.stdout.write(
+            f"  {result['throughput_per_worker']:.1f} requests/s per worker; "
+            f"{result['queries_per_request']:.2f} queries per request, at most {result['max_queries']}"
+        )
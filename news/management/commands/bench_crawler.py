@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...benchmarks.crawler import CrawlerBenchmark, find_regressions
+from ...benchmarks.database import benchmark_database
+from ...utils.crawlers import CRAWLER_ENGINES
+import json
+
+
+class Command(BaseCommand):
+    """
+    Custom Django command for benchmarking the crawler against a local fixture site.
+
+    Attributes:
+        help: A description of what the command does and how to use it.
+    """
+    help = """Crawls a local site imitating the Zoomit archive into a throwaway test database and reports
+              pages/s, articles/s, queries per article, peak RSS and the latency of the fetch, parse and save stages.
+              Example: python3 manage.py bench_crawler --pages 20 --output bench.json --> Saves the results as a baseline.
+              Example: python3 manage.py bench_crawler --pages 20 --baseline bench.json --> Fails if a result regressed."""
+
+    def add_arguments(self, parser) -> None:
+        """Adds arguments to the command parser for specifying the benchmark."""
+
+        parser.add_argument('--engine', choices=list(CRAWLER_ENGINES), default='http', help='The crawler engine')
+        parser.add_argument('--scenario', choices=CrawlerBenchmark.SCENARIOS + ('all',), default='all', help='The crawl path')
+        parser.add_argument('--pages', type=int, default=10, help='Number of archive pages of the fixture site')
+        parser.add_argument('--news-per-page', type=int, default=20, help='Number of news on every archive page')
+        parser.add_argument('--concurrency', type=int, help='Concurrent downloads of the http engine')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario; the fastest one is reported')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare the results with a JSON file written by --output')
+        parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative regression against the baseline')
+
+    def handle(self, *args, **kwargs) -> None:
+        """Runs the scenarios in a test database, prints their results and compares them with the baseline."""
+
+        crawler_kwargs = {}
+        if kwargs['engine'] == 'http':
+            crawler_kwargs = {'concurrency': kwargs['concurrency'], 'selenium_fallback': False}
+        benchmark = CrawlerBenchmark(kwargs['engine'], kwargs['pages'], kwargs['news_per_page'], **crawler_kwargs)
+        scenarios = CrawlerBenchmark.SCENARIOS if kwargs['scenario'] == 'all' else (kwargs['scenario'],)
+
+        with benchmark_database():
+            results = {scenario: benchmark.best_of(scenario, kwargs['repeat']) for scenario in scenarios}
+
+        for result in results.values():
+            self._write_result(result)
+
+        if kwargs.get('output'):
+            with open(kwargs['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+
+        if kwargs.get('baseline'):
+            with open(kwargs['baseline']) as file:
+                baseline = json.load(file)
+            regressions = [
+                f'{scenario}: {regression}'
+                for scenario, result in results.items() if scenario in baseline
+                for regression in find_regressions(result, baseline[scenario], kwargs['tolerance'])
+            ]
+            if regressions:
+                raise CommandError('Benchmark regressed:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regression against the baseline.'))
+
+    def _write_result(self, result) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{result['engine']} engine, {result['scenario']} scenario"))
+        self.stdout.write(
+            f"  {result['pages']} pages and {result['articles']} articles in {result['seconds']:.2f}s: "
+            f"{result['pages_per_second']:.1f} pages/s, {result['articles_per_second']:.1f} articles/s"
+        )
+        self.stdout.write(
+            f"  {result['queries']} queries, {result['queries_per_article']:.2f} per article; "
+            f"peak RSS {result['peak_rss_mb']:.1f} MB"
+        )
+        for stage, timing in result['stages'].items():
+            self.stdout.write(
+                f"  {stage:<6} x{timing['count']:<5} mean {timing['mean'] * 1000:.2f}ms  "
+                f"p50 {timing['p50'] * 1000:.2f}ms  p95 {timing['p95'] * 1000:.2f}ms  max {timing['max'] * 1000:.2f}ms"
+            )
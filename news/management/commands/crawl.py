@@ -1,5 +1,7 @@
-from django.core.management.base import BaseCommand
-from ...utils.zoomit_crawler import ZoomitCrawler
+from django.core.management.base import BaseCommand, CommandError
+from ...utils.crawlers import CRAWLER_ENGINES, get_crawler
+from ...tasks import crawl_zoomit_range_in_parallel
+import time
 
 class Command(BaseCommand):
     """
@@ -9,25 +11,44 @@ class Command(BaseCommand):
         help: A description of what the command does and how to use it.
     """
     help = """Crawls news from https://zoomit.ir and save to the database.
-              Example: python3 manage.py crawl 1 3 --> Crawls zoomit news archive from page 1 to page 3."""
+              Example: python3 manage.py crawl 1 3 --> Crawls zoomit news archive from page 1 to page 3.
+              Example: python3 manage.py crawl 1 3 --engine http --> Crawls the same pages over plain HTTP.
+              Example: python3 manage.py crawl 1 3 --restart --> Crawls the range from page 1 even if an earlier run got further.
+              Example: python3 manage.py crawl 1 900 --parallel 8 --> Distributes the range over Celery workers in 8 chunks.
+              Example: python3 manage.py crawl 1 900 --parallel 8 --engine http --> Distributes the range to workers crawling over plain HTTP."""
 
     def add_arguments(self, parser) -> None:
         """Adds arguments to the command parser for specifying the page range."""
 
         parser.add_argument('from_page', type=int, nargs='?', help='The starting page number')
         parser.add_argument('to_page', type=int, nargs='?', help='The ending page number')
+        parser.add_argument('--engine', choices=list(CRAWLER_ENGINES), help='The crawler engine, defaults to the CRAWLER_ENGINE setting')
+        parser.add_argument('--parallel', type=int, metavar='N', help='Split the page range into N chunks crawled by Celery workers')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint of an interrupted crawl of the same range')
 
     def handle(self, *args, **kwargs) -> None:
         """ 
         Handles the command execution:
             if arguments from_page and to_page were given, crawls the given range;
+            an interrupted crawl of the same range resumes after its last completed page unless --restart is given;
             but if none were given, crawls all the news beginning from the first page until it see a duplicate news.
+            With --parallel the range is crawled by Celery workers with the given engine while the command reports the progress;
+            distributed crawls keep no checkpoint, so --restart cannot be combined with it.
         """
 
         from_page = kwargs.get('from_page')
         to_page = kwargs.get('to_page')
+        parallel = kwargs.get('parallel')
 
-        crawler = ZoomitCrawler()
+        if parallel is not None:
+            if from_page is None or to_page is None or parallel < 1:
+                raise CommandError('--parallel needs a page range and a positive number of chunks.')
+            if kwargs.get('restart'):
+                raise CommandError('--restart cannot be combined with --parallel, distributed crawls do not resume.')
+            self._crawl_in_parallel(from_page, to_page, parallel, kwargs.get('engine'))
+            return
+
+        crawler = get_crawler(kwargs.get('engine'))
 
         if from_page is None and to_page is None:
             # This means that we should crawl unseen news
@@ -36,8 +57,26 @@ class Command(BaseCommand):
         
         elif from_page is not None and to_page is not None:
             # This means that we should crawl in the given range
-            crawler.crawl_over_a_range(from_page, to_page)
+            crawler.crawl_over_a_range(from_page, to_page, resume=not kwargs.get('restart'))
             self.stdout.write(self.style.SUCCESS(f'Successfully crawled Zoomit from page {from_page} to page {to_page}.'))
         
         crawler.quit()
 
+    def _crawl_in_parallel(self, from_page, to_page, parallel, engine=None) -> None:
+        """Starts a distributed crawl of the range and reports its progress until it is finished."""
+        progress, result = crawl_zoomit_range_in_parallel(from_page, to_page, parallel, engine=engine)
+        self.stdout.write(f'Started distributed crawl {progress.run_id} of pages {from_page} to {to_page}.')
+
+        while not result.ready():
+            state = progress.snapshot()
+            self.stdout.write(
+                f"Pages {state['pages_done']}/{state['pages_total']}, "
+                f"news {state['links_done']}/{state['links_total']}, saved {state['news_saved']}"
+            )
+            time.sleep(5)
+
+        summary = result.get()
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully crawled Zoomit from page {from_page} to page {to_page}: "
+            f"{summary['news_saved']} of {summary['links_total']} news saved."
+        ))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from ...utils.news_dump import NewsDump
+
+
+class Command(BaseCommand):
+    """
+    Custom Django command for dumping the news archive through PostgreSQL COPY.
+
+    Attributes:
+        help: A description of what the command does and how to use it.
+    """
+    help = """Dumps news, tags and their relations into a directory through PostgreSQL COPY.
+              Example: python3 manage.py export_news dump/ --> Writes dump/tags.csv, dump/news.csv and dump/news_tags.csv.
+              Example: python3 manage.py export_news dump/ --format binary --> Writes the faster binary COPY format."""
+
+    def add_arguments(self, parser) -> None:
+        """Adds arguments to the command parser for specifying the dump directory and format."""
+
+        parser.add_argument('directory', help='The directory the dump files are written to')
+        parser.add_argument('--format', choices=NewsDump.FORMATS, default='csv', help='The COPY format of the dump files')
+
+    def handle(self, *args, **kwargs) -> None:
+        """Writes every table to its dump file and reports the number of rows."""
+
+        counts = NewsDump(kwargs['directory'], kwargs['format']).dump()
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully exported {counts['news']} news, {counts['tags']} tags "
+            f"and {counts['news_tags']} news tags to {kwargs['directory']}."
+        ))
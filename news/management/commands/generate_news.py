@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from ...benchmarks.dataset import SyntheticDataset
+import time
+
+
+class Command(BaseCommand):
+    """
+    Custom Django command for filling the database with synthetic news and tags.
+
+    Attributes:
+        help: A description of what the command does and how to use it.
+    """
+    help = """Generates synthetic Persian news and tags shaped like the crawled archive for scale testing.
+              Tag popularity follows a Zipf distribution and dates are spread over the given number of years.
+              Example: python3 manage.py generate_news 1000000 50000 --workers 4 --> Generates 1M news linked to 50k tags
+              in 4 concurrent database sessions."""
+
+    def add_arguments(self, parser) -> None:
+        """Adds arguments to the command parser for specifying the shape of the dataset."""
+
+        parser.add_argument('news', type=int, help='Number of news to generate')
+        parser.add_argument('tags', type=int, help='Number of tags to generate')
+        parser.add_argument('--years', type=int, default=5, help='Number of years the news dates are spread over')
+        parser.add_argument('--words', type=int, default=300, help='Mean number of words of a news text')
+        parser.add_argument('--tags-per-news', type=int, default=4, help='Mean number of tags of a news')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Exponent of the Zipf distribution of tag popularity')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Number of news inserted per transaction')
+        parser.add_argument('--workers', type=int, default=1, help='Number of batches inserted concurrently')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator')
+
+    def handle(self, *args, **kwargs) -> None:
+        """Inserts the dataset batch by batch and reports the progress."""
+
+        dataset = SyntheticDataset(
+            kwargs['news'], kwargs['tags'], years=kwargs['years'], words=kwargs['words'],
+            tags_per_news=kwargs['tags_per_news'], zipf_exponent=kwargs['zipf'], seed=kwargs['seed']
+        )
+        start = time.perf_counter()
+
+        def progress(created):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'{created}/{kwargs["news"]} news generated ({created / elapsed:.0f} news/s)')
+
+        created = dataset.generate(kwargs['batch_size'], kwargs['workers'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully generated {created} news and {kwargs["tags"]} tags in {time.perf_counter() - start:.1f}s.'
+        ))
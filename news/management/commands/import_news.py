@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...utils.news_dump import NewsDump
+
+
+class Command(BaseCommand):
+    """
+    Custom Django command for loading a news dump written by export_news through PostgreSQL COPY.
+
+    Attributes:
+        help: A description of what the command does and how to use it.
+    """
+    help = """Loads a dump written by export_news. News and tags which already exist are skipped.
+              Example: python3 manage.py import_news dump/ --> Loads dump/tags.csv, dump/news.csv and dump/news_tags.csv.
+              Example: python3 manage.py import_news dump/ --format binary --> Loads a binary dump."""
+
+    def add_arguments(self, parser) -> None:
+        """Adds arguments to the command parser for specifying the dump directory and format."""
+
+        parser.add_argument('directory', help='The directory holding the dump files')
+        parser.add_argument('--format', choices=NewsDump.FORMATS, default='csv', help='The COPY format of the dump files')
+
+    def handle(self, *args, **kwargs) -> None:
+        """Merges the dump into the database in one transaction and reports the number of inserted rows."""
+
+        try:
+            counts = NewsDump(kwargs['directory'], kwargs['format']).load()
+        except FileNotFoundError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully imported {counts['news']} news, {counts['tags']} tags "
+            f"and {counts['news_tags']} news tags from {kwargs['directory']}."
+        ))
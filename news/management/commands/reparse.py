@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...utils.news_pipeline import NewsPipeline
+from ...utils.snapshot_store import SnapshotStore
+from ...utils.zoomit_parser import ZoomitParser
+
+
+class Command(BaseCommand):
+    """
+    Custom Django command for extracting news again from the pages kept in the snapshot store.
+
+    Attributes:
+        help: A description of what the command does and how to use it.
+    """
+    help = """Extracts news from the newest stored page of every url and saves the news which do not exist yet.
+              Example: python3 manage.py reparse --> Reparses the pages stored in CRAWLER_SNAPSHOT_DIR.
+              Example: python3 manage.py reparse --directory snapshots/ --dry-run --> Only reports how many pages are parsed."""
+
+    def add_arguments(self, parser) -> None:
+        """Adds arguments to the command parser for specifying the snapshot directory."""
+
+        parser.add_argument('--directory', help='The snapshot directory, defaults to the CRAWLER_SNAPSHOT_DIR setting')
+        parser.add_argument('--dry-run', action='store_true', help='Parse the pages without saving news')
+
+    def handle(self, *args, **kwargs) -> None:
+        """Parses every stored page with ZoomitParser and passes the extracted news to a NewsPipeline."""
+
+        directory = kwargs.get('directory') or settings.CRAWLER_SNAPSHOT_DIR
+        if not directory:
+            raise CommandError('Pass --directory or set CRAWLER_SNAPSHOT_DIR.')
+
+        pipeline = NewsPipeline()
+        pages = parsed = 0
+        for snapshot in SnapshotStore(directory).latest():
+            pages += 1
+            news = ZoomitParser.parse_news(snapshot.page)
+            if news is None:
+                continue
+            parsed += 1
+            if not kwargs.get('dry_run'):
+                pipeline.add(news.title, news.text, snapshot.url, news.date, news.tag_labels)
+        pipeline.flush()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully reparsed {pages} pages: {parsed} contained news, {pipeline.saved} new news saved.'
+        ))
@@ -0,0 +1,67 @@
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess, values
+from typing import Tuple
+import os
+import socket
+
+# Prometheus metrics of the API, the crawlers and the Celery tasks. When PROMETHEUS_MULTIPROC_DIR
+# is set before this module is imported, every gunicorn and Celery worker process writes its
+# samples to files in that directory and the /metrics endpoint adds up the files of all processes.
+
+
+def process_identifier(pid=None) -> str:
+    """
+    Returns the name identifying a process's files in the multiprocess directory. The directory
+    is shared by several containers, each with its own pid namespace, so the host name is included.
+    Keep in sync with gunicorn.conf.py and clear-metrics.sh.
+    """
+    return f'{socket.gethostname()}-{pid or os.getpid()}'
+
+
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    values.ValueClass = values.MultiProcessValue(process_identifier)
+
+REQUEST_LATENCY = Histogram(
+    'technews_request_duration_seconds', 'Duration of API requests.', ['method', 'route', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Counter('technews_db_queries_total', 'SQL statements executed by API requests.', ['route'])
+DB_QUERY_SECONDS = Counter('technews_db_query_seconds_total', 'Time API requests spent in SQL statements.', ['route'])
+RESPONSE_CACHE = Counter('technews_response_cache_requests_total', 'Lookups of the response cache.', ['result'])
+
+CRAWLER_PAGES = Counter('technews_crawler_pages_fetched_total', 'Pages fetched by the crawlers.', ['engine', 'result'])
+CRAWLER_SAVED = Counter('technews_crawler_articles_saved_total', 'Crawled news saved to the database.')
+CRAWLER_DUPLICATES = Counter('technews_crawler_duplicates_skipped_total', 'Crawled news skipped as already stored.')
+CRAWLER_STAGE_SECONDS = Histogram(
+    'technews_crawler_stage_duration_seconds', 'Duration of the fetch, parse and save stages of the crawlers.', ['stage'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+TASK_SECONDS = Histogram(
+    'technews_celery_task_duration_seconds', 'Runtime of the Celery tasks.', ['task', 'state'],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+
+
+def observe_request(request, response, metrics, duration) -> None:
+    """Records the latency and the database usage of a request by route name."""
+    match = getattr(request, 'resolver_match', None)
+    route = match.view_name if match is not None else 'unmatched'
+    REQUEST_LATENCY.labels(request.method, route, response.status_code).observe(duration)
+    DB_QUERIES.labels(route).inc(metrics.query_count)
+    DB_QUERY_SECONDS.labels(route).inc(metrics.sql_time)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Returns the text exposition of the metrics of every process and its content type."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid) -> None:
+    """Removes the live samples of an exited worker process from the multiprocess directory."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(process_identifier(pid))
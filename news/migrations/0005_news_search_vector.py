@@ -0,0 +1,54 @@
+# Generated by Django 5.1 on 2026-10-18 18:54
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Keep in sync with news.utils.persian_text.PersianText.CHARACTER_MAP
+CREATE_SEARCH_VECTOR_TRIGGER = r"""
+CREATE OR REPLACE FUNCTION news_normalize_persian(value text) RETURNS text AS $$
+    SELECT translate(coalesce(value, ''), U&'\064A\0649\0643\200C', U&'\06CC\06CC\06A9 ');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION news_news_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', news_normalize_persian(NEW.title)), 'A') ||
+        setweight(to_tsvector('simple', news_normalize_persian(NEW.text)), 'B');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER news_news_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, text, search_vector ON news_news
+    FOR EACH ROW EXECUTE FUNCTION news_news_search_vector_update();
+
+UPDATE news_news SET search_vector = NULL;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS news_news_search_vector_trigger ON news_news;
+DROP FUNCTION IF EXISTS news_news_search_vector_update();
+DROP FUNCTION IF EXISTS news_normalize_persian(text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='news_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER),
+    ]
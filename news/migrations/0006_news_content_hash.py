@@ -0,0 +1,41 @@
+# Generated by Django 5.1 on 2026-10-18 19:07
+
+from django.db import migrations, models
+from hashlib import sha256
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def fill_content_hash(apps, schema_editor):
+    """Computes the content hash of the existing news in batches. Keep in sync with News.compute_content_hash."""
+    News = apps.get_model('news', 'News')
+    batch = []
+    for news in News.objects.only('id', 'text').iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        news.content_hash = sha256(news.text.encode('utf-8')).hexdigest()
+        batch.append(news)
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            News.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        News.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_news_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(fill_content_hash, migrations.RunPython.noop),
+        # Built after the backfill, so the index is not updated row by row.
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['content_hash'], name='news_content_hash_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_news_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.URLField()),
+                ('range_start', models.PositiveIntegerField(default=0)),
+                ('range_end', models.PositiveIntegerField(default=0)),
+                ('last_completed_page', models.PositiveIntegerField(blank=True, null=True)),
+                ('newest_article_date', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source', 'range_start', 'range_end'), name='news_crawlstate_unique_range')],
+            },
+        ),
+    ]
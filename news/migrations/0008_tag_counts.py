@@ -0,0 +1,131 @@
+# Generated by Django 5.1 on 2026-10-18 19:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from datetime import timedelta
+from news.utils.persian_calendar import PersianCalendar
+
+# Statement-level triggers keep Tag.news_count and TagDailyCount in step with the news-tag links,
+# whether they are written by the ORM, the crawler's bulk inserts, COPY or a dump load. Every
+# statement updates each of its tags once, locking the tag rows in id order so that concurrent
+# crawler transactions wait for each other instead of deadlocking. Days are local dates in
+# TIME_ZONE; a later change of News.date does not move the counts to another day.
+CREATE_TAG_COUNT_TRIGGERS = r"""
+CREATE OR REPLACE FUNCTION news_tag_counts_insert() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM news_tag WHERE id IN (SELECT tag_id FROM new_links) ORDER BY id FOR UPDATE;
+    UPDATE news_tag SET news_count = news_tag.news_count + links.count
+    FROM (SELECT tag_id, count(*) AS count FROM new_links GROUP BY tag_id) AS links
+    WHERE news_tag.id = links.tag_id;
+
+    INSERT INTO news_tagdailycount (tag_id, day, count)
+    SELECT links.tag_id, (news.date AT TIME ZONE '{time_zone}')::date, count(*)
+    FROM new_links AS links JOIN news_news AS news ON news.id = links.news_id
+    WHERE news.date IS NOT NULL
+    GROUP BY 1, 2 ORDER BY 1, 2
+    ON CONFLICT (tag_id, day) DO UPDATE SET count = news_tagdailycount.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION news_tag_counts_delete() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM news_tag WHERE id IN (SELECT tag_id FROM old_links) ORDER BY id FOR UPDATE;
+    UPDATE news_tag SET news_count = greatest(news_tag.news_count - links.count, 0)
+    FROM (SELECT tag_id, count(*) AS count FROM old_links GROUP BY tag_id) AS links
+    WHERE news_tag.id = links.tag_id;
+
+    UPDATE news_tagdailycount SET count = greatest(news_tagdailycount.count - links.count, 0)
+    FROM (
+        SELECT links.tag_id, (news.date AT TIME ZONE '{time_zone}')::date AS day, count(*) AS count
+        FROM old_links AS links JOIN news_news AS news ON news.id = links.news_id
+        WHERE news.date IS NOT NULL
+        GROUP BY 1, 2
+    ) AS links
+    WHERE news_tagdailycount.tag_id = links.tag_id AND news_tagdailycount.day = links.day;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER news_tag_counts_insert_trigger
+    AFTER INSERT ON news_news_tags REFERENCING NEW TABLE AS new_links
+    FOR EACH STATEMENT EXECUTE FUNCTION news_tag_counts_insert();
+
+CREATE TRIGGER news_tag_counts_delete_trigger
+    AFTER DELETE ON news_news_tags REFERENCING OLD TABLE AS old_links
+    FOR EACH STATEMENT EXECUTE FUNCTION news_tag_counts_delete();
+""".format(time_zone=settings.TIME_ZONE.replace("'", "''"))
+
+DROP_TAG_COUNT_TRIGGERS = """
+DROP TRIGGER IF EXISTS news_tag_counts_insert_trigger ON news_news_tags;
+DROP TRIGGER IF EXISTS news_tag_counts_delete_trigger ON news_news_tags;
+DROP FUNCTION IF EXISTS news_tag_counts_insert();
+DROP FUNCTION IF EXISTS news_tag_counts_delete();
+"""
+
+
+def fill_tag_counts(apps, schema_editor):
+    """
+    Counts the existing links of every tag, and of the days kept by TagDailyCount.
+    The links are locked against writes until the triggers take over at commit.
+    Keep the window in sync with TagDailyCount.window_start.
+    """
+    days = getattr(settings, 'TAG_DAILY_COUNT_DAYS', 30)
+    since = PersianCalendar.currnet_persian_datetime().date() - timedelta(days=days - 1)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('LOCK TABLE news_news_tags IN SHARE MODE')
+        cursor.execute(
+            'UPDATE news_tag SET news_count = links.count '
+            'FROM (SELECT tag_id, count(*) AS count FROM news_news_tags GROUP BY tag_id) AS links '
+            'WHERE news_tag.id = links.tag_id'
+        )
+        cursor.execute(
+            'INSERT INTO news_tagdailycount (tag_id, day, count) '
+            'SELECT links.tag_id, (news.date AT TIME ZONE %s)::date AS day, count(*) '
+            'FROM news_news_tags AS links JOIN news_news AS news ON news.id = links.news_id '
+            'WHERE (news.date AT TIME ZONE %s)::date >= %s GROUP BY 1, 2',
+            [settings.TIME_ZONE, settings.TIME_ZONE, since],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_crawlstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='news_count',
+            field=models.PositiveIntegerField(default=0, db_default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-news_count', 'id'], name='tag_news_count_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='tagdailycount',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_counts', to='news.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='tagdailycount',
+            index=models.Index(fields=['day'], name='tagdailycount_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tagdailycount',
+            constraint=models.UniqueConstraint(fields=('tag', 'day'), name='news_tagdailycount_unique_day'),
+        ),
+        migrations.RunSQL(CREATE_TAG_COUNT_TRIGGERS, DROP_TAG_COUNT_TRIGGERS),
+        migrations.RunPython(fill_tag_counts, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,31 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from datetime import date, timedelta
+from hashlib import sha256
 from .utils.persian_calendar import PersianCalendar
 
 
 class Tag(models.Model):
     tag_label = models.CharField(max_length=50, unique=True)
+    # Number of news linked to the tag, maintained by database triggers on the news-tag table.
+    news_count = models.PositiveIntegerField(default=0, db_default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Backs the popularity ordering of the tag stats.
+            models.Index(fields=['-news_count', 'id'], name='tag_news_count_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Saving a loaded tag must not write back a news_count which the triggers changed meanwhile.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'news_count'
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return self.tag_label
@@ -15,11 +37,103 @@ class News(models.Model):
     tags = models.ManyToManyField(to=Tag)
     resource = models.URLField(blank=False, unique=True)
     date = models.DateTimeField(default=PersianCalendar.currnet_persian_datetime, blank=True, null=True)
+    # Maintained by a database trigger from the Persian-normalized title (weight A) and text (weight B).
+    search_vector = SearchVectorField(null=True, editable=False)
+    # SHA-256 digest of the text, so duplicate checks use an index instead of comparing whole texts.
+    content_hash = models.CharField(max_length=64, editable=False, blank=True)
+
+    class Meta:
+        indexes = [
+            # Backs the default ordering and keyset pagination of the news list.
+            models.Index(fields=['-date', 'id'], name='news_date_id_idx'),
+            GinIndex(fields=['search_vector'], name='news_search_vector_idx'),
+            # Declared here instead of db_index=True, which would also add an unused LIKE pattern index.
+            models.Index(fields=['content_hash'], name='news_content_hash_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if self.date is None:
             self.date = PersianCalendar.currnet_persian_datetime()
+        self.content_hash = self.compute_content_hash(self.text)
         super().save(*args, **kwargs)
-    
+
+    @staticmethod
+    def compute_content_hash(text) -> str:
+        """Returns the hex digest identifying a news text."""
+        return sha256(text.encode('utf-8')).hexdigest()
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class CrawlState(models.Model):
+    """
+    Persisted progress of the crawls of an archive. The row with range_start and range_end
+    set to 0 belongs to the unseen-news runs and holds the source's high-water mark; the
+    other rows are checkpoints of range crawls which are resumed after a crash.
+
+    Attributes:
+        source: Url of the crawled archive.
+        range_start: First archive page of a range crawl, 0 for unseen-news runs.
+        range_end: Last archive page of a range crawl, 0 for unseen-news runs.
+        last_completed_page: Last archive page whose news were all saved.
+        newest_article_date: Date of the newest news crawled from the source.
+    """
+    source = models.URLField()
+    range_start = models.PositiveIntegerField(default=0)
+    range_end = models.PositiveIntegerField(default=0)
+    last_completed_page = models.PositiveIntegerField(null=True, blank=True)
+    newest_article_date = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'range_start', 'range_end'], name='news_crawlstate_unique_range'),
+        ]
+
+    def __str__(self) -> str:
+        if self.range_start or self.range_end:
+            return f'{self.source} pages {self.range_start}-{self.range_end}'
+        return self.source
+
+
+class TagDailyCount(models.Model):
+    """
+    Number of news of a day linked to a tag, maintained like Tag.news_count by database
+    triggers on the news-tag table. Days are the local dates of the news in TIME_ZONE.
+    Only the last ``KEPT_DAYS`` days are served, and older rows are removed by ``prune``.
+
+    Attributes:
+        tag: The counted tag.
+        day: Date of the counted news.
+        count: Number of news of the day linked to the tag.
+        KEPT_DAYS: Number of days, today included, whose counts are kept.
+    """
+    KEPT_DAYS = getattr(settings, 'TAG_DAILY_COUNT_DAYS', 30)
+
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='daily_counts')
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'day'], name='news_tagdailycount_unique_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='tagdailycount_day_idx'),
+        ]
+
+    @classmethod
+    def window_start(cls, days=None) -> date:
+        """Returns the first day of the last ``days`` days, today included, in the calendar of the news dates."""
+        today = PersianCalendar.currnet_persian_datetime().date()
+        return today - timedelta(days=(days or cls.KEPT_DAYS) - 1)
+
+    @classmethod
+    def prune(cls) -> int:
+        """Deletes the counts of the days before the kept window and returns their number."""
+        deleted, _ = cls.objects.filter(day__lt=cls.window_start()).delete()
+        return deleted
+
     def __str__(self) -> str:
-        return self.title
\ No newline at end of file
+        return f'{self.tag_id} {self.day}: {self.count}'
@@ -0,0 +1,220 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over news items ordered by newest ``date`` first, with ``id``
+    as an ascending tiebreak.
+    Instead of skipping rows with OFFSET, every page starts right after the last
+    row of the previous page, so deep pages cost the same as the first one and rows
+    inserted by the crawler in the meantime do not shift page boundaries.
+
+    Attributes:
+        page_size: Number of items on every page.
+        cursor_query_param: Query parameter holding the opaque cursor.
+        invalid_cursor_message: Error message for malformed cursors.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None) -> List:
+        """Returns one page of items seeking from the position encoded in the cursor."""
+        queryset, position, reverse = self.seek(queryset, request)
+        return self.set_page(list(queryset[:self.page_size + 1]), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None) -> List:
+        """Asynchronous version of paginate_queryset reading the page through the async ORM."""
+        queryset, position, reverse = self.seek(queryset, request)
+        return self.set_page([item async for item in queryset[:self.page_size + 1]], position, reverse)
+
+    def seek(self, queryset, request) -> Tuple[QuerySet, Optional[Tuple[datetime, int]], bool]:
+        """Returns the queryset ordered and bounded by the cursor's position, the position and the direction."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        # Rows without a date can not be placed on the (date, id) key; News.save always sets one.
+        queryset = queryset.filter(date__isnull=False)
+        if reverse:
+            queryset = queryset.order_by('date', '-id')
+        else:
+            queryset = queryset.order_by('-date', 'id')
+
+        if position is not None:
+            date, pk = position
+            # The plain range condition on date lets the (date, id) index bound the scan.
+            if reverse:
+                queryset = queryset.filter(date__gte=date).filter(Q(date__gt=date) | Q(id__lt=pk))
+            else:
+                queryset = queryset.filter(date__lte=date).filter(Q(date__lt=date) | Q(id__gt=pk))
+        return queryset, position, reverse
+
+    def set_page(self, items, position, reverse) -> List:
+        """Keeps page_size of the items read after the position, one more than a page, as the current page."""
+        has_more = len(items) > self.page_size
+        items = items[:self.page_size]
+
+        if reverse:
+            items.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = items
+        return items
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema) -> dict:
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self.encode_cursor((last.date, last.id), reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        first = self.page[0]
+        return self.encode_cursor((first.date, first.id), reverse=True)
+
+    def decode_cursor(self, request) -> Tuple[Optional[Tuple[datetime, int]], bool]:
+        """Decodes the cursor query parameter into a ``(date, id)`` position and a direction flag."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            decoded = urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8')
+            date, pk, reverse = decoded.split('|')
+            return (datetime.fromisoformat(date), int(pk)), bool(int(reverse))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position: Tuple[datetime, int], reverse: bool) -> str:
+        """Returns the url of the page starting right after (or before, if reverse) the given position."""
+        return replace_query_param(self.base_url, self.cursor_query_param, self.cursor_value(position, reverse))
+
+    @staticmethod
+    def cursor_value(position: Tuple[datetime, int], reverse: bool = False) -> str:
+        """Returns the opaque cursor of the given ``(date, id)`` position."""
+        date, pk = position
+        raw = f'{date.isoformat()}|{pk}|{int(reverse)}'
+        return urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination which can also read the page through the async ORM. The count and
+    the page are queried asynchronously; the page links and the paginated response are the
+    same as those of PageNumberPagination.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None) -> Optional[List]:
+        """Asynchronous version of paginate_queryset."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # The count is cached by the paginator, so validating the page number runs no query.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        self.page.object_list = [item async for item in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return self.page.object_list
+
+
+class NewsPagination(AsyncPageNumberPagination):
+    """
+    Page number pagination for the news list with an opt-in keyset mode.
+    Requests carrying the ``cursor`` query parameter (an empty value starts at the
+    newest item) are paginated by KeysetPagination; every other request keeps the
+    regular ``?page=`` behaviour.
+
+    Attributes:
+        keyset_class: Pagination class used in cursor mode.
+        cursor_query_param: Query parameter which switches the request to cursor mode.
+    """
+    keyset_class = KeysetPagination
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            self.display_page_controls = False
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            self.display_page_controls = False
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        self.keyset = None
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data) -> Response:
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self) -> Optional[str]:
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view) -> list:
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Keyset pagination cursor. Pass an empty value to start from the newest news item.',
+            'schema': {'type': 'string'},
+        })
+        return parameters
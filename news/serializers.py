@@ -1,7 +1,57 @@
 from . import models
+from .instrumentation import measure
 from rest_framework import serializers
+from typing import Optional, Set
 
-class TagSerializer(serializers.ModelSerializer):
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for choosing the emitted fields through the request's query string.
+    ``?fields=a,b`` keeps only the listed fields and ``?omit=a,b`` drops the listed ones.
+
+    Attributes:
+        fields_query_param: Query parameter listing the fields to keep.
+        omit_query_param: Query parameter listing the fields to drop.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(self.context.get('request'))
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, request) -> Optional[Set[str]]:
+        """Returns the names of the fields requested by the given request, or None if all fields are requested."""
+        if request is None:
+            return None
+
+        query_params = getattr(request, 'query_params', request.GET)
+        available = set(cls.Meta.fields)
+        selected = available
+        if query_params.get(cls.fields_query_param):
+            selected = {name.strip() for name in query_params[cls.fields_query_param].split(',')} & available
+        if query_params.get(cls.omit_query_param):
+            selected = selected - {name.strip() for name in query_params[cls.omit_query_param].split(',')}
+
+        return None if selected == available else selected
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin recording the time spent serializing under the 'serialize' stage of the
+    current request's Server-Timing measurements. Nested serializers count only once.
+    """
+
+    def to_representation(self, instance):
+        with measure('serialize'):
+            return super().to_representation(instance)
+
+
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Tag model. Converts Tag model items into a dictionary.
 
@@ -14,10 +64,44 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ('id', 'tag_label')
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class TagDailyCountSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the TagDailyCount model. Converts the count of a tag's news of one day into a dictionary.
+
+    Meta:
+        model: The model being serialized.
+        fields: Fields to include in the serialization process.
+    """
+    class Meta:
+        model = models.TagDailyCount
+        fields = ('day', 'count')
+
+
+class TagStatsSerializer(TagSerializer):
+    """
+    Serializer for tags with their popularity. Adds the total number of news of the tag,
+    the number of news of the requested recent days and the counts of those days.
+
+    Attributes:
+        recent_count: Number of news of the requested recent days, annotated by the queryset.
+        daily_counts: Counts of the recent days with news, newest first, prefetched by the queryset.
+
+    Meta:
+        model: The model being serialized.
+        fields: Fields to include in the serialization process.
+    """
+    recent_count = serializers.IntegerField(read_only=True)
+    daily_counts = TagDailyCountSerializer(many=True, read_only=True, source='recent_daily_counts')
+
+    class Meta(TagSerializer.Meta):
+        fields = ('id', 'tag_label', 'news_count', 'recent_count', 'daily_counts')
+
+
+class NewsSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the News model. Includes nested serialization for tags
     related to a news item. Converts News model items into a dictionary.
+    Supports sparse fieldsets through the ``fields`` and ``omit`` query parameters.
 
     Attributes:
         tags: Nested serializer for the tags related to the news item.
@@ -0,0 +1,21 @@
+from .cache import bump_generation
+from .models import News, Tag
+from .utils.tag_cache import evict_tag
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=News.tags.through)
+def invalidate_cached_responses(sender, **kwargs) -> None:
+    """Invalidates the cached API responses whenever news, tags or their relations change."""
+    bump_generation()
+
+
+@receiver(post_delete, sender=Tag)
+def evict_deleted_tag(sender, instance, **kwargs) -> None:
+    """Keeps the crawler's tag cache from linking news to a deleted tag."""
+    evict_tag(instance.tag_label)
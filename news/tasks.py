@@ -1,9 +1,150 @@
-from .utils.zoomit_crawler import ZoomitCrawler
-from celery import shared_task
+from .cache import bump_generation
+from .metrics import TASK_SECONDS, mark_process_dead
+from .models import TagDailyCount
+from .utils.crawlers import get_crawler
+from .utils.crawl_progress import CrawlProgress
+from .utils.tag_cache import get_tag_cache
+from .utils.webdriver_pool import get_webdriver_pool, shutdown_webdriver_pool
+from celery import chord, group, shared_task
+from celery.result import AsyncResult
+from celery.signals import task_postrun, task_prerun, worker_process_init, worker_process_shutdown
+from django.conf import settings
+from typing import Dict, List, Tuple
+from uuid import uuid4
+import os
+import time
 
 @shared_task
 def crawl_zoomit_unseen_news():
-    """ Celery task to call the zoomit crawler."""
-    crawler = ZoomitCrawler()
-    crawler.crawl_unseen_news()
-    crawler.quit()
+    """ Celery task to call the zoomit crawler of the configured engine with a warm browser from the worker's pool."""
+    crawler = get_crawler(pool=get_webdriver_pool())
+    try:
+        crawler.crawl_unseen_news()
+    finally:
+        crawler.quit()
+
+
+@shared_task
+def collect_zoomit_links(from_page, to_page, run_id, archive="https://www.zoomit.ir/archive/", engine=None) -> List[str]:
+    """Celery task collecting the news links of a chunk of archive pages with the given or configured engine."""
+    crawler = get_crawler(engine, pool=get_webdriver_pool())
+    try:
+        links = crawler.collect_links(from_page, to_page, archive)
+    finally:
+        crawler.quit()
+
+    progress = CrawlProgress(run_id)
+    progress.add('pages_done', to_page - from_page + 1)
+    progress.add('links_total', len(links))
+    return links
+
+
+@shared_task(bind=True)
+def fan_out_zoomit_links(self, link_chunks, run_id, engine=None):
+    """
+    Celery task receiving the links collected by every archive chunk. Replaces itself by a
+    chord crawling batches of links on the worker group and summarizing the results.
+    """
+    links = list(dict.fromkeys(link for chunk in link_chunks for link in chunk))
+    batch_size = settings.CRAWLER_FANOUT_BATCH_SIZE
+    batches = [links[start:start + batch_size] for start in range(0, len(links), batch_size)]
+    if not batches:
+        return summarize_zoomit_crawl([], run_id)
+
+    return self.replace(chord(
+        group(crawl_zoomit_links.s(batch, run_id, engine) for batch in batches),
+        summarize_zoomit_crawl.s(run_id)
+    ))
+
+
+@shared_task
+def crawl_zoomit_links(links, run_id, engine=None) -> int:
+    """Celery task crawling a batch of news links with the given or configured engine. Returns the number of saved news."""
+    crawler = get_crawler(engine, pool=get_webdriver_pool())
+    try:
+        saved = crawler.crawl_links(links)
+    finally:
+        crawler.quit()
+
+    progress = CrawlProgress(run_id)
+    progress.add('links_done', len(links))
+    progress.add('news_saved', saved)
+    return saved
+
+
+@shared_task
+def summarize_zoomit_crawl(saved_counts, run_id) -> dict:
+    """Celery task returning the final counters of a distributed crawl run."""
+    summary = CrawlProgress(run_id).snapshot()
+    summary['news_saved'] = sum(saved_counts)
+    return summary
+
+
+@shared_task
+def prune_tag_daily_counts() -> int:
+    """Celery task deleting the daily tag counts older than the kept window. Returns the number of deleted rows."""
+    deleted = TagDailyCount.prune()
+    if deleted:
+        bump_generation()
+    return deleted
+
+
+def split_page_range(from_page, to_page, chunks) -> List[Tuple[int, int]]:
+    """Splits an inclusive page range into at most the given number of contiguous, nearly equal chunks."""
+    pages = to_page - from_page + 1
+    chunks = max(1, min(chunks, pages))
+    size, extra = divmod(pages, chunks)
+    ranges, start = [], from_page
+    for index in range(chunks):
+        end = start + size + (1 if index < extra else 0) - 1
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+
+def crawl_zoomit_range_in_parallel(from_page, to_page, parallel, archive="https://www.zoomit.ir/archive/",
+                                   engine=None) -> Tuple[CrawlProgress, AsyncResult]:
+    """
+    Starts a distributed crawl of an archive page range. The range is split into parallel
+    chunks whose links are collected by a chord, then the links are fanned out in batches to
+    the workers. Every task crawls with the given engine, or the one set by the CRAWLER_ENGINE
+    setting. Returns the progress counters of the run and the result of the workflow.
+    """
+    progress = CrawlProgress(uuid4().hex)
+    progress.start(to_page - from_page + 1)
+    workflow = chord(
+        group(collect_zoomit_links.s(start, end, progress.run_id, archive, engine)
+              for start, end in split_page_range(from_page, to_page, parallel)),
+        fan_out_zoomit_links.s(progress.run_id, engine)
+    )
+    return progress, workflow.apply_async()
+
+
+@worker_process_init.connect
+def warm_tag_cache(**kwargs):
+    """Loads the most used tags when a worker process starts, so its first crawl does not pay for it."""
+    get_tag_cache()
+
+
+@worker_process_shutdown.connect
+def quit_webdrivers(**kwargs):
+    """Quits the pooled browsers and drops the live metrics of a worker process when it exits."""
+    shutdown_webdriver_pool()
+    mark_process_dead(os.getpid())
+
+
+_task_started: Dict[str, float] = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    """Records the start of a task run for its runtime metric."""
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task_runtime(task_id=None, task=None, state=None, **kwargs):
+    """Observes the runtime of a finished task by task name and final state."""
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_SECONDS.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started)
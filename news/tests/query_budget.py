@@ -0,0 +1,36 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class _AssertQueryBudgetContext(CaptureQueriesContext):
+    """Captures the queries of a block and fails the test if they exceed the budget."""
+
+    def __init__(self, test_case, budget, connection):
+        self.test_case = test_case
+        self.budget = budget
+        super().__init__(connection)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        executed = len(self)
+        self.test_case.assertLessEqual(
+            executed, self.budget,
+            "%d queries executed, the budget is %d\nCaptured queries were:\n%s" % (
+                executed, self.budget,
+                '\n'.join('%d. %s' % (i, query['sql']) for i, query in enumerate(self.captured_queries, start=1))
+            )
+        )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin providing assertQueryBudget. Unlike assertNumQueries it allows fewer
+    queries than the budget, so endpoints can get cheaper without touching the tests but
+    fail as soon as they issue more queries, e.g. one per item of a page.
+    """
+
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        """Returns a context manager failing the test if the block runs more than budget queries."""
+        return _AssertQueryBudgetContext(self, budget, connections[using])
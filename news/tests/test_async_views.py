@@ -0,0 +1,72 @@
+from ..models import News, Tag
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+
+# Tests for async_views.py
+class AsyncReadOnlyViewTest(TestCase):
+    """TestCase for the async read endpoints. Verifies that they answer like the synchronous routes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tags = [Tag.objects.create(tag_label=label) for label in ('فناوری', 'موبایل', 'هوش مصنوعی')]
+        for number in range(60):
+            news = News.objects.create(
+                title=f'خبر {number}', text=f'متن خبر {number} درباره {"گوشی" if number % 2 else "لپ‌تاپ"}',
+                resource=f'http://a.com/{number}'
+            )
+            news.tags.add(cls.tags[number % 3])
+
+    def setUp(self):
+        cache.clear()
+        self.async_client = AsyncClient()
+
+    async def assertSameResponse(self, sync_url, async_url):
+        """Asserts that the async route answers with the status and data of the synchronous route."""
+        expected = await self.async_client.get(sync_url, headers={'Accept': 'application/json'})
+        response = await self.async_client.get(async_url)
+        self.assertEqual(response.status_code, expected.status_code)
+        # Page links point to the route which served the page.
+        self.assertEqual(response.content.replace(b'/async/', b'/'), expected.content)
+        return response
+
+    async def test_news_list(self):
+        """Tests the news list with page numbers, search, tag filters, sparse fieldsets and cursors."""
+        for query in ('', '?page=2', '?page=9', '?search=گوشی', f'?tags={self.tags[1].id}', '?tags=999999',
+                      '?fields=id,title', '?cursor=', '?cursor=bad'):
+            with self.subTest(query=query):
+                await self.assertSameResponse(reverse('news-list') + query, reverse('async-news-list') + query)
+
+    async def test_cursor_links(self):
+        """Tests that the links of the async cursor pages lead through the whole archive."""
+        url, ids = reverse('async-news-list') + '?cursor=', []
+        while url:
+            page = (await self.async_client.get(url)).json()
+            ids.extend(news['id'] for news in page['results'])
+            url = page['next']
+        self.assertEqual(len(ids), 60)
+        self.assertEqual(len(set(ids)), 60)
+
+    async def test_news_detail(self):
+        """Tests news details and missing news."""
+        news = await News.objects.afirst()
+        for pk in (news.id, 999999, 'abc'):
+            with self.subTest(pk=pk):
+                await self.assertSameResponse(reverse('news-detail', args=[pk]), reverse('async-news-detail', args=[pk]))
+
+    async def test_tags(self):
+        """Tests the tag list, tag search and tag details."""
+        await self.assertSameResponse(reverse('tag-list'), reverse('async-tag-list'))
+        await self.assertSameResponse(reverse('tag-list') + '?search=موب', reverse('async-tag-list') + '?search=موب')
+        pk = self.tags[0].id
+        await self.assertSameResponse(reverse('tag-detail', args=[pk]), reverse('async-tag-detail', args=[pk]))
+
+    async def test_conditional_and_cached_requests(self):
+        """Tests that the validators of the async routes answer conditional requests with 304."""
+        response = await self.async_client.get(reverse('async-news-list'))
+        self.assertRegex(response['Server-Timing'], r'db;desc="[1-9]\d* queries"')
+        cached = await self.async_client.get(reverse('async-news-list'))
+        self.assertEqual(cached.json(), response.json())
+        not_modified = await self.async_client.get(reverse('async-news-list'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
@@ -0,0 +1,144 @@
+from ..benchmarks import api
+from ..benchmarks.api import ApiBenchmark
+from ..benchmarks.crawler import CrawlerBenchmark, find_regressions
+from ..benchmarks.dataset import SyntheticDataset
+from ..models import News, Tag
+from django.core.management import CommandError, call_command
+from django.db.models import Count, Max, Min
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from datetime import timedelta
+from io import StringIO
+import json
+import os
+import tempfile
+
+
+# Tests for benchmarks/crawler.py
+class CrawlerBenchmarkTest(TransactionTestCase):
+    """TestCase for the crawler benchmark. Runs a small benchmark against the fixture site; the benchmark truncates tables, so it needs real transactions."""
+
+    def test_run_reports_measurements(self):
+        """Tests that a run crawls the whole fixture site and reports throughput, queries and stage timings."""
+        News.objects.create(title='left over', text='left over', resource='http://old.com/')
+        benchmark = CrawlerBenchmark('http', pages=2, news_per_page=3, selenium_fallback=False)
+        for scenario in CrawlerBenchmark.SCENARIOS:
+            result = benchmark.run(scenario)
+            self.assertEqual((result['pages'], result['articles']), (8, 6))
+            self.assertGreater(result['articles_per_second'], 0)
+            self.assertLess(result['queries_per_article'], 5)
+            self.assertEqual(set(result['stages']), {'fetch', 'parse', 'save'})
+            self.assertEqual(result['stages']['parse']['count'], 8)
+
+
+class FindRegressionsTest(SimpleTestCase):
+    """TestCase for comparing benchmark results with a baseline."""
+
+    baseline = {'pages_per_second': 100, 'articles_per_second': 90, 'queries_per_article': 1.0}
+
+    def test_within_tolerance(self):
+        """Tests that small changes are not reported."""
+        result = {'pages_per_second': 95, 'articles_per_second': 80, 'queries_per_article': 1.1}
+        self.assertEqual(find_regressions(result, self.baseline, tolerance=0.15), [])
+
+    def test_regressions(self):
+        """Tests that slower throughput and more queries per article are reported."""
+        result = {'pages_per_second': 50, 'articles_per_second': 90, 'queries_per_article': 2.0}
+        self.assertEqual(len(find_regressions(result, self.baseline, tolerance=0.15)), 2)
+
+
+# Tests for benchmarks/dataset.py
+class SyntheticDatasetTest(TestCase):
+    """TestCase for the synthetic dataset generator."""
+
+    def test_generate(self):
+        """Tests that news, tags and links are inserted with the shape of the crawled archive."""
+        out = StringIO()
+        call_command('generate_news', 300, 40, '--batch-size', '100', '--years', '3', stdout=out)
+        self.assertIn('Successfully generated 300 news and 40 tags', out.getvalue())
+        self.assertEqual((News.objects.count(), Tag.objects.count()), (300, 40))
+
+        news = News.objects.get(id=News.objects.order_by('id').values_list('id', flat=True)[150])
+        self.assertEqual(news.content_hash, News.compute_content_hash(news.text))
+        self.assertGreater(len(news.text.split()), 30)
+        self.assertIsNotNone(News.objects.filter(search_vector__isnull=False).first())
+        dates = News.objects.aggregate(oldest=Min('date'), newest=Max('date'))
+        self.assertGreater(dates['newest'] - dates['oldest'], timedelta(days=365 * 2))
+
+        counts = sorted(Tag.objects.annotate(links=Count('news')).values_list('links', flat=True))
+        # Links written by COPY are counted by the triggers too.
+        self.assertEqual(sorted(Tag.objects.values_list('news_count', flat=True)), counts)
+        # Zipf popularity: the most popular tag is linked far more often than the median one.
+        self.assertGreater(counts[-1], 5 * counts[len(counts) // 2])
+
+    def test_same_seed_same_data(self):
+        """Tests that generated texts depend only on the seed."""
+        self.assertEqual(SyntheticDataset(1, 1, seed=3).text(), SyntheticDataset(1, 1, seed=3).text())
+
+
+class SyntheticDatasetWorkersTest(TransactionTestCase):
+    """TestCase for concurrent generation; workers use their own connections, so the data must be committed."""
+
+    def test_workers_generate_the_same_data(self):
+        """Tests that batches inserted by several workers hold the same texts as batches inserted by one."""
+        SyntheticDataset(200, 20, seed=5).generate(batch_size=50)
+        texts = sorted(News.objects.values_list('text', flat=True))
+        News.objects.all().delete()
+        SyntheticDataset(200, 20, seed=5).generate(batch_size=50, workers=3)
+        self.assertEqual(sorted(News.objects.values_list('text', flat=True)), texts)
+
+
+# Tests for benchmarks/api.py
+class ApiBenchmarkTest(TestCase):
+    """TestCase for the API benchmark over a small seeded dataset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        SyntheticDataset(120, 10).generate(batch_size=50)
+
+    def test_run_reports_measurements(self):
+        """Tests that every scenario is answered without errors and reports latency percentiles and queries."""
+        benchmark = ApiBenchmark(requests=5)
+        for scenario in ApiBenchmark.SCENARIOS:
+            result = benchmark.run(scenario)
+            self.assertEqual((result['requests'], result['errors']), (5, 0), scenario)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+            self.assertGreater(result['throughput_per_worker'], 0)
+            self.assertGreater(result['queries_per_request'], 0)
+
+    def test_deep_pagination_paths(self):
+        """Tests that the deep page and the deep cursor point at the same position of the archive."""
+        benchmark = ApiBenchmark(requests=1, depth=0.5)
+        benchmark.prepare()
+        self.assertIn('page=2', benchmark.paths['deep_page'][0])
+        page = benchmark.client.get(benchmark.paths['deep_page'][0]).json()['results']
+        cursor_page = benchmark.client.get(benchmark.paths['deep_cursor'][0]).json()['results']
+        # The cursor page starts right after the news at offset 59, the 10th news of page 2.
+        self.assertEqual(cursor_page[0]['id'], page[10]['id'])
+
+    def test_baseline_of_another_dataset_is_refused(self):
+        """Tests that the dataset size is recorded with the results and a baseline of another size is not compared."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output = os.path.join(directory.name, 'api.json')
+        options = {'scenario': 'tag_list', 'requests': 1, 'existing': True, 'stdout': StringIO()}
+        call_command('bench_api', output=output, **options)
+        with open(output) as file:
+            results = json.load(file)
+        self.assertEqual(results['dataset'], {'news': 120, 'tags': 10})
+        self.assertIn('tag_list', results['scenarios'])
+
+        # A single timed request is noise, so only the dataset check and the query count may fail here.
+        call_command('bench_api', baseline=output, tolerance=100, **options)
+        results['dataset']['news'] = 1_000_000
+        with open(output, 'w') as file:
+            json.dump(results, file)
+        with self.assertRaisesMessage(CommandError, 'record a new baseline'):
+            call_command('bench_api', baseline=output, **options)
+
+    def test_regressions(self):
+        """Tests that slower percentiles, lower throughput and extra queries are reported."""
+        baseline = {'p95_ms': 10, 'p99_ms': 20, 'throughput_per_worker': 100, 'max_queries': 3}
+        self.assertEqual(api.find_regressions(dict(baseline, p95_ms=11), baseline), [])
+        result = {'p95_ms': 20, 'p99_ms': 20, 'throughput_per_worker': 50, 'max_queries': 4}
+        self.assertEqual(len(api.find_regressions(result, baseline)), 3)
@@ -0,0 +1,128 @@
+from ..models import Tag, News
+from ..cache import bump_generation, cache_stats, get_generation
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.http import parse_http_date
+from rest_framework.test import APITestCase, APIClient
+from unittest import mock
+import time
+
+
+# Tests for cache.py
+class CachedResponseTest(APITestCase):
+    """
+    TestCase for the response cache of the news and tag endpoints. Verifies that repeated
+    requests are served from the cache and that data changes invalidate cached responses.
+    """
+
+    def setUp(self):
+        """Clears the cache and sets up a Tag and a News instance."""
+        cache.clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(tag_label="cache-tag")
+        self.news = News.objects.create(
+            title="cached news",
+            text="This news is served from the cache.",
+            resource="http://cache.com/1"
+        )
+        self.news.tags.add(self.tag)
+
+    def test_repeated_request_hits_cache(self):
+        """Tests that a repeated list request is answered without database queries."""
+        first = self.client.get(reverse('news-list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('news-list'))
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats()['hits'], 1)
+        self.assertEqual(cache_stats()['misses'], 1)
+
+    def test_query_string_is_normalized(self):
+        """Tests that the order of query parameters does not create separate cache entries."""
+        self.client.get(reverse('news-list'), {'search': 'cached', 'tags': self.tag.id})
+        with self.assertNumQueries(0):
+            self.client.get(reverse('news-list') + f'?tags={self.tag.id}&search=cached')
+
+    def test_model_changes_invalidate_cache(self):
+        """Tests that creating a news item makes the next list request see it."""
+        self.client.get(reverse('news-list'))
+        News.objects.create(title="fresh news", text="Fresh.", resource="http://cache.com/2")
+        response = self.client.get(reverse('news-list'))
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_tag_detail_is_cached(self):
+        """Tests that detail responses are cached and invalidated by generation bumps."""
+        self.client.get(reverse('tag-detail', args=[self.tag.id]))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('tag-detail', args=[self.tag.id]))
+        bump_generation()
+        # One query refreshes the conditional GET validators, one loads the tag.
+        with self.assertNumQueries(2):
+            self.client.get(reverse('tag-detail', args=[self.tag.id]))
+
+    def test_generation_survives_eviction(self):
+        """Tests that the generation counter is recreated after being evicted."""
+        generation = get_generation()
+        cache.delete('news:generation')
+        bump_generation()
+        self.assertNotEqual(get_generation(), generation)
+
+    def test_cache_stats_endpoint(self):
+        """Tests that the cache statistics are exposed through the API."""
+        self.client.get(reverse('tag-list'))
+        response = self.client.get(reverse('cache-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['misses'], 1)
+
+
+class ConditionalGetTest(APITestCase):
+    """
+    TestCase for conditional requests on the news and tag endpoints. Verifies that current
+    validators are answered with 304 and that data changes produce new validators.
+    """
+
+    def setUp(self):
+        """Clears the cache and sets up a News instance."""
+        cache.clear()
+        self.client = APIClient()
+        self.news = News.objects.create(
+            title="polled news",
+            text="This news is polled by clients.",
+            resource="http://conditional.com/1"
+        )
+
+    def test_validators_are_sent(self):
+        """Tests that list responses carry ETag and Last-Modified headers."""
+        response = self.client.get(reverse('news-list'))
+        self.assertIn('ETag', response.headers)
+        self.assertIn('Last-Modified', response.headers)
+
+    def test_if_none_match_returns_not_modified(self):
+        """Tests that a matching If-None-Match is answered with 304 without database queries."""
+        etag = self.client.get(reverse('news-list')).headers['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('news-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.content)
+
+    def test_if_modified_since_returns_not_modified(self):
+        """Tests that an If-Modified-Since equal to Last-Modified is answered with 304."""
+        last_modified = self.client.get(reverse('tag-list')).headers['Last-Modified']
+        response = self.client.get(reverse('tag-list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_tag_change_moves_last_modified(self):
+        """Tests that a change which leaves the newest news alone still fails an older If-Modified-Since."""
+        last_modified = self.client.get(reverse('tag-list')).headers['Last-Modified']
+        with mock.patch('news.cache.time.time', return_value=time.time() + 5):
+            Tag.objects.create(tag_label="new tag")
+        response = self.client.get(reverse('tag-list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(parse_http_date(response.headers['Last-Modified']), parse_http_date(last_modified))
+
+    def test_data_change_changes_etag(self):
+        """Tests that a stale ETag gets a full response after the data has changed."""
+        etag = self.client.get(reverse('news-list')).headers['ETag']
+        News.objects.create(title="newer news", text="Newer.", resource="http://conditional.com/2")
+        response = self.client.get(reverse('news-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
@@ -0,0 +1,75 @@
+from ..models import News, Tag
+from ..views import NewsViewSet
+from .query_budget import QueryBudgetMixin
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from datetime import timedelta
+import csv
+import io
+import json
+from unittest import mock
+
+
+# Tests for export.py
+class NewsExportTest(QueryBudgetMixin, APITestCase):
+    """TestCase for the streaming news export. Verifies the NDJSON and CSV output, the filters and the query count."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tag = Tag.objects.create(tag_label="فناوری")
+        now = timezone.now()
+        self.news = []
+        for number in range(5):
+            news = News.objects.create(
+                title=f"خبر {number}", text=f"متن, \"خبر\" {number}",
+                resource=f"http://export.com/{number}", date=now - timedelta(days=number)
+            )
+            if number % 2 == 0:
+                news.tags.add(self.tag)
+            self.news.append(news)
+
+    def export(self, **params):
+        response = self.client.get(reverse('news-export'), params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_ndjson(self):
+        """Tests that every news is streamed as one JSON document per line, newest first."""
+        response, content = self.export()
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [news.id for news in self.news])
+        self.assertEqual(rows[0]['tags'], [{'id': self.tag.id, 'tag_label': "فناوری"}])
+
+    def test_export_csv(self):
+        """Tests that the CSV export has a header line and writes tags as their labels."""
+        response, content = self.export(output='csv', fields='id,title,text,tags')
+        self.assertTrue(response['Content-Disposition'].endswith('news.csv"'))
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], ['id', 'title', 'text', 'tags'])
+        self.assertEqual(rows[1], [str(self.news[0].id), "خبر 0", "متن, \"خبر\" 0", "فناوری"])
+        self.assertEqual(len(rows), 6)
+
+    def test_export_filters(self):
+        """Tests that the export honours the tags filter and the since bound."""
+        since = (timezone.now() - timedelta(days=2, hours=12)).isoformat()
+        _, content = self.export(tags=self.tag.id, since=since)
+        self.assertEqual([json.loads(line)['id'] for line in content.splitlines()], [self.news[0].id, self.news[2].id])
+
+    def test_export_since_date(self):
+        """Tests that since accepts a plain date and rejects invalid values."""
+        _, content = self.export(since=(timezone.localdate() + timedelta(days=1)).isoformat())
+        self.assertEqual(content, '')
+        response = self.client.get(reverse('news-export'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_reads_in_chunks(self):
+        """Tests that rows and their tags are read in chunks instead of one query per row."""
+        News.objects.bulk_create(
+            News(title=f"old {number}", text=f"old text {number}", resource=f"http://old.com/{number}")
+            for number in range(300)
+        )
+        with mock.patch.object(NewsViewSet, 'export_chunk_size', 100), self.assertQueryBudget(5):
+            _, content = self.export()
+        self.assertEqual(len(content.splitlines()), 305)
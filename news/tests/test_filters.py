@@ -0,0 +1,77 @@
+from ..models import News
+from ..utils.persian_text import PersianText
+from django.contrib.postgres.search import SearchQuery
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APITestCase, APIClient
+
+
+# Tests for filters.py
+class NewsSearchFilterTest(APITestCase):
+    """
+    TestCase for the NewsSearchFilter. Verifies full-text matching, ranking
+    and Persian normalization of the news search.
+    """
+
+    def setUp(self):
+        """Sets up news items matching the same word once in the title and once in the text."""
+        self.client = APIClient()
+        self.text_match = News.objects.create(
+            title="بررسی گوشی",
+            text="این گوشی با پردازنده جدید کوالکام عرضه شد.",
+            resource="http://search.com/text"
+        )
+        self.title_match = News.objects.create(
+            title="پردازنده جدید کوالکام",
+            text="جزئیات بیشتری منتشر شد.",
+            resource="http://search.com/title"
+        )
+        self.unrelated = News.objects.create(
+            title="خودروی برقی",
+            text="یک خودروی برقی تازه معرفی شد.",
+            resource="http://search.com/unrelated"
+        )
+
+    def test_search_vector_is_maintained(self):
+        """Tests that the search vector is filled on insert and refreshed on update."""
+        self.unrelated.title = "sample headline"
+        self.unrelated.save()
+        self.assertTrue(News.objects.filter(search_vector=SearchQuery('headline', config='simple')).exists())
+
+    def test_title_ranks_above_text(self):
+        """Tests that a match in the title ranks above a match in the text."""
+        response = self.client.get(reverse('news-list'), {'search': 'کوالکام'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [news['id'] for news in response.data['results']],
+            [self.title_match.id, self.text_match.id]
+        )
+
+    def test_search_matches_prefixes(self):
+        """Tests that a search term matches words starting with it."""
+        response = self.client.get(reverse('news-list'), {'search': 'پردازن'})
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_search_normalizes_arabic_characters(self):
+        """Tests that a term typed with Arabic yeh and kaf finds news written with Persian letters."""
+        response = self.client.get(reverse('news-list'), {'search': 'خودروي'})
+        self.assertEqual([news['id'] for news in response.data['results']], [self.unrelated.id])
+
+    def test_search_word_with_zero_width_non_joiner(self):
+        """Tests that a word typed with a zero-width non-joiner finds news where it is indexed as two words."""
+        news = News.objects.create(title="معرفی کتاب‌ها", text="فهرست کتاب‌های تازه.", resource="http://search.com/zwnj")
+        response = self.client.get(reverse('news-list'), {'search': 'کتاب‌ها'})
+        self.assertEqual([item['id'] for item in response.data['results']], [news.id])
+
+    def test_search_ignores_tsquery_operators(self):
+        """Tests that tsquery syntax inside search terms is treated as plain text."""
+        response = self.client.get(reverse('news-list'), {'search': "!'&|:*"})
+        self.assertEqual(response.status_code, 200)
+
+
+class PersianTextTest(TestCase):
+    """TestCase for the PersianText normalizer."""
+
+    def test_normalize(self):
+        """Tests that Arabic letters and zero-width non-joiners are normalized."""
+        self.assertEqual(PersianText.normalize("كتابي‌ها"), "کتابی ها")
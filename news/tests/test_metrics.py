@@ -0,0 +1,107 @@
+from ..metrics import render_metrics
+from ..models import News
+from ..tasks import summarize_zoomit_crawl
+from ..utils.news_pipeline import NewsPipeline
+from ..utils.tag_cache import get_tag_cache
+from celery.signals import task_postrun, task_prerun
+from django.core.cache import cache
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase
+from prometheus_client import REGISTRY
+from unittest import mock
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+
+
+def sample(name, **labels):
+    """Returns the current value of a sample of the default registry, 0 if it was never recorded."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+# Tests for metrics.py
+class MetricsViewTest(TestCase):
+    """TestCase for the /metrics endpoint and the request and cache metrics."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_request_and_cache_metrics(self):
+        """Tests that requests are recorded by route with their queries and response cache lookups."""
+        labels = {'method': 'GET', 'route': 'news-list', 'status': '200'}
+        requests = sample('technews_request_duration_seconds_count', **labels)
+        queries = sample('technews_db_queries_total', route='news-list')
+        misses = sample('technews_response_cache_requests_total', result='miss')
+        hits = sample('technews_response_cache_requests_total', result='hit')
+
+        self.client.get(reverse('news-list'))
+        self.client.get(reverse('news-list'))
+        self.assertEqual(sample('technews_request_duration_seconds_count', **labels), requests + 2)
+        self.assertGreater(sample('technews_db_queries_total', route='news-list'), queries)
+        self.assertEqual(sample('technews_response_cache_requests_total', result='miss'), misses + 1)
+        self.assertEqual(sample('technews_response_cache_requests_total', result='hit'), hits + 1)
+
+    def test_metrics_endpoint(self):
+        """Tests that the metrics are exposed in the Prometheus text format."""
+        self.client.get(reverse('tag-list'))
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'technews_request_duration_seconds_bucket{', response.content)
+        self.assertIn(b'route="tag-list"', response.content)
+
+    def test_crawler_metrics(self):
+        """Tests that saved and duplicate news and the save stage are recorded by the pipeline."""
+        get_tag_cache().clear()
+        saved = sample('technews_crawler_articles_saved_total')
+        duplicates = sample('technews_crawler_duplicates_skipped_total')
+        saves = sample('technews_crawler_stage_duration_seconds_count', stage='save')
+        News.objects.create(title='قدیمی', text='متن قدیمی', resource='http://a.com/old')
+
+        pipeline = NewsPipeline()
+        pipeline.add('قدیمی', 'متن قدیمی', 'http://a.com/old', None, [])
+        pipeline.add('جدید', 'متن جدید', 'http://a.com/new', None, ['فناوری'])
+        pipeline.flush()
+        self.assertEqual(sample('technews_crawler_articles_saved_total'), saved + 1)
+        self.assertEqual(sample('technews_crawler_duplicates_skipped_total'), duplicates + 1)
+        self.assertEqual(sample('technews_crawler_stage_duration_seconds_count', stage='save'), saves + 1)
+
+    def test_task_runtime(self):
+        """Tests that the runtime of a Celery task is observed by task name and state."""
+        labels = {'task': 'news.tasks.summarize_zoomit_crawl', 'state': 'SUCCESS'}
+        runs = sample('technews_celery_task_duration_seconds_count', **labels)
+        # The signals a worker sends around a task run.
+        task_prerun.send(sender=summarize_zoomit_crawl, task_id='metrics-test', task=summarize_zoomit_crawl)
+        task_postrun.send(sender=summarize_zoomit_crawl, task_id='metrics-test', task=summarize_zoomit_crawl, state='SUCCESS')
+        self.assertEqual(sample('technews_celery_task_duration_seconds_count', **labels), runs + 1)
+
+
+class MultiprocessMetricsTest(SimpleTestCase):
+    """TestCase for adding up the metrics written by several worker processes."""
+
+    def test_processes_are_aggregated(self):
+        """Tests that the exposition sums the counters of every process writing to PROMETHEUS_MULTIPROC_DIR."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        script = (
+            'from prometheus_client import Counter; '
+            "Counter('technews_test_total', 'Test counter.').inc(3)"
+        )
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory.name)
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', script], env=env, check=True)
+
+        with mock.patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory.name):
+            body, content_type = render_metrics()
+        self.assertIn(b'technews_test_total 6.0', body)
+
+    def test_files_are_named_after_host_and_pid(self):
+        """Tests that processes of different containers sharing the directory write to different files."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        script = 'from news.metrics import CRAWLER_SAVED; CRAWLER_SAVED.inc(); import os; print(os.getpid())'
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory.name)
+        pid = subprocess.run([sys.executable, '-c', script], env=env, check=True, capture_output=True, text=True).stdout.strip()
+        self.assertEqual(os.listdir(directory.name), [f'counter_{socket.gethostname()}-{pid}.db'])
@@ -0,0 +1,85 @@
+from ..instrumentation import RequestMetrics, current_metrics, measure
+from ..models import News, Tag
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+import re
+
+
+def parse_server_timing(header):
+    """Returns the entries of a Server-Timing header as a dict of name to (duration, description)."""
+    entries = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        params = dict(param.split('=', 1) for param in params)
+        entries[name] = (float(params['dur']), params.get('desc', '').strip('"'))
+    return entries
+
+
+# Tests for middleware.py
+class ServerTimingMiddlewareTest(APITestCase):
+    """TestCase for the ServerTimingMiddleware. Verifies the Server-Timing header and the slow request log."""
+
+    def setUp(self):
+        cache.clear()
+        tag = Tag.objects.create(tag_label='فناوری')
+        for number in range(3):
+            News.objects.create(title=f'خبر {number}', text=f'متن {number}', resource=f'http://a.com/{number}').tags.add(tag)
+
+    def test_server_timing_header(self):
+        """Tests that the query count, SQL time, serialization and rendering of a request are reported."""
+        response = self.client.get(reverse('news-list'))
+        timings = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(timings), {'db', 'serialize', 'render', 'total'})
+        self.assertRegex(timings['db'][1], r'^\d+ queries$')
+        self.assertGreater(int(timings['db'][1].split()[0]), 0)
+        self.assertLessEqual(timings['serialize'][0], timings['total'][0])
+
+    def test_cached_response_is_not_serialized(self):
+        """Tests that a response served from the cache reports no serialization."""
+        self.client.get(reverse('news-list'))
+        timings = parse_server_timing(self.client.get(reverse('news-list'))['Server-Timing'])
+        self.assertNotIn('serialize', timings)
+
+    @override_settings(API_SLOW_REQUEST_MS=0)
+    def test_slow_request_is_logged(self):
+        """Tests that requests over the threshold are logged with their slowest SQL."""
+        with self.assertLogs('news.middleware', level='WARNING') as logs:
+            self.client.get(reverse('news-list'))
+        self.assertTrue(re.search(r'Slow request GET /news/ took .*slowest SQL \(.*ms\): SELECT', logs.output[0]))
+
+    @override_settings(API_SLOW_REQUEST_MS=None)
+    def test_disabled_slow_request_log(self):
+        """Tests that no request is logged when the threshold is unset."""
+        with self.assertNoLogs('news.middleware'):
+            self.client.get(reverse('news-list'))
+
+    def test_fast_request_is_not_logged(self):
+        """Tests that requests under the threshold are not logged."""
+        with self.assertNoLogs('news.middleware'):
+            self.client.get(reverse('tag-list'))
+
+
+# Tests for instrumentation.py
+class RequestMetricsTest(SimpleTestCase):
+    """TestCase for recording stages through the current RequestMetrics."""
+
+    def test_measure_without_request(self):
+        """Tests that measuring outside of an instrumented request does nothing."""
+        with measure('serialize'):
+            pass
+        self.assertIsNone(current_metrics())
+
+    def test_nested_stages_count_once(self):
+        """Tests that a stage measured inside the same stage is not added twice."""
+        metrics = RequestMetrics()
+        with metrics.activate():
+            with measure('serialize'):
+                with measure('serialize'):
+                    pass
+                with measure('render'):
+                    pass
+        self.assertEqual(set(metrics.stages), {'serialize', 'render'})
+        self.assertGreaterEqual(metrics.stages['serialize'], metrics.stages['render'])
+        self.assertIsNone(current_metrics())
@@ -1,5 +1,8 @@
-from ..models import Tag, News
+from ..models import Tag, TagDailyCount, News
+from ..utils.news_pipeline import NewsPipeline
 from ..utils.persian_calendar import PersianCalendar
+from ..utils.tag_cache import get_tag_cache
+from datetime import timedelta
 from django.test import TestCase
 from django.db import IntegrityError
 from django.utils import timezone
@@ -111,4 +114,78 @@ class NewsModelTest(TestCase):
             resource="http://example.com/custom-date",
             date=custom_date
         )
-        self.assertEqual(news_with_custom_date.date, custom_date)
\ No newline at end of file
+        self.assertEqual(news_with_custom_date.date, custom_date)
+
+    def test_news_content_hash(self):
+        """Tests that the content hash is computed on save and follows changes of the text."""
+        self.assertEqual(self.news.content_hash, News.compute_content_hash("This is a fake news for تست.٪×"))
+        self.news.text = "Edited text."
+        self.news.save()
+        self.assertEqual(News.objects.get(id=self.news.id).content_hash, News.compute_content_hash("Edited text."))
+
+
+class TagCountTest(TestCase):
+    """TestCase for the tag news counts maintained by the triggers of the news-tag table."""
+
+    def setUp(self):
+        self.now = PersianCalendar.currnet_persian_datetime()
+        self.tags = [Tag.objects.create(tag_label=label) for label in ('فناوری', 'موبایل')]
+        self.news = [
+            News.objects.create(title=f'خبر {number}', text=f'متن {number}', resource=f'http://a.com/{number}',
+                                date=self.now - timedelta(days=number))
+            for number in range(3)
+        ]
+
+    def counts(self):
+        """Returns the news count of the tags and their daily counts by day."""
+        return (
+            [tag.news_count for tag in Tag.objects.filter(id__in=[tag.id for tag in self.tags]).order_by('id')],
+            {(row.tag_id, row.day): row.count for row in TagDailyCount.objects.filter(count__gt=0)},
+        )
+
+    def test_linking_and_unlinking(self):
+        """Tests that adding, removing and clearing tags and deleting news update the counts."""
+        first, second = self.tags
+        for news in self.news:
+            news.tags.add(first)
+        self.news[0].tags.add(second)
+        today, yesterday = self.now.date(), self.now.date() - timedelta(days=1)
+        totals, daily = self.counts()
+        self.assertEqual(totals, [3, 1])
+        self.assertEqual(daily[first.id, today], 1)
+        self.assertEqual(daily[first.id, yesterday], 1)
+        self.assertEqual(daily[second.id, today], 1)
+
+        self.news[1].tags.remove(first)
+        self.news[0].delete()
+        self.news[2].tags.clear()
+        self.assertEqual(self.counts(), ([0, 0], {}))
+
+    def test_crawler_links(self):
+        """Tests that the news linked in bulk by the crawler pipeline are counted."""
+        get_tag_cache().clear()
+        pipeline = NewsPipeline()
+        for number in range(5):
+            pipeline.add(f'جدید {number}', f'متن جدید {number}', f'http://b.com/{number}', self.now, ['فناوری', 'هوش'])
+        pipeline.flush()
+        self.assertEqual(Tag.objects.get(tag_label='فناوری').news_count, 5)
+        self.assertEqual(Tag.objects.get(tag_label='هوش').news_count, 5)
+        self.assertEqual(TagDailyCount.objects.get(tag__tag_label='هوش', day=self.now.date()).count, 5)
+
+    def test_saving_tag_keeps_count(self):
+        """Tests that saving a loaded tag does not overwrite the count changed by the triggers."""
+        tag = Tag.objects.get(id=self.tags[0].id)
+        self.news[0].tags.add(tag)
+        tag.tag_label = 'فناوری اطلاعات'
+        tag.save()
+        tag.refresh_from_db()
+        self.assertEqual((tag.tag_label, tag.news_count), ('فناوری اطلاعات', 1))
+
+    def test_prune(self):
+        """Tests that pruning deletes the days before the kept window."""
+        old = News.objects.create(title='قدیمی', text='متن قدیمی', resource='http://a.com/old',
+                                  date=self.now - timedelta(days=TagDailyCount.KEPT_DAYS))
+        old.tags.add(self.tags[0])
+        self.news[0].tags.add(self.tags[0])
+        self.assertEqual(TagDailyCount.prune(), 1)
+        self.assertEqual(list(TagDailyCount.objects.values_list('day', flat=True)), [self.now.date()])
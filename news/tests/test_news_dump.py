@@ -0,0 +1,66 @@
+from ..models import News, Tag
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from io import StringIO
+import tempfile
+
+
+# Tests for utils/news_dump.py and the export_news / import_news commands
+class NewsDumpTest(TestCase):
+    """TestCase for dumping and loading the news archive through PostgreSQL COPY."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.tags = [Tag.objects.create(tag_label="فناوری"), Tag.objects.create(tag_label="موبایل, تبلت")]
+        self.date = timezone.now().replace(microsecond=0)
+        for number in range(3):
+            news = News.objects.create(
+                title=f"خبر {number}", text=f"متن خبر {number}\nبا \"نقل قول\"",
+                resource=f"http://dump.com/{number}", date=self.date
+            )
+            news.tags.set(self.tags[:number])
+
+    def run_command(self, name, *args):
+        out = StringIO()
+        call_command(name, self.directory.name, *args, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self):
+        return sorted(
+            (news.title, news.text, news.resource, news.date, news.content_hash,
+             sorted(tag.tag_label for tag in news.tags.all()))
+            for news in News.objects.prefetch_related('tags')
+        )
+
+    def assertRoundTrip(self, *args):
+        expected = self.snapshot()
+        self.assertIn('3 news, 2 tags and 3 news tags', self.run_command('export_news', *args))
+        News.objects.all().delete()
+        Tag.objects.all().delete()
+
+        self.assertIn('3 news, 2 tags and 3 news tags', self.run_command('import_news', *args))
+        self.assertEqual(self.snapshot(), expected)
+        self.assertTrue(News.objects.filter(search_vector__isnull=False).exists())
+
+    def test_csv_round_trip(self):
+        """Tests that news, tags and their relations survive a CSV dump and load."""
+        self.assertRoundTrip()
+
+    def test_binary_round_trip(self):
+        """Tests that news, tags and their relations survive a binary dump and load."""
+        self.assertRoundTrip('--format', 'binary')
+
+    def test_existing_rows_are_skipped(self):
+        """Tests that loading into a database which has the rows already inserts nothing."""
+        self.run_command('export_news')
+        News.objects.filter(resource="http://dump.com/0").update(resource="http://moved.com/0")
+        self.assertIn('0 news, 0 tags and 0 news tags', self.run_command('import_news'))
+        self.assertEqual(News.objects.count(), 3)
+
+    def test_missing_files(self):
+        """Tests that loading a directory without a dump fails with a command error."""
+        with self.assertRaises(CommandError):
+            self.run_command('import_news')
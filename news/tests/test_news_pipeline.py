@@ -0,0 +1,81 @@
+from ..models import News, Tag
+from ..utils.news_pipeline import NewsPipeline
+from ..utils.tag_cache import get_tag_cache
+from .query_budget import QueryBudgetMixin
+from django.core.cache import cache
+from django.test import TestCase
+
+
+# Tests for utils/news_pipeline.py
+class NewsPipelineTest(QueryBudgetMixin, TestCase):
+    """TestCase for the NewsPipeline. Verifies batching, duplicate handling, tags and the queries of a flush."""
+
+    def setUp(self):
+        cache.clear()
+        get_tag_cache().clear()
+        self.pipeline = NewsPipeline(batch_size=100)
+
+    def add_news(self, number, tag_labels=('فناوری',)):
+        self.pipeline.add(f'خبر {number}', f'متن خبر {number}', f'http://news.com/{number}', None, tag_labels)
+
+    def test_news_are_saved_on_flush(self):
+        """Tests that buffered news are saved with their tags and content hash when the pipeline is flushed."""
+        self.add_news(1, ['فناوری', 'موبایل'])
+        self.assertEqual(News.objects.count(), 0)
+        self.assertEqual(self.pipeline.flush(), 1)
+
+        news = News.objects.get(resource='http://news.com/1')
+        self.assertEqual(sorted(tag.tag_label for tag in news.tags.all()), ['فناوری', 'موبایل'])
+        self.assertEqual(news.content_hash, News.compute_content_hash('متن خبر 1'))
+        self.assertIsNotNone(news.date)
+
+    def test_full_batch_is_flushed(self):
+        """Tests that the pipeline flushes by itself once batch_size news are buffered."""
+        self.pipeline.batch_size = 2
+        self.add_news(1)
+        self.add_news(2)
+        self.assertEqual(News.objects.count(), 2)
+        self.assertEqual(len(self.pipeline), 0)
+
+    def test_duplicates_are_skipped(self):
+        """Tests that news matching stored news or earlier news of the batch by title, url or text are skipped."""
+        News.objects.create(title='stored', text='متن خبر 1', resource='http://stored.com/')
+        self.add_news(1)
+        self.add_news(2)
+        self.pipeline.add('خبر 2', 'another text', 'http://other.com/', None, [])
+        self.assertEqual(self.pipeline.flush(), 1)
+        self.assertEqual(self.pipeline.saved, 1)
+        self.assertEqual(News.objects.count(), 2)
+
+    def test_existing_tags_are_reused(self):
+        """Tests that tags are linked by label without creating duplicates."""
+        Tag.objects.create(tag_label='فناوری')
+        self.add_news(1, ['فناوری', 'فناوری'])
+        self.add_news(2)
+        self.pipeline.flush()
+        self.assertEqual(Tag.objects.count(), 1)
+        self.assertEqual(News.tags.through.objects.count(), 2)
+
+    def test_tag_deleted_by_another_process(self):
+        """Tests that a cached id of a tag deleted through another process is resolved again instead of failing the batch."""
+        deleted_id = Tag.objects.create(tag_label='فناوری').id
+        Tag.objects.filter(id=deleted_id).delete()
+        # Another process deleted the tag, so this process's cache was not evicted.
+        self.pipeline.tag_cache._store([('فناوری', deleted_id)])
+        self.add_news(1)
+        self.assertEqual(self.pipeline.flush(), 1)
+        news = News.objects.get(resource='http://news.com/1')
+        self.assertEqual([tag.tag_label for tag in news.tags.all()], ['فناوری'])
+
+    def test_flush_query_count_does_not_grow_with_batch(self):
+        """Tests that a flush runs the same number of queries for 3 and for 60 news."""
+        for number in range(3):
+            self.add_news(number, [f'tag {number}'])
+        with self.assertNumQueries(10):
+            self.pipeline.flush()
+
+        for number in range(100, 160):
+            self.add_news(number, [f'tag {number}', 'shared'])
+        with self.assertQueryBudget(10):
+            self.pipeline.flush()
+        self.assertEqual(News.objects.count(), 63)
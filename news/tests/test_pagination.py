@@ -0,0 +1,77 @@
+from ..models import News
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from datetime import timedelta
+
+
+# Tests for pagination.py
+class KeysetPaginationTest(APITestCase):
+    """
+    TestCase for the keyset (cursor) mode of the news list pagination. Verifies page
+    boundaries, navigation in both directions and stability under concurrent inserts.
+    """
+
+    def setUp(self):
+        """Sets up 120 news items, two of them sharing the same date to exercise the id tiebreak."""
+        self.client = APIClient()
+        self.now = timezone.now()
+        for i in range(120):
+            News.objects.create(
+                title=f"keyset news {i}",
+                text=f"keyset text {i}",
+                resource=f"http://keyset.com/{i}",
+                date=self.now - timedelta(minutes=i // 2)
+            )
+
+    def _collect(self, url):
+        """Follows next links from url and returns every title with the number of visited pages."""
+        titles, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            titles.extend(item['title'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return titles, pages
+
+    def test_cursor_mode_is_opt_in(self):
+        """Tests that the regular page number response is kept without the cursor parameter."""
+        response = self.client.get(reverse('news-list'))
+        self.assertEqual(response.data['count'], 120)
+        self.assertNotIn('count', self.client.get(reverse('news-list'), {'cursor': ''}).data)
+
+    def test_cursor_walks_every_item_once(self):
+        """Tests that following next cursors visits every news item exactly once in (date, id) order."""
+        titles, pages = self._collect(reverse('news-list') + '?cursor=')
+        expected = list(News.objects.order_by('-date', 'id').values_list('title', flat=True))
+        self.assertEqual(titles, expected)
+        self.assertEqual(pages, 3)
+
+    def test_previous_cursor(self):
+        """Tests that the previous link of the second page returns the first page."""
+        first = self.client.get(reverse('news-list'), {'cursor': ''})
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(previous.data['results'], first.data['results'])
+
+    def test_cursor_stable_under_inserts(self):
+        """Tests that news inserted after the first page was served do not shift the next page."""
+        first = self.client.get(reverse('news-list'), {'cursor': ''})
+        News.objects.create(
+            title="fresh news",
+            text="fresh text",
+            resource="http://keyset.com/fresh",
+            date=self.now + timedelta(minutes=1)
+        )
+        second = self.client.get(first.data['next'])
+        first_titles = [item['title'] for item in first.data['results']]
+        second_titles = [item['title'] for item in second.data['results']]
+        self.assertFalse(set(first_titles) & set(second_titles))
+        self.assertNotIn("fresh news", second_titles)
+
+    def test_invalid_cursor(self):
+        """Tests that a malformed cursor is rejected."""
+        response = self.client.get(reverse('news-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
@@ -1,6 +1,8 @@
 from ..models import Tag, News
 from ..serializers import TagSerializer, NewsSerializer
 from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 from django.utils import timezone
 import pytz
 from datetime import datetime
@@ -143,3 +145,15 @@ class NewsSerializerTest(TestCase):
         serializer = NewsSerializer(data=invalid_data)
         self.assertFalse(serializer.is_valid())
         self.assertIn('date', serializer.errors) 
+
+    def test_sparse_fieldset_serialization(self):
+        """Tests that the fields query parameter limits the serialized fields."""
+        request = Request(APIRequestFactory().get('/news/', {'fields': 'id,title,unknown'}))
+        serializer = NewsSerializer(self.news, context={'request': request})
+        self.assertEqual(serializer.data, {"id": self.news.id, "title": "N3(w)ی"})
+
+    def test_omit_fieldset_serialization(self):
+        """Tests that the omit query parameter drops the given fields from the serialized news."""
+        request = Request(APIRequestFactory().get('/news/', {'omit': 'text,tags'}))
+        serializer = NewsSerializer([self.news], many=True, context={'request': request})
+        self.assertEqual(set(serializer.data[0]), {"id", "title", "resource", "date"})
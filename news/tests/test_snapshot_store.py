@@ -0,0 +1,86 @@
+from ..models import News
+from ..utils.snapshot_store import SnapshotStore
+from ..utils.tag_cache import get_tag_cache
+from ..utils.zoomit_http_crawler import ZoomitHttpCrawler
+from ..benchmarks.fixture_site import FixtureSite
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from io import StringIO
+from unittest import mock
+import tempfile
+
+
+# Tests for utils/snapshot_store.py
+class SnapshotStoreTest(SimpleTestCase):
+    """TestCase for the SnapshotStore. Verifies appending, reading, rotation and per-process segments."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = SnapshotStore(self.directory.name, segment_size=1024)
+        self.addCleanup(self.store.close)
+
+    def test_pages_are_read_back(self):
+        """Tests that stored pages are read back in order with their urls."""
+        self.store.append('http://a.com/', '<html>صفحه اول</html>')
+        self.store.append('http://b.com/', '<html>second</html>')
+        self.assertEqual(
+            [(snapshot.url, snapshot.page) for snapshot in self.store],
+            [('http://a.com/', '<html>صفحه اول</html>'), ('http://b.com/', '<html>second</html>')]
+        )
+
+    def test_latest_returns_newest_page_per_url(self):
+        """Tests that only the newest page of a url is returned by latest."""
+        self.store.append('http://a.com/', 'old')
+        self.store.append('http://b.com/', 'other')
+        self.store.append('http://a.com/', 'new')
+        self.assertEqual(sorted((snapshot.url, snapshot.page) for snapshot in self.store.latest()),
+                         [('http://a.com/', 'new'), ('http://b.com/', 'other')])
+
+    def test_segments_are_rotated(self):
+        """Tests that a new segment is started once the current one reaches segment_size."""
+        for number in range(20):
+            self.store.append(f'http://a.com/{number}', ''.join(str(i * number) for i in range(300)))
+        self.assertGreater(len(self.store.segments()), 1)
+        self.assertEqual(len(list(self.store)), 20)
+
+    def test_processes_write_own_segments(self):
+        """Tests that a forked process does not append to the segment of its parent."""
+        self.store.append('http://a.com/', 'parent')
+        with mock.patch('os.getpid', return_value=-1):
+            self.store.append('http://b.com/', 'child')
+        self.assertEqual(len(self.store.segments()), 2)
+
+    def test_incomplete_index_line_is_ignored(self):
+        """Tests that a page whose index line was cut off by a crash is skipped."""
+        self.store.append('http://a.com/', 'complete')
+        self.store._index.write('12\t5\t0.0\thttp://b.com/')
+        self.store._index.flush()
+        self.assertEqual([snapshot.url for snapshot in self.store], ['http://a.com/'])
+
+
+class ReparseTest(TestCase):
+    """TestCase for storing crawled pages and the reparse command."""
+
+    def setUp(self):
+        cache.clear()
+        get_tag_cache().clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.site = FixtureSite(pages=1, news_per_page=3).start()
+        self.addCleanup(self.site.stop)
+
+    def test_crawled_pages_are_reparsed(self):
+        """Tests that pages stored by the crawler are parsed again by the reparse command."""
+        crawler = ZoomitHttpCrawler(selenium_fallback=False)
+        crawler.snapshots = SnapshotStore(self.directory.name)
+        crawler.crawl_links([self.site.news_url(number) for number in range(3)])
+        crawler.quit()
+        crawler.snapshots.close()
+        News.objects.filter(resource=self.site.news_url(1)).delete()
+
+        out = StringIO()
+        call_command('reparse', directory=self.directory.name, stdout=out)
+        self.assertIn('reparsed 3 pages: 3 contained news, 1 new news saved', out.getvalue())
+        self.assertTrue(News.objects.filter(resource=self.site.news_url(1), title='خبر آزمایشی 1').exists())
@@ -0,0 +1,61 @@
+from ..models import News, Tag
+from ..utils.tag_cache import TagCache, get_tag_cache
+from django.test import TestCase
+
+
+# Tests for utils/tag_cache.py
+class TagCacheTest(TestCase):
+    """TestCase for the TagCache. Verifies lookups, tag creation, LRU eviction and warm-up."""
+
+    def setUp(self):
+        self.tag_cache = TagCache(max_size=2)
+        self.tag = Tag.objects.create(tag_label='فناوری')
+
+    def test_cached_labels_need_no_query(self):
+        """Tests that a label is looked up once and then answered from the cache."""
+        self.assertEqual(self.tag_cache.resolve(['فناوری']), {'فناوری': self.tag.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.tag_cache.resolve(['فناوری']), {'فناوری': self.tag.id})
+        self.assertEqual((self.tag_cache.hits, self.tag_cache.misses), (1, 1))
+
+    def test_missing_tags_are_created(self):
+        """Tests that unknown labels are saved as tags once."""
+        tag_ids = self.tag_cache.resolve(['موبایل', 'موبایل', 'فناوری'])
+        self.assertEqual(Tag.objects.get(tag_label='موبایل').id, tag_ids['موبایل'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_created_tags_are_cached_after_commit(self):
+        """Tests that the ids of new tags are only cached once their transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag_cache.resolve(['موبایل'])
+            self.assertEqual(len(self.tag_cache), 0)
+        self.assertEqual(len(self.tag_cache), 1)
+
+    def test_least_recently_used_label_is_evicted(self):
+        """Tests that the cache keeps at most max_size labels and evicts the least recently used one."""
+        Tag.objects.bulk_create([Tag(tag_label='a'), Tag(tag_label='b')])
+        self.tag_cache.resolve(['فناوری', 'a'])
+        self.tag_cache.resolve(['فناوری'])
+        self.tag_cache.resolve(['b'])
+        with self.assertNumQueries(0):
+            self.tag_cache.resolve(['فناوری', 'b'])
+        self.assertEqual(len(self.tag_cache), 2)
+
+    def test_warm_up_loads_most_used_tags(self):
+        """Tests that warming up loads the tags used by the most news."""
+        popular = Tag.objects.create(tag_label='popular')
+        Tag.objects.create(tag_label='unused')
+        for number in range(2):
+            news = News.objects.create(title=f'news {number}', text=f'text {number}', resource=f'http://n.com/{number}')
+            news.tags.add(popular, self.tag if number else popular)
+        self.tag_cache.warm_up()
+        with self.assertNumQueries(0):
+            self.tag_cache.resolve(['popular', 'فناوری'])
+
+    def test_deleted_tag_is_evicted(self):
+        """Tests that deleting a tag removes it from the process's cache."""
+        tag_cache = get_tag_cache()
+        tag_cache.resolve(['فناوری'])
+        self.tag.delete()
+        self.assertNotIn('فناوری', tag_cache._ids)
+        tag_cache.clear()
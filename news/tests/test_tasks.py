@@ -0,0 +1,116 @@
+from ..models import News
+from ..tasks import (collect_zoomit_links, crawl_zoomit_links, crawl_zoomit_range_in_parallel,
+                     crawl_zoomit_unseen_news, split_page_range, summarize_zoomit_crawl, warm_tag_cache)
+from ..utils.crawl_progress import CrawlProgress
+from ..utils.crawlers import get_crawler
+from ..utils.tag_cache import get_tag_cache
+from ..benchmarks.fixture_site import FixtureSite
+from TechNews.celery import celery
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from celery.backends.cache import CacheBackend
+from io import StringIO
+from unittest import mock
+
+
+# Tests for tasks.py
+class SplitPageRangeTest(SimpleTestCase):
+    """TestCase for splitting archive page ranges into chunks."""
+
+    def test_split_evenly(self):
+        """Tests that pages are distributed over the chunks without gaps or overlaps."""
+        self.assertEqual(split_page_range(1, 10, 3), [(1, 4), (5, 7), (8, 10)])
+
+    def test_more_chunks_than_pages(self):
+        """Tests that no empty chunks are produced."""
+        self.assertEqual(split_page_range(5, 6, 4), [(5, 5), (6, 6)])
+
+
+class CrawlUnseenNewsTaskTest(SimpleTestCase):
+    """TestCase for the periodic unseen-news task."""
+
+    def test_crawler_is_released_on_error(self):
+        """Tests that the crawler returns its browser to the pool when crawling fails."""
+        crawler = mock.Mock(**{'crawl_unseen_news.side_effect': RuntimeError('page failed')})
+        with mock.patch('news.tasks.get_crawler', return_value=crawler), mock.patch('news.tasks.get_webdriver_pool'):
+            with self.assertRaises(RuntimeError):
+                crawl_zoomit_unseen_news()
+        crawler.quit.assert_called_once_with()
+
+
+class WorkerProcessInitTest(SimpleTestCase):
+    """TestCase for the worker process start-up hook."""
+
+    def test_tag_cache_is_warmed(self):
+        """Tests that a starting worker process warms its tag cache."""
+        with mock.patch('news.tasks.get_tag_cache') as get_tag_cache:
+            warm_tag_cache()
+        get_tag_cache.assert_called_once_with()
+
+
+@override_settings(CRAWLER_ENGINE='http', CRAWLER_FANOUT_BATCH_SIZE=3)
+class DistributedCrawlTest(TestCase):
+    """
+    TestCase for the distributed crawl tasks. Runs the tasks against the local fixture
+    site with the HTTP engine and verifies the saved news and progress counters.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_tag_cache().clear()
+        self.site = FixtureSite(pages=4, news_per_page=3).start()
+
+    def tearDown(self):
+        self.site.stop()
+
+    def test_chunk_tasks(self):
+        """Tests that collecting and crawling tasks save the news and update the progress."""
+        progress = CrawlProgress('test-run')
+        progress.start(2)
+        links = collect_zoomit_links(1, 2, progress.run_id, archive=self.site.archive_url)
+        saved = crawl_zoomit_links(links, progress.run_id)
+        summary = summarize_zoomit_crawl([saved], progress.run_id)
+
+        self.assertEqual(len(links), 6)
+        self.assertEqual(News.objects.count(), 6)
+        self.assertEqual(summary, {
+            'pages_total': 2, 'pages_done': 2, 'links_total': 6, 'links_done': 6, 'news_saved': 6
+        })
+
+    def test_parallel_workflow(self):
+        """Tests the whole chord workflow with tasks executed eagerly."""
+        # Eager chords still store results, so an in-memory backend replaces the configured Redis.
+        backend = CacheBackend(app=celery, backend='memory')
+        celery.conf.update(task_always_eager=True)
+        try:
+            with mock.patch.object(celery, '_backend_cache', backend), \
+                    mock.patch('news.tasks.get_crawler', wraps=get_crawler) as crawler_factory:
+                progress, result = crawl_zoomit_range_in_parallel(1, 4, 3, archive=self.site.archive_url, engine='http')
+                summary = result.get()
+        finally:
+            celery.conf.update(task_always_eager=False)
+
+        self.assertEqual(News.objects.count(), 12)
+        self.assertEqual(summary['news_saved'], 12)
+        self.assertEqual(progress.snapshot()['pages_done'], 4)
+        # Every collecting and crawling task gets the engine of the run instead of the setting.
+        self.assertEqual({call.args[0] for call in crawler_factory.call_args_list}, {'http'})
+
+
+class CrawlCommandTest(SimpleTestCase):
+    """TestCase for the options of the crawl command which start a distributed crawl."""
+
+    def test_engine_is_passed_to_the_distributed_crawl(self):
+        """Tests that --engine reaches the distributed crawl instead of being ignored."""
+        result = mock.Mock(**{'ready.return_value': True, 'get.return_value': {'news_saved': 0, 'links_total': 0}})
+        with mock.patch('news.management.commands.crawl.crawl_zoomit_range_in_parallel',
+                        return_value=(CrawlProgress('test-run'), result)) as crawl:
+            call_command('crawl', 1, 4, parallel=2, engine='http', stdout=StringIO())
+        crawl.assert_called_once_with(1, 4, 2, engine='http')
+
+    def test_restart_is_refused(self):
+        """Tests that --restart is refused with --parallel, since distributed crawls keep no checkpoint."""
+        with self.assertRaisesMessage(CommandError, '--restart cannot be combined with --parallel'):
+            call_command('crawl', 1, 4, parallel=2, restart=True)
@@ -1,8 +1,15 @@
 from ..models import Tag, News
 from ..serializers import TagSerializer, NewsSerializer
+from ..utils.persian_calendar import PersianCalendar
+from datetime import timedelta
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework.test import APITestCase, APIClient
+from unittest import mock
+from .query_budget import QueryBudgetMixin
 
 # Tests for views.py
 class TagViewSetTest(APITestCase):
@@ -13,6 +20,7 @@ class TagViewSetTest(APITestCase):
 
     def setUp(self):
         """Sets up initial test data, including a Tag instance and APIClient."""
+        cache.clear()
         self.client = APIClient()
         self.tag = Tag.objects.create(tag_label="T1(g)ی")
 
@@ -41,6 +49,58 @@ class TagViewSetTest(APITestCase):
         self.assertNotIn("T1(g)ی", [tags['tag_label'] for tags in response.data['results']])
 
 
+class PopularTagsTest(APITestCase):
+    """TestCase for the popular action of the TagViewSet."""
+
+    def setUp(self):
+        cache.clear()
+        now = PersianCalendar.currnet_persian_datetime()
+        self.tags = [Tag.objects.create(tag_label=label) for label in ('قدیمی', 'پرخبر', 'داغ', 'بی‌خبر')]
+        # Four old news of the first tag, three news of the second and two recent news of the third.
+        for number, (tag, days_ago) in enumerate([(0, 60)] * 4 + [(1, 40), (1, 3), (1, 3), (2, 0), (2, 1)]):
+            News.objects.create(
+                title=f'خبر {number}', text=f'متن {number}', resource=f'http://a.com/{number}',
+                date=now - timedelta(days=days_ago)
+            ).tags.add(self.tags[tag])
+        self.today = now.date()
+
+    def test_sorted_by_total(self):
+        """Tests that the tags are sorted by their number of news."""
+        results = self.client.get(reverse('tag-popular')).data['results']
+        self.assertEqual([tag['tag_label'] for tag in results], ['قدیمی', 'پرخبر', 'داغ', 'بی‌خبر'])
+        self.assertEqual([tag['news_count'] for tag in results], [4, 3, 2, 0])
+        self.assertEqual([tag['recent_count'] for tag in results], [0, 2, 2, 0])
+        self.assertEqual(results[2]['daily_counts'], [
+            {'day': str(self.today), 'count': 1}, {'day': str(self.today - timedelta(days=1)), 'count': 1},
+        ])
+
+    def test_sorted_by_recent_days(self):
+        """Tests that ``sort=recent`` sorts by the news of the last ``days`` days."""
+        results = self.client.get(reverse('tag-popular'), {'sort': 'recent', 'days': 2}).data['results']
+        self.assertEqual([tag['tag_label'] for tag in results], ['داغ', 'قدیمی', 'پرخبر', 'بی‌خبر'])
+        self.assertEqual([tag['recent_count'] for tag in results], [2, 0, 0, 0])
+        self.assertEqual(results[2]['daily_counts'], [])
+
+    def test_window_moves_at_midnight(self):
+        """Tests that cached responses and validators of the previous day are not reused once the window moved."""
+        params = {'sort': 'recent', 'days': 2}
+        response = self.client.get(reverse('tag-popular'), params)
+        self.assertEqual(response.data['results'][0]['recent_count'], 2)
+
+        tomorrow = PersianCalendar.currnet_persian_datetime() + timedelta(days=1)
+        with mock.patch.object(PersianCalendar, 'currnet_persian_datetime', return_value=tomorrow):
+            moved = self.client.get(reverse('tag-popular'), params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(moved.status_code, 200)
+        self.assertNotEqual(moved['ETag'], response['ETag'])
+        self.assertEqual(moved.data['results'][0]['recent_count'], 1)
+
+    def test_invalid_parameters(self):
+        """Tests that unknown sorts and day counts outside of the kept window are rejected."""
+        for params in ({'sort': 'name'}, {'days': 0}, {'days': 31}, {'days': 'week'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse('tag-popular'), params).status_code, 400)
+
+
 class NewsViewSetTest(APITestCase):
     """
     TestCase for the NewsViewSet. Contains unit tests to verify the functionality
@@ -49,6 +109,7 @@ class NewsViewSetTest(APITestCase):
 
     def setUp(self):
         """Sets up initial test data, including Tag and News instances, and APIClient."""
+        cache.clear()
         self.client = APIClient()
         self.tag = Tag.objects.create(tag_label="N3(w)ی")
         self.filter_tag = Tag.objects.create(tag_label="filter-tag")
@@ -113,4 +174,73 @@ class NewsViewSetTest(APITestCase):
         response = self.client.get(reverse('news-detail', args=[self.news.id]))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['title'], "N3(w)ی")
-        self.assertIn('date', response.data)
\ No newline at end of file
+        self.assertIn('date', response.data)
+
+    def test_list_news_without_text(self):
+        """Tests that omitting the text leaves it out of the response and out of the database query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('news-list'), {'omit': 'text'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('text', response.data['results'][0])
+        self.assertIn('title', response.data['results'][0])
+        self.assertFalse(any('"news_news"."text"' in query['sql'] for query in queries.captured_queries))
+
+    def test_list_news_with_fields(self):
+        """Tests that the fields parameter limits the news list to the requested fields."""
+        response = self.client.get(reverse('news-list'), {'fields': 'id,title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+
+class QueryBudgetTest(QueryBudgetMixin, APITestCase):
+    """
+    TestCase guarding the number of queries of the news and tag endpoints. Every endpoint
+    must stay within a fixed budget regardless of the number of items and tags on a page.
+    """
+
+    def setUp(self):
+        """Sets up a full page of news items with three tags each."""
+        cache.clear()
+        self.client = APIClient()
+        tags = [Tag.objects.create(tag_label=f"budget tag {i}") for i in range(3)]
+        for i in range(50):
+            news = News.objects.create(
+                title=f"budget news {i}",
+                text=f"budget text {i}",
+                resource=f"http://budget.com/{i}"
+            )
+            news.tags.set(tags)
+        self.news = news
+
+    def test_news_list_query_budget(self):
+        """Tests that a page of news costs validators, count, page and one tag query."""
+        with self.assertQueryBudget(4):
+            response = self.client.get(reverse('news-list'))
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertEqual(len(response.data['results'][0]['tags']), 3)
+
+    def test_news_cursor_query_budget(self):
+        """Tests that a keyset page of news does not count the news table."""
+        with self.assertQueryBudget(3):
+            self.client.get(reverse('news-list'), {'cursor': ''})
+
+    def test_news_search_query_budget(self):
+        """Tests that searching and filtering news stays within the list budget."""
+        tag = self.news.tags.first()
+        with self.assertQueryBudget(5):
+            self.client.get(reverse('news-list'), {'search': 'budget', 'tags': tag.id})
+
+    def test_news_detail_query_budget(self):
+        """Tests that a single news item costs validators, the item and its tags."""
+        with self.assertQueryBudget(3):
+            self.client.get(reverse('news-detail', args=[self.news.id]))
+
+    def test_popular_tags_query_budget(self):
+        """Tests that a page of popular tags costs validators, count, page and one daily count query."""
+        with self.assertQueryBudget(4):
+            self.client.get(reverse('tag-popular'), {'sort': 'recent'})
+
+    def test_tag_list_query_budget(self):
+        """Tests that a page of tags costs validators, count and page."""
+        with self.assertQueryBudget(3):
+            self.client.get(reverse('tag-list'))
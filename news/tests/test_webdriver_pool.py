@@ -0,0 +1,65 @@
+from ..utils.webdriver_pool import WebDriverPool
+from django.test import SimpleTestCase
+from selenium.common.exceptions import WebDriverException
+from unittest import mock
+
+
+class FakeDriverPool(WebDriverPool):
+    """WebDriverPool creating mock drivers instead of starting Chrome."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created = []
+
+    def _create_driver(self):
+        driver = mock.Mock()
+        self.created.append(driver)
+        with self._lock:
+            self._pages[driver] = 0
+        return driver
+
+
+# Tests for utils/webdriver_pool.py
+class WebDriverPoolTest(SimpleTestCase):
+    """TestCase for the WebDriverPool. Verifies reuse, health checks, recycling and shutdown of drivers."""
+
+    def setUp(self):
+        self.pool = FakeDriverPool(size=1, max_pages=10)
+
+    def test_released_driver_is_reused(self):
+        """Tests that a released driver is handed out again instead of starting a new one."""
+        driver = self.pool.acquire()
+        self.pool.release(driver, pages=3)
+        self.assertIs(self.pool.acquire(), driver)
+        self.assertEqual(len(self.pool.created), 1)
+
+    def test_worn_out_driver_is_recycled(self):
+        """Tests that a driver reaching max_pages is quit and replaced."""
+        driver = self.pool.acquire()
+        self.pool.release(driver, pages=6)
+        self.pool.release(self.pool.acquire(), pages=4)
+        driver.quit.assert_called_once()
+        self.assertIsNot(self.pool.acquire(), driver)
+
+    def test_unhealthy_driver_is_replaced(self):
+        """Tests that a driver which does not answer anymore is discarded on acquire."""
+        driver = self.pool.acquire()
+        self.pool.release(driver)
+        type(driver).current_url = mock.PropertyMock(side_effect=WebDriverException('browser crashed'))
+        self.assertIsNot(self.pool.acquire(), driver)
+        driver.quit.assert_called_once()
+
+    def test_pool_size_is_bounded(self):
+        """Tests that drivers released into a full pool are quit."""
+        first, second = self.pool.acquire(), self.pool.acquire()
+        self.pool.release(first)
+        self.pool.release(second)
+        second.quit.assert_called_once()
+        first.quit.assert_not_called()
+
+    def test_shutdown(self):
+        """Tests that shutting the pool down quits its idle drivers."""
+        driver = self.pool.acquire()
+        self.pool.release(driver)
+        self.pool.shutdown()
+        driver.quit.assert_called_once()
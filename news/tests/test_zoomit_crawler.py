@@ -0,0 +1,79 @@
+from ..models import News
+from ..utils.tag_cache import get_tag_cache
+from ..utils.zoomit_crawler import ZoomitCrawler
+from ..benchmarks.fixture_site import FixtureSite
+from .test_webdriver_pool import FakeDriverPool
+from django.core.cache import cache
+from django.test import TestCase
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from unittest import mock
+from urllib.parse import urlparse
+
+
+# Tests for utils/zoomit_crawler.py
+class ZoomitCrawlerTest(TestCase):
+    """
+    TestCase for the Selenium ZoomitCrawler. The browser is replaced by a mock driver rendering
+    the pages of the fixture site, which verifies that extraction only needs the page source.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_tag_cache().clear()
+        self.site = FixtureSite(pages=2, news_per_page=3, script_only=[4])
+        self.crawler = ZoomitCrawler(pool=FakeDriverPool(size=1, max_pages=100))
+        self.crawler.driver.get.side_effect = self.render
+
+    def render(self, url):
+        """Imitates driver.get by exposing the fixture html of the url as the page source."""
+        self.crawler.driver.current_url = url
+        url = urlparse(url)
+        self.crawler.driver.page_source = self.site.render(f'{url.path}?{url.query}')[1]
+
+    def tearDown(self):
+        self.crawler.quit()
+
+    def test_crawl_over_a_range(self):
+        """Tests that news are extracted from the page source, querying the driver only for the rendered content."""
+        self.crawler.crawl_over_a_range(1, 2, archive='https://www.zoomit.ir/archive/')
+        self.assertEqual(News.objects.count(), 5)  # news 4 has no server-rendered content
+        news = News.objects.get(resource='https://www.zoomit.ir/news/2/')
+        self.assertEqual(news.title, 'خبر آزمایشی 2')
+        self.assertEqual(news.text, 'متن خبر شماره 2 درباره فناوری\nبخش دوم\nپایان خبر 2')
+        self.assertEqual(sorted(tag.tag_label for tag in news.tags.all()), ['برچسب 0', 'فناوری'])
+        self.assertEqual(
+            {call.args for call in self.crawler.driver.find_element.call_args_list},
+            {(By.XPATH, ZoomitCrawler.LINKS_XPATH), (By.XPATH, ZoomitCrawler.TITLE_XPATH)}
+        )
+        self.crawler.driver.find_elements.assert_not_called()
+        self.assertEqual(self.crawler.pages_loaded, 8)
+
+    def test_page_source_is_read_once_rendered(self):
+        """Tests that the html of a news page is read only after its title was rendered by JavaScript."""
+        driver = self.crawler.driver
+        driver.get.side_effect = lambda url: setattr(driver, 'page_source', '<html><body></body></html>')
+
+        def find_element(by, xpath):
+            if driver.find_element.call_count < 2:
+                raise NoSuchElementException()
+            self.render('https://www.zoomit.ir/news/2/')
+            return mock.Mock()
+
+        driver.find_element.side_effect = find_element
+        self.assertTrue(self.crawler.crawl_news('https://www.zoomit.ir/news/2/'))
+        self.assertTrue(News.objects.filter(title='خبر آزمایشی 2').exists())
+
+    def test_driver_is_released_when_final_flush_fails(self):
+        """Tests that quit returns the driver to its pool even if saving the remaining news fails."""
+        pool = FakeDriverPool(size=1, max_pages=100)
+        crawler = ZoomitCrawler(pool=pool)
+        crawler.pipeline.flush = mock.Mock(side_effect=RuntimeError('database went away'))
+        with self.assertRaises(RuntimeError):
+            crawler.quit()
+        self.assertIs(pool.acquire(), crawler.driver)
+
+    def test_crawl_news_without_content(self):
+        """Tests that a page without news content is not saved."""
+        self.assertFalse(self.crawler.crawl_news('https://www.zoomit.ir/news/4/'))
+        self.assertEqual(News.objects.count(), 0)
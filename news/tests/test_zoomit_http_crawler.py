@@ -0,0 +1,140 @@
+from ..models import CrawlState, News, Tag
+from ..utils.zoomit_http_crawler import ZoomitHttpCrawler
+from ..utils.zoomit_parser import ZoomitParser
+from ..utils.tag_cache import get_tag_cache
+from ..benchmarks.fixture_site import FixtureSite
+from .query_budget import QueryBudgetMixin
+from django.core.cache import cache
+from django.test import TestCase
+from unittest import mock
+
+
+# Tests for utils/zoomit_http_crawler.py
+class ZoomitHttpCrawlerTest(QueryBudgetMixin, TestCase):
+    """
+    TestCase for the ZoomitHttpCrawler. Crawls a local fixture site imitating the Zoomit
+    archive and verifies the saved news, tags and the Selenium fallback.
+    """
+
+    def setUp(self):
+        """Starts the fixture site and an HTTP crawler without Selenium fallback."""
+        cache.clear()
+        get_tag_cache().clear()
+        self.site = FixtureSite(pages=3, news_per_page=4, script_only=[5]).start()
+        self.crawler = ZoomitHttpCrawler(concurrency=4, selenium_fallback=False)
+
+    def tearDown(self):
+        self.crawler.quit()
+        self.site.stop()
+
+    def test_crawl_over_a_range(self):
+        """Tests that every news of the range is saved with its tags."""
+        self.crawler.crawl_over_a_range(1, 2, archive=self.site.archive_url)
+        self.assertEqual(News.objects.count(), 7)  # news 5 needs JavaScript
+        news = News.objects.get(resource=self.site.news_url(3))
+        self.assertEqual(news.title, 'خبر آزمایشی 3')
+        self.assertEqual(sorted(tag.tag_label for tag in news.tags.all()), ['برچسب 1', 'فناوری'])
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_crawl_unseen_news(self):
+        """Tests that crawling stops at the first news which is already stored."""
+        News.objects.create(title='seen', text='seen', resource=self.site.news_url(6))
+        self.crawler.crawl_unseen_news(stop=3, archive=self.site.archive_url)
+        self.assertEqual(
+            sorted(News.objects.values_list('resource', flat=True)),
+            sorted([self.site.news_url(number) for number in (0, 1, 2, 3, 4, 6)])
+        )
+        self.assertNotIn('/archive/?pageNumber=3', self.site.requests)
+
+    def test_crawl_news(self):
+        """Tests that a single news article is crawled and saved."""
+        self.crawler.crawl_news(self.site.news_url(9))
+        self.assertTrue(News.objects.filter(title='خبر آزمایشی 9').exists())
+
+    def test_duplicate_text_is_skipped(self):
+        """Tests that a news whose text is already stored under another title and url is not saved."""
+        text = 'متن خبر شماره 9 درباره فناوری\nبخش دوم\nپایان خبر 9'
+        News.objects.create(title='republished', text=text, resource='http://other.com/9')
+        self.assertFalse(self.crawler.crawl_news(self.site.news_url(9)))
+        self.assertEqual(News.objects.count(), 1)
+
+    def test_unreachable_pages_are_skipped(self):
+        """Tests that pages which fail to download are skipped."""
+        self.crawler.crawl_news(self.site.base_url + '/missing/')
+        self.assertEqual(News.objects.count(), 0)
+
+    def test_resources_are_closed_when_final_flush_fails(self):
+        """Tests that quit closes the HTTP client, the event loop and the Selenium fallback even if saving fails."""
+        crawler = ZoomitHttpCrawler(concurrency=2)
+        crawler._fallback_crawler = fallback = mock.Mock()
+        crawler.pipeline.flush = mock.Mock(side_effect=RuntimeError('database went away'))
+        with self.assertRaises(RuntimeError):
+            crawler.quit()
+        self.assertTrue(crawler._client.is_closed)
+        with self.assertRaises(RuntimeError):
+            crawler._runner.get_loop()  # closed runners can not be used again
+        fallback.quit.assert_called_once_with()
+
+    def test_selenium_fallback(self):
+        """Tests that pages without server-rendered news are handed to the Selenium crawler."""
+        self.crawler.selenium_fallback = True
+        self.crawler._fallback_crawler = mock.Mock(**{'_crawl_news.return_value': False})
+        self.crawler.crawl_over_a_range(2, 2, archive=self.site.archive_url)
+        self.crawler._fallback_crawler._crawl_news.assert_called_once_with(self.site.news_url(5))
+        self.assertEqual(News.objects.count(), 3)
+
+    def test_unseen_news_lookup_does_not_scan_archive(self):
+        """Tests that finding the first seen link costs one query per archive page plus the crawl state lookup, whatever the archive size."""
+        News.objects.bulk_create(
+            News(title=f'old news {i}', text=f'old text {i}', resource=f'http://old.com/{i}') for i in range(500)
+        )
+        News.objects.create(title='seen', text='seen', resource=self.site.news_url(0))
+        with self.assertQueryBudget(2):
+            self.crawler.crawl_unseen_news(stop=3, archive=self.site.archive_url)
+
+    def test_range_crawl_resumes_after_last_completed_page(self):
+        """Tests that a range crawl interrupted on a page continues from that page on the next run."""
+        crawl_links = self.crawler.crawl_links
+
+        def crash_on_second_page(links):
+            if crash.call_count == 2:
+                raise RuntimeError('crawler crashed')
+            return crawl_links(links)
+
+        with mock.patch.object(self.crawler, 'crawl_links', side_effect=crash_on_second_page) as crash:
+            with self.assertRaises(RuntimeError):
+                self.crawler.crawl_over_a_range(1, 3, archive=self.site.archive_url)
+        state = CrawlState.objects.get(source=self.site.archive_url, range_start=1, range_end=3)
+        self.assertEqual(state.last_completed_page, 1)
+        self.assertEqual(News.objects.count(), 4)
+
+        self.site.requests.clear()
+        self.crawler.crawl_over_a_range(1, 3, archive=self.site.archive_url)
+        self.assertNotIn('/archive/?pageNumber=1', self.site.requests)
+        self.assertEqual(News.objects.count(), 11)  # news 5 needs JavaScript
+        state.refresh_from_db()
+        self.assertEqual(state.last_completed_page, 3)
+        self.assertEqual(state.newest_article_date, ZoomitParser.parse_datetime('شنبه ۲۷ مرداد ۱۴۰۳ - ۱۲:۵۹'))
+
+    def test_completed_range_is_crawled_again(self):
+        """Tests that running a completed range again crawls its pages instead of resuming after its end."""
+        self.crawler.crawl_over_a_range(1, 2, archive=self.site.archive_url)
+        News.objects.filter(resource=self.site.news_url(0)).delete()
+        self.site.requests.clear()
+        self.crawler.crawl_over_a_range(1, 2, archive=self.site.archive_url)
+        self.assertIn('/archive/?pageNumber=1', self.site.requests)
+        self.assertTrue(News.objects.filter(resource=self.site.news_url(0)).exists())
+        state = CrawlState.objects.get(source=self.site.archive_url, range_start=1, range_end=2)
+        self.assertEqual(state.last_completed_page, 2)
+
+    def test_unseen_news_stop_at_high_water_mark(self):
+        """Tests that unseen-news runs stop on the page reaching the newest news of earlier runs and move the mark."""
+        CrawlState.objects.create(
+            source=self.site.archive_url,
+            newest_article_date=ZoomitParser.parse_datetime('شنبه ۲۷ مرداد ۱۴۰۳ - ۱۲:۵۳')  # date of news 6
+        )
+        self.crawler.crawl_unseen_news(stop=3, archive=self.site.archive_url)
+        self.assertNotIn('/archive/?pageNumber=3', self.site.requests)
+        self.assertEqual(News.objects.count(), 7)
+        state = CrawlState.objects.get(source=self.site.archive_url)
+        self.assertEqual(state.newest_article_date, ZoomitParser.parse_datetime('شنبه ۲۷ مرداد ۱۴۰۳ - ۱۲:۵۹'))
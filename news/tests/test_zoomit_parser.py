@@ -0,0 +1,36 @@
+from ..utils.zoomit_parser import ZoomitParser
+from ..benchmarks.fixture_site import FixtureSite, SCRIPT_ONLY_PAGE
+from django.test import SimpleTestCase
+
+
+# Tests for utils/zoomit_parser.py
+class ZoomitParserTest(SimpleTestCase):
+    """TestCase for the ZoomitParser. Verifies the extraction of links and news attributes from html."""
+
+    def setUp(self):
+        """Renders pages of the fixture site without starting its server."""
+        self.site = FixtureSite(pages=1, news_per_page=2)
+
+    def test_parse_archive(self):
+        """Tests that archive links are extracted and made absolute."""
+        _, page = self.site.render('/archive/?pageNumber=1')
+        links = ZoomitParser.parse_archive(page, 'https://www.zoomit.ir/archive/?pageNumber=1')
+        self.assertEqual(links, ['https://www.zoomit.ir/news/0/', 'https://www.zoomit.ir/news/1/'])
+
+    def test_parse_news(self):
+        """Tests that title, text, tags and date are extracted from a news page."""
+        _, page = self.site.render('/news/7/')
+        news = ZoomitParser.parse_news(page)
+        self.assertEqual(news.title, 'خبر آزمایشی 7')
+        self.assertEqual(news.text, 'متن خبر شماره 7 درباره فناوری\nبخش دوم\nپایان خبر 7')
+        self.assertEqual(news.tag_labels, ['برچسب 1', 'فناوری'])
+        self.assertEqual((news.date.year, news.date.month, news.date.day, news.date.hour), (1403, 5, 27, 12))
+
+    def test_parse_news_without_content(self):
+        """Tests that a page without server-rendered news is reported as None."""
+        self.assertIsNone(ZoomitParser.parse_news(SCRIPT_ONLY_PAGE))
+
+    def test_parse_invalid_datetime(self):
+        """Tests that an unknown date format is parsed as None instead of raising."""
+        self.assertIsNone(ZoomitParser.parse_datetime('دیروز'))
+        self.assertIsNone(ZoomitParser.parse_datetime(None))
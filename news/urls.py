@@ -1,4 +1,5 @@
-from .views import NewsViewSet, TagViewSet
+from .views import NewsViewSet, TagViewSet, CacheStatsView, MetricsView
+from .async_views import AsyncReadOnlyView
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 
@@ -8,4 +9,14 @@ router.register(r'tags', TagViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    # Prometheus scrapes /metrics without a trailing slash by default.
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    # Async versions of the read endpoints, for ASGI workers serving many concurrent clients.
+    path('async/news/', AsyncReadOnlyView.as_view(viewset_class=NewsViewSet, action='list'), name='async-news-list'),
+    path('async/news/<str:pk>/', AsyncReadOnlyView.as_view(viewset_class=NewsViewSet, action='retrieve'),
+         name='async-news-detail'),
+    path('async/tags/', AsyncReadOnlyView.as_view(viewset_class=TagViewSet, action='list'), name='async-tag-list'),
+    path('async/tags/<str:pk>/', AsyncReadOnlyView.as_view(viewset_class=TagViewSet, action='retrieve'),
+         name='async-tag-detail'),
 ]
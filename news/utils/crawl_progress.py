@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from typing import Dict
+
+
+class CrawlProgress:
+    """
+    Progress counters of a distributed crawl run. The counters live in the shared cache,
+    so every Celery worker taking part in the run can update them and the process which
+    started the run can report them.
+
+    Attributes:
+        run_id: Identifier of the crawl run.
+        timeout: Seconds the counters are kept after their last update.
+    """
+    FIELDS = ('pages_total', 'pages_done', 'links_total', 'links_done', 'news_saved')
+
+    def __init__(self, run_id, timeout=24 * 60 * 60) -> None:
+        self.run_id = run_id
+        self.timeout = timeout
+
+    def _key(self, field) -> str:
+        return f'crawl:{self.run_id}:{field}'
+
+    def start(self, pages_total) -> None:
+        """Resets the counters for a run over the given number of archive pages."""
+        cache.set_many({self._key(field): 0 for field in self.FIELDS}, timeout=self.timeout)
+        cache.set(self._key('pages_total'), pages_total, timeout=self.timeout)
+
+    def add(self, field, amount=1) -> None:
+        """Adds the given amount to a counter."""
+        try:
+            cache.incr(self._key(field), amount)
+        except ValueError:
+            cache.add(self._key(field), amount, timeout=self.timeout)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Returns the current value of every counter."""
+        values = cache.get_many([self._key(field) for field in self.FIELDS])
+        return {field: values.get(self._key(field), 0) for field in self.FIELDS}
@@ -0,0 +1,16 @@
+from .zoomit_crawler import ZoomitCrawler
+from .zoomit_http_crawler import ZoomitHttpCrawler
+from django.conf import settings
+
+CRAWLER_ENGINES = {
+    'selenium': ZoomitCrawler,
+    'http': ZoomitHttpCrawler,
+}
+
+
+def get_crawler(engine=None, **kwargs) -> ZoomitCrawler:
+    """
+    Returns a crawler of the given engine, or of the engine set by the CRAWLER_ENGINE setting.
+    Keyword arguments, e.g. a WebDriverPool, are passed to the crawler's constructor.
+    """
+    return CRAWLER_ENGINES[engine or settings.CRAWLER_ENGINE](**kwargs)
@@ -0,0 +1,105 @@
+from news.models import News, Tag
+from news.cache import bump_generation
+from django.db import connection, transaction
+from pathlib import Path
+from typing import Dict
+
+
+class NewsDump:
+    """
+    Dump of the news archive streamed through PostgreSQL COPY instead of the ORM. A dump is
+    a directory with one file per table. Rows are written by natural keys (tag labels and
+    news urls) instead of ids, so a dump can be loaded into a database which already has
+    data. Loading copies every file into a temporary staging table and merges it with one
+    set-based INSERT ... ON CONFLICT DO NOTHING per table, in a single transaction.
+
+    Attributes:
+        directory: Directory holding the dump files.
+        format: COPY format of the files, 'csv' or 'binary'.
+        FORMATS: Supported COPY formats.
+        TABLES: Maps the dump file names to the SELECT writing their rows.
+        MERGE: Maps the dump file names to the INSERT merging their staging table.
+    """
+    FORMATS = ('csv', 'binary')
+    TABLES = {
+        'tags': 'SELECT tag_label FROM {tag} ORDER BY id',
+        'news': 'SELECT title, text, resource, date FROM {news} ORDER BY id',
+        'news_tags': (
+            'SELECT n.resource, t.tag_label FROM {news_tags} nt '
+            'JOIN {news} n ON n.id = nt.news_id JOIN {tag} t ON t.id = nt.tag_id ORDER BY nt.id'
+        ),
+    }
+    MERGE = {
+        'tags': 'INSERT INTO {tag} (tag_label) SELECT DISTINCT tag_label FROM import_tags ON CONFLICT DO NOTHING',
+        # content_hash is computed like News.compute_content_hash.
+        'news': (
+            'INSERT INTO {news} (title, text, resource, date, content_hash) '
+            "SELECT DISTINCT ON (s.hash) s.title, s.text, s.resource, s.date, s.hash FROM ("
+            "    SELECT *, encode(sha256(convert_to(text, 'UTF8')), 'hex') AS hash FROM import_news"
+            ') s WHERE NOT EXISTS (SELECT 1 FROM {news} n WHERE n.content_hash = s.hash) '
+            'ON CONFLICT DO NOTHING'
+        ),
+        'news_tags': (
+            'INSERT INTO {news_tags} (news_id, tag_id) SELECT n.id, t.id FROM import_news_tags s '
+            'JOIN {news} n ON n.resource = s.resource JOIN {tag} t ON t.tag_label = s.tag_label '
+            'ON CONFLICT DO NOTHING'
+        ),
+    }
+
+    def __init__(self, directory, format='csv') -> None:
+        if format not in self.FORMATS:
+            raise ValueError(f'Unknown dump format {format!r}.')
+        self.directory = Path(directory)
+        self.format = format
+        quote = connection.ops.quote_name
+        self.table_names = {
+            'tag': quote(Tag._meta.db_table),
+            'news': quote(News._meta.db_table),
+            'news_tags': quote(News.tags.through._meta.db_table),
+        }
+
+    def path(self, name) -> Path:
+        """Returns the path of a dump file."""
+        return self.directory / f"{name}.{'csv' if self.format == 'csv' else 'bin'}"
+
+    @property
+    def copy_options(self) -> str:
+        return '(FORMAT csv, HEADER)' if self.format == 'csv' else '(FORMAT binary)'
+
+    def dump(self) -> Dict[str, int]:
+        """Writes every table to its dump file and returns the number of written rows per file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        own_transaction = not connection.in_atomic_block
+        with transaction.atomic(), connection.cursor() as cursor:
+            if own_transaction:
+                # One snapshot for every file, so links never reference news written after the news file.
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+            for name, query in self.TABLES.items():
+                with open(self.path(name), 'wb') as file:
+                    cursor.copy_expert(f'COPY ({query.format(**self.table_names)}) TO STDOUT {self.copy_options}', file)
+                counts[name] = cursor.rowcount
+        return counts
+
+    def load(self) -> Dict[str, int]:
+        """Merges the dump files into the database and returns the number of inserted rows per file."""
+        missing = [str(self.path(name)) for name in self.TABLES if not self.path(name).exists()]
+        if missing:
+            raise FileNotFoundError(f"Missing dump files: {', '.join(missing)}")
+
+        counts = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            for name, query in self.TABLES.items():
+                # The staging table gets the exact column types of the dump query, as binary COPY requires.
+                cursor.execute(
+                    f'CREATE TEMPORARY TABLE import_{name} ON COMMIT DROP AS '
+                    f'{query.format(**self.table_names)} WITH NO DATA'
+                )
+                with open(self.path(name), 'rb') as file:
+                    cursor.copy_expert(f'COPY import_{name} FROM STDIN {self.copy_options}', file)
+                cursor.execute(f'ANALYZE import_{name}')
+                cursor.execute(self.MERGE[name].format(**self.table_names))
+                counts[name] = cursor.rowcount
+        # Rows inserted by SQL send no signals, so cached responses are invalidated here.
+        bump_generation()
+        return counts
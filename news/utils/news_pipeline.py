@@ -0,0 +1,135 @@
+from news.models import News, Tag
+from news.cache import bump_generation
+from news.metrics import CRAWLER_DUPLICATES, CRAWLER_SAVED
+from news.utils.persian_calendar import PersianCalendar
+from news.utils.stage_timings import StageTimings
+from news.utils.tag_cache import TagCache, get_tag_cache
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+
+class PendingNews(NamedTuple):
+    """A crawled news article waiting in the pipeline to be saved."""
+    title: str
+    text: str
+    resource: str
+    date: Optional[datetime]
+    tag_labels: List[str]
+
+
+class NewsPipeline:
+    """
+    Buffers crawled news and saves them in batches. A flush runs in one transaction with a
+    fixed number of queries whatever the batch size: one duplicate check, one bulk insert of
+    the news, one lookup of their ids, the tag resolution, one check that the resolved tags
+    still exist and one bulk insert into the News-Tag table. Inserts skip rows conflicting with the unique title and resource, so
+    workers crawling the same article at the same time do not fail each other's batches.
+
+    Attributes:
+        batch_size: Number of buffered news which triggers a flush.
+        tag_cache: TagCache resolving tag labels to ids.
+        timings: StageTimings recording the duration of every flush as the 'save' stage.
+        saved: Number of news saved by this pipeline so far.
+        newest_date: Date of the newest news added to this pipeline, saved or not.
+        oldest_date: Date of the oldest news added to this pipeline, saved or not.
+    """
+
+    def __init__(self, batch_size=None, tag_cache: Optional[TagCache] = None,
+                 timings: Optional[StageTimings] = None) -> None:
+        self.batch_size = batch_size or settings.CRAWLER_BATCH_SIZE
+        self.tag_cache = tag_cache or get_tag_cache()
+        self.timings = timings or StageTimings()
+        self.saved = 0
+        self.newest_date: Optional[datetime] = None
+        self.oldest_date: Optional[datetime] = None
+        self._pending: List[PendingNews] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, title, text, resource, date, tag_labels) -> None:
+        """Buffers a news article and flushes the buffer when it is full."""
+        self._pending.append(PendingNews(title, text, resource, date, list(tag_labels)))
+        if date is not None:
+            self.newest_date = max(self.newest_date or date, date)
+            self.oldest_date = min(self.oldest_date or date, date)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Saves the buffered news which do not exist yet with their tags and returns their number."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        with self.timings.measure('save'), transaction.atomic():
+            news_items = self._new_news(pending)
+            if not news_items:
+                CRAWLER_DUPLICATES.inc(len(pending))
+                return 0
+            News.objects.bulk_create(news_items, ignore_conflicts=True)
+            saved = self._saved_ids(news_items)
+            self._save_tags(pending, saved)
+
+        # bulk_create sends no signals, so cached responses are invalidated here.
+        bump_generation()
+        self.saved += len(saved)
+        CRAWLER_SAVED.inc(len(saved))
+        CRAWLER_DUPLICATES.inc(len(pending) - len(saved))
+        return len(saved)
+
+    def _new_news(self, pending) -> List[News]:
+        """Builds the News instances of the buffered articles which are neither stored nor repeated in the batch."""
+        items = [
+            News(title=news.title, text=news.text, resource=news.resource,
+                 date=news.date or PersianCalendar.currnet_persian_datetime(),
+                 content_hash=News.compute_content_hash(news.text))
+            for news in pending
+        ]
+        existing = News.objects.filter(
+            Q(title__in=[item.title for item in items]) |
+            Q(resource__in=[item.resource for item in items]) |
+            Q(content_hash__in=[item.content_hash for item in items])
+        ).values_list('title', 'resource', 'content_hash')
+        seen = {value for row in existing for value in row}
+
+        new_items = []
+        for item in items:
+            keys = (item.title, item.resource, item.content_hash)
+            if not seen.intersection(keys):
+                seen.update(keys)
+                new_items.append(item)
+        return new_items
+
+    @staticmethod
+    def _saved_ids(news_items) -> Dict[str, int]:
+        """Returns the ids of the inserted news by resource. Rows lost to a concurrent insert are left out."""
+        hashes = {item.resource: item.content_hash for item in news_items}
+        rows = News.objects.filter(resource__in=hashes).values_list('resource', 'id', 'content_hash')
+        return {resource: pk for resource, pk, content_hash in rows if hashes[resource] == content_hash}
+
+    def _save_tags(self, pending, saved) -> None:
+        """Links the saved news to their tags, creating the tags which do not exist yet."""
+        labels = {label for news in pending if news.resource in saved for label in news.tag_labels}
+        tag_ids = self.tag_cache.resolve(labels)
+        # Tags deleted through another process are still cached here, and their ids would only fail
+        # the deferred foreign key at commit, rolling back the whole batch. The checked tags are
+        # locked until commit, so they can not be deleted in between.
+        existing = set(
+            Tag.objects.filter(id__in=tag_ids.values()).order_by('id').select_for_update(no_key=True)
+            .values_list('id', flat=True)
+        )
+        stale = [label for label, tag_id in tag_ids.items() if tag_id not in existing]
+        if stale:
+            for label in stale:
+                self.tag_cache.discard(label)
+            tag_ids.update(self.tag_cache.resolve(stale))
+        Through = News.tags.through
+        Through.objects.bulk_create([
+            Through(news_id=saved[news.resource], tag_id=tag_ids[label])
+            for news in pending if news.resource in saved
+            for label in dict.fromkeys(news.tag_labels)
+        ], ignore_conflicts=True)
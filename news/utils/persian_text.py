@@ -0,0 +1,18 @@
+class PersianText:
+    """
+    Helpers for normalizing Persian text before it is indexed or searched. Arabic
+    variants of Persian letters are mapped to their Persian form and zero-width
+    non-joiners are replaced by spaces, so that differently typed words still match.
+    """
+
+    CHARACTER_MAP = str.maketrans({
+        '\u064a': '\u06cc',  # Arabic yeh -> Persian yeh
+        '\u0649': '\u06cc',  # Alef maksura -> Persian yeh
+        '\u0643': '\u06a9',  # Arabic kaf -> Persian keheh
+        '\u200c': ' ',       # Zero-width non-joiner -> space
+    })
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Returns the given text with Persian characters normalized."""
+        return text.translate(cls.CHARACTER_MAP)
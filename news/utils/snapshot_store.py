@@ -0,0 +1,130 @@
+from django.conf import settings
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import atexit
+import mmap
+import os
+import time
+import zlib
+
+
+class Snapshot(NamedTuple):
+    """A page stored in the SnapshotStore."""
+    url: str
+    fetched_at: datetime
+    page: str
+
+
+class SnapshotStore:
+    """
+    Append-only store of the raw html of crawled pages. Pages are zlib-compressed and
+    appended to segment files; an index file next to every segment records the url, offset
+    and length of each page. Every process writes its own segments, so Celery workers never
+    share a file, and segments are rotated once they reach segment_size bytes. Segments are
+    read through mmap, so re-extracting millions of stored pages runs at disk speed.
+
+    Attributes:
+        directory: Directory holding the segment and index files.
+        segment_size: Size in bytes after which a process starts a new segment.
+        compression_level: zlib compression level of the stored pages.
+    """
+    SEGMENT_SUFFIX = '.seg'
+    INDEX_SUFFIX = '.idx'
+
+    def __init__(self, directory, segment_size=None, compression_level=6) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size or settings.CRAWLER_SNAPSHOT_SEGMENT_SIZE
+        self.compression_level = compression_level
+        self._lock = Lock()
+        self._segment = None
+        self._index = None
+        self._pid = None
+
+    def append(self, url, page: str) -> None:
+        """Stores the html of a page fetched from the given url."""
+        data = zlib.compress(page.encode('utf-8'), self.compression_level)
+        with self._lock:
+            if self._segment is None or self._pid != os.getpid() or self._segment.tell() >= self.segment_size:
+                self._open_segment()
+            offset = self._segment.tell()
+            self._segment.write(data)
+            self._segment.flush()
+            # The index line is written after the data, so an indexed page is always complete.
+            self._index.write(f'{offset}\t{len(data)}\t{time.time():.3f}\t{url}\n')
+            self._index.flush()
+
+    def close(self) -> None:
+        """Closes the segment this process writes to."""
+        with self._lock:
+            if self._segment is not None and self._pid == os.getpid():
+                self._segment.close()
+                self._index.close()
+            self._segment = self._index = None
+
+    def _open_segment(self) -> None:
+        if self._segment is not None and self._pid == os.getpid():
+            self._segment.close()
+            self._index.close()
+        self._pid = os.getpid()
+        # Names start with the creation time, so sorting them orders segments from oldest to newest.
+        name = f'{time.time_ns():020d}-{self._pid}'
+        self._segment = open(self.directory / (name + self.SEGMENT_SUFFIX), 'ab')
+        self._index = open(self.directory / (name + self.INDEX_SUFFIX), 'a', encoding='utf-8')
+
+    def segments(self) -> List[Path]:
+        """Returns the index files of the store from oldest to newest."""
+        return sorted(self.directory.glob('*' + self.INDEX_SUFFIX))
+
+    def __iter__(self) -> Iterator[Snapshot]:
+        """Yields every stored page in the order it was stored."""
+        for index_path in self.segments():
+            yield from self._read_segment(index_path, self._read_index(index_path))
+
+    def latest(self) -> Iterator[Snapshot]:
+        """Yields the newest stored page of every url. Pages are read segment by segment in file order."""
+        newest: Dict[str, Tuple[Path, int, int, float]] = {}
+        for index_path in self.segments():
+            for offset, length, fetched_at, url in self._read_index(index_path):
+                newest[url] = (index_path, offset, length, fetched_at)
+
+        entries = defaultdict(list)
+        for url, (index_path, offset, length, fetched_at) in newest.items():
+            entries[index_path].append((offset, length, fetched_at, url))
+        for index_path in sorted(entries):
+            yield from self._read_segment(index_path, sorted(entries[index_path]))
+
+    @staticmethod
+    def _read_index(index_path) -> List[Tuple[int, int, float, str]]:
+        entries = []
+        with open(index_path, encoding='utf-8') as index:
+            for line in index:
+                if not line.endswith('\n'):
+                    break  # The writer stopped in the middle of this line.
+                offset, length, fetched_at, url = line[:-1].split('\t', 3)
+                entries.append((int(offset), int(length), float(fetched_at), url))
+        return entries
+
+    def _read_segment(self, index_path, entries) -> Iterator[Snapshot]:
+        segment_path = index_path.with_suffix(self.SEGMENT_SUFFIX)
+        if not entries or segment_path.stat().st_size == 0:
+            return
+        with open(segment_path, 'rb') as segment, mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset, length, fetched_at, url in entries:
+                page = zlib.decompress(data[offset:offset + length]).decode('utf-8')
+                yield Snapshot(url, datetime.fromtimestamp(fetched_at, tz=timezone.utc), page)
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Returns the snapshot store of the current process, or None if CRAWLER_SNAPSHOT_DIR is not set."""
+    global _store
+    if _store is None and settings.CRAWLER_SNAPSHOT_DIR:
+        _store = SnapshotStore(settings.CRAWLER_SNAPSHOT_DIR)
+        atexit.register(_store.close)
+    return _store
@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Dict, List
+import time
+from news.metrics import CRAWLER_STAGE_SECONDS
+
+
+class StageTimings:
+    """
+    Durations of the stages of a crawl (e.g. fetch, parse and save). Crawlers record every
+    stage they run, so benchmarks and logs can tell where the time of a crawl goes. Every
+    duration is also observed by the crawler stage histogram of the Prometheus metrics.
+
+    Attributes:
+        durations: Recorded durations in seconds by stage name.
+    """
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def measure(self, stage):
+        """Context manager recording the duration of the block under the given stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.durations[stage].append(duration)
+            CRAWLER_STAGE_SECONDS.labels(stage).observe(duration)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Returns the count, total, mean, p50, p95 and max duration (seconds) of every stage."""
+        summary = {}
+        for stage, durations in self.durations.items():
+            ordered = sorted(durations)
+            summary[stage] = {
+                'count': len(ordered),
+                'total': sum(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': self.percentile(ordered, 50),
+                'p95': self.percentile(ordered, 95),
+                'max': ordered[-1],
+            }
+        return summary
+
+    @staticmethod
+    def percentile(ordered, percent) -> float:
+        """Returns the nearest-rank percentile of sorted values."""
+        if not ordered:
+            return 0.0
+        rank = max(1, -(-len(ordered) * percent // 100))
+        return ordered[int(rank) - 1]
@@ -0,0 +1,100 @@
+from news.models import Tag
+from django.conf import settings
+from django.db import transaction
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, Optional
+
+
+class TagCache:
+    """
+    Bounded LRU cache mapping tag labels to tag ids, shared by the crawlers of a worker
+    process. The tag vocabulary is small and stable, so most articles resolve their tags
+    without a query. Missing labels are inserted with ON CONFLICT DO NOTHING and read back,
+    so workers creating the same tag at the same time do not fail. Ids of tags created in a
+    transaction are only cached once it commits, so a rolled back batch leaves no stale ids.
+
+    Attributes:
+        max_size: Max number of labels kept in the cache.
+        hits: Number of labels resolved from the cache.
+        misses: Number of labels resolved from the database.
+    """
+
+    def __init__(self, max_size=None) -> None:
+        self.max_size = max_size or settings.CRAWLER_TAG_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+        self._ids: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def warm_up(self) -> None:
+        """Loads the ids of the most used tags, up to max_size of them."""
+        tags = Tag.objects.order_by('-news_count', 'id').values_list('tag_label', 'id')
+        self._store(reversed(list(tags[:self.max_size])))
+
+    def resolve(self, labels: Iterable[str]) -> Dict[str, int]:
+        """Returns the ids of the tags with the given labels, saving the ones which do not exist yet."""
+        tag_ids, missing = {}, []
+        with self._lock:
+            for label in dict.fromkeys(labels):
+                if label in self._ids:
+                    self._ids.move_to_end(label)
+                    tag_ids[label] = self._ids[label]
+                else:
+                    missing.append(label)
+            self.hits += len(tag_ids)
+            self.misses += len(missing)
+        if not missing:
+            return tag_ids
+
+        existing = dict(Tag.objects.filter(tag_label__in=missing).values_list('tag_label', 'id'))
+        self._store(existing.items())
+        created = [label for label in missing if label not in existing]
+        if created:
+            Tag.objects.bulk_create([Tag(tag_label=label) for label in created], ignore_conflicts=True)
+            created_ids = dict(Tag.objects.filter(tag_label__in=created).values_list('tag_label', 'id'))
+            transaction.on_commit(lambda: self._store(created_ids.items()))
+            existing.update(created_ids)
+        tag_ids.update(existing)
+        return tag_ids
+
+    def discard(self, label: str) -> None:
+        """Removes a label from the cache, e.g. because its tag was deleted."""
+        with self._lock:
+            self._ids.pop(label, None)
+
+    def clear(self) -> None:
+        """Removes every label from the cache and resets the counters."""
+        with self._lock:
+            self._ids.clear()
+            self.hits = self.misses = 0
+
+    def _store(self, items) -> None:
+        """Adds (label, id) pairs as the most recently used labels and evicts the least recently used ones."""
+        with self._lock:
+            for label, tag_id in items:
+                self._ids[label] = tag_id
+                self._ids.move_to_end(label)
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+
+_tag_cache: Optional[TagCache] = None
+
+
+def get_tag_cache() -> TagCache:
+    """Returns the tag cache of the current process, warming it up on first use."""
+    global _tag_cache
+    if _tag_cache is None:
+        _tag_cache = TagCache()
+        _tag_cache.warm_up()
+    return _tag_cache
+
+
+def evict_tag(label) -> None:
+    """Removes a label from the tag cache of the current process, if it was created."""
+    if _tag_cache is not None:
+        _tag_cache.discard(label)
@@ -0,0 +1,119 @@
+from django.conf import settings
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Optional
+import atexit
+
+
+@lru_cache(maxsize=None)
+def get_chromedriver_path() -> str:
+    """Returns the path of the ChromeDriver binary. The lookup is done once per process."""
+    return ChromeDriverManager().install()
+
+
+def build_chrome_options() -> webdriver.ChromeOptions:
+    """Returns the options of the headless Chrome used by the crawler."""
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.set_capability('browserName', 'chrome')
+    chrome_options.add_argument('--headless')  # Run in headless mode
+    chrome_options.add_argument('--no-sandbox')  # Bypass OS security model
+    chrome_options.add_argument('--disable-dev-shm-usage')  # Overcome limited resource problems
+    return chrome_options
+
+
+def create_webdriver() -> webdriver.Chrome:
+    """Starts a new headless Chrome instance."""
+    service = webdriver.ChromeService(get_chromedriver_path())
+    return webdriver.Chrome(service=service, options=build_chrome_options())
+
+
+class WebDriverPool:
+    """
+    Pool of warm WebDriver instances living as long as the worker process. Crawlers
+    acquire a driver instead of starting Chrome and release it when they quit. Drivers
+    failing a health check are replaced and drivers which have loaded max_pages pages are
+    recycled, so a long-running worker does not accumulate browser memory.
+
+    Attributes:
+        size: Max number of idle drivers kept in the pool.
+        max_pages: Number of loaded pages after which a driver is recycled.
+    """
+
+    def __init__(self, size=None, max_pages=None) -> None:
+        self.size = size or settings.CRAWLER_BROWSER_POOL_SIZE
+        self.max_pages = max_pages or settings.CRAWLER_BROWSER_MAX_PAGES
+        self._idle: List[webdriver.Chrome] = []
+        self._pages: Dict[webdriver.Chrome, int] = {}
+        self._lock = Lock()
+
+    def acquire(self) -> webdriver.Chrome:
+        """Returns a healthy idle driver, or starts a new one if there is none."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return self._create_driver()
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver, pages=0) -> None:
+        """Returns a driver to the pool after it loaded the given number of pages; recycles it if it is worn out."""
+        with self._lock:
+            self._pages[driver] = self._pages.get(driver, 0) + pages
+            keep = self._pages[driver] < self.max_pages and len(self._idle) < self.size
+            if keep:
+                self._idle.append(driver)
+        if not keep:
+            self._discard(driver)
+
+    def shutdown(self) -> None:
+        """Quits every idle driver."""
+        with self._lock:
+            drivers, self._idle = self._idle, []
+        for driver in drivers:
+            self._discard(driver)
+
+    def _create_driver(self) -> webdriver.Chrome:
+        driver = create_webdriver()
+        with self._lock:
+            self._pages[driver] = 0
+        return driver
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        """Checks that the browser still answers commands."""
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver) -> None:
+        with self._lock:
+            self._pages.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+_pool: Optional[WebDriverPool] = None
+
+
+def get_webdriver_pool() -> WebDriverPool:
+    """Returns the WebDriver pool of the current process, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = WebDriverPool()
+        atexit.register(shutdown_webdriver_pool)
+    return _pool
+
+
+def shutdown_webdriver_pool() -> None:
+    """Quits the drivers of the current process's pool, if it was created."""
+    if _pool is not None:
+        _pool.shutdown()
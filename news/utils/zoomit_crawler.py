@@ -1,179 +1,198 @@
-from django.db.models import Q
-from news.models import News, Tag
-from selenium import webdriver
+from news.models import CrawlState, News
+from news.metrics import CRAWLER_PAGES
+from .news_pipeline import NewsPipeline
+from .snapshot_store import get_snapshot_store
+from .webdriver_pool import WebDriverPool, create_webdriver
+from .zoomit_parser import ZoomitParser
+from django.conf import settings
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-import pytz
-from datetime import datetime
-from typing import List, Optional
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from itertools import takewhile
+from typing import List, Optional, Set
 
 
 class ZoomitCrawler:
     """
     Crawler class for retrieving news articles from the Zoomit website. Handles the process
     of navigating through pages, collecting news links, and extracting and saving news content.
-    Save news data and tags into database if not existed.
+    The browser only renders the pages; links and news are extracted from the rendered html by
+    ZoomitParser, so the same extraction runs on pages fetched over HTTP and on stored snapshots.
+    Extracted news are buffered in a NewsPipeline which saves them with their tags in batches
+    if they do not exist yet. Pages are rendered by JavaScript, so the html is only read once the
+    news title or the archive links are present, or after render_timeout seconds.
 
     Attributes:
-        service: Selenium service object to manage the ChromeDriver instance.
+        pool: WebDriverPool the driver is borrowed from, or None if the crawler owns its driver.
         driver: Selenium WebDriver instance to automate chrome browser interaction.
+        pages_loaded: Number of pages loaded by the driver during this crawl.
+        pipeline: NewsPipeline saving the extracted news.
+        snapshots: SnapshotStore keeping the html of crawled news pages, or None if CRAWLER_SNAPSHOT_DIR is not set.
+        timings: StageTimings of the fetch, parse and save stages, shared with the pipeline.
+        render_timeout: Seconds to wait for the content of a page to be rendered.
+        TITLE_XPATH: Element whose presence shows that a news page is rendered.
+        LINKS_XPATH: Element whose presence shows that an archive page is rendered.
     """
+    TITLE_XPATH = ZoomitParser.TITLE_XPATH.path
+    LINKS_XPATH = ZoomitParser.LINKS_XPATH.path.removesuffix('/@href')
 
-    def __init__(self) -> None:
-        """Class constructor. Sets initial value for class attributes."""
-        self.chrome_options = webdriver.ChromeOptions()
-        self.chrome_options.set_capability('browserName', 'chrome')
-        self.chrome_options.add_argument('--headless')  # Run in headless mode
-        self.chrome_options.add_argument('--no-sandbox')  # Bypass OS security model
-        self.chrome_options.add_argument('--disable-dev-shm-usage')  # Overcome limited resource problems
-        self.service = webdriver.ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=self.service, options=self.chrome_options)
+    def __init__(self, pool: Optional[WebDriverPool] = None, pipeline: Optional[NewsPipeline] = None) -> None:
+        """
+        Class constructor. Borrows a warm driver from the given pool or starts a new one.
+        The driver is acquired last, so a failing setup can not leave it checked out.
+        """
+        self.pool = pool
+        self.pages_loaded = 0
+        self.pipeline = pipeline or NewsPipeline()
+        self.timings = self.pipeline.timings
+        self.snapshots = get_snapshot_store()
+        self.render_timeout = settings.CRAWLER_BROWSER_RENDER_TIMEOUT
+        self.driver = pool.acquire() if pool is not None else create_webdriver()
 
     def crawl_unseen_news(self, stop=10, archive="https://www.zoomit.ir/archive/") -> None:
         """
-        Iterates over zoomit archive pages and collects every news link which is not stored in database
-        and passes them to crawl_news method in order to crawl them.
+        Iterates over zoomit archive pages and crawls the news which are not stored in database page by page.
+        Stops at the first stored news, or once the crawled news reach the high-water mark of the source,
+        which is the date of the newest news crawled by earlier runs.
         stop: max page number that this method is allowed to crawl.
         """
+        state = CrawlState.objects.filter(source=archive, range_start=0, range_end=0).first()
+        high_water_mark = state.newest_article_date if state else None
+        crawled = 0
 
-        collected_links = []
-        existing_links = list(resource[0] for resource in News.objects.values_list('resource'))
-        
         for page_number in range(1, stop+1):
             url = archive + '?pageNumber=' + str(page_number)
-            self.driver.get(url=url)
-            self.driver.implicitly_wait(0.5) # waits for page to load
-            links_x_path = '//a[@class="link__CustomNextLink-sc-1r7l32j-0 eoKbWT BrowseArticleListItemDesktop__WrapperLink-zb6c6m-6 bzMtyO"]'
-            news_links = self.driver.find_elements(By.XPATH, links_x_path)
-            
-            for news_link in news_links:
-                href = news_link.get_attribute('href')
-                if href in existing_links:
-                    break  # Stops crawling if an existing link was found
-                
-                collected_links.append(href)
-
-            else:
-                continue  # Only continue to the next page if we did not break the loop
-
-            break  # Break the outer loop if we found an existing link
+            news_links = self._get_archive_links(url)
+            existing_links = self._get_existing_links(news_links)
+            unseen_links = list(takewhile(lambda href: href not in existing_links, news_links))
+
+            crawled += len(unseen_links)
+            self.crawl_links(unseen_links)
+
+            if len(unseen_links) < len(news_links):
+                break  # Stops crawling if an existing link was found
+            if high_water_mark and self.pipeline.oldest_date and self.pipeline.oldest_date <= high_water_mark:
+                break  # Stops crawling once the news of earlier runs were reached
+
+        print(f'Crawled {crawled} news from https://zoomit.ir')
+        newest_date = self.pipeline.newest_date
+        if newest_date and (high_water_mark is None or newest_date > high_water_mark):
+            CrawlState.objects.update_or_create(
+                source=archive, range_start=0, range_end=0, defaults={'newest_article_date': newest_date}
+            )
 
-        print(f'Crawling {len(collected_links)} news from https://zoomit.ir')
-        for news_link in collected_links:
-            self.crawl_news(news_link)
+    def _get_existing_links(self, news_links) -> Set[str]:
+        """
+        Returns the given links which are already stored in database. Only the links of the current
+        archive page are looked up through the unique index of News.resource, so the cost of a run
+        depends on the number of new links instead of the size of the archive.
+        """
+        if not news_links:
+            return set()
+        return set(News.objects.filter(resource__in=news_links).values_list('resource', flat=True))
 
-    def crawl_over_a_range(self, from_page, to_page, archive="https://www.zoomit.ir/archive/") -> None:
-        """Iterates over a range of pages to collect news links and passes each news link to crawl_news method in order to crawl them."""
+    def crawl_over_a_range(self, from_page, to_page, archive="https://www.zoomit.ir/archive/", resume=True) -> None:
+        """
+        Crawls a range of archive pages page by page. The checkpoint of the range records every completed page,
+        so if resume is set, a crawl of the same range continues after the last completed page of an interrupted run.
+        A range whose last run completed is crawled again from its first page.
+        """
+        state, _ = CrawlState.objects.get_or_create(source=archive, range_start=from_page, range_end=to_page)
+        first_page = from_page
+        if resume and state.last_completed_page is not None and state.last_completed_page < to_page:
+            first_page = state.last_completed_page + 1
+            print(f'Resuming after page {state.last_completed_page}')
+
+        saved = 0
+        for page_number in range(first_page, to_page + 1):
+            saved += self.crawl_links(self.collect_links(page_number, page_number, archive))
+            state.last_completed_page = page_number
+            newest_date = self.pipeline.newest_date
+            if newest_date and (state.newest_article_date is None or newest_date > state.newest_article_date):
+                state.newest_article_date = newest_date
+            state.save()
+
+        print(f'Saved {saved} news from https://zoomit.ir')
+
+    def collect_links(self, from_page, to_page, archive="https://www.zoomit.ir/archive/") -> List[str]:
+        """Returns the news links listed on the archive pages of the given range."""
         collected_links = []
         for page_number in range(from_page, to_page + 1):
             url = archive + '?pageNumber=' + str(page_number)
-            self.driver.get(url=url)
-            self.driver.implicitly_wait(0.5) # waits for page to load
-            links_x_path = '//a[@class="link__CustomNextLink-sc-1r7l32j-0 eoKbWT BrowseArticleListItemDesktop__WrapperLink-zb6c6m-6 bzMtyO"]'
-            news_links = self.driver.find_elements(By.XPATH, links_x_path)
-            collected_links.extend([news_link.get_attribute('href') for news_link in news_links])        
-
-        print(f'Crawling {len(collected_links)} news from https://zoomit.ir')
-        for news_link in collected_links:
-            self.crawl_news(news_link)
-
-    def crawl_news(self, news_url) -> None:
+            collected_links.extend(self._get_archive_links(url))
+        return collected_links
+
+    def crawl_links(self, news_links) -> int:
+        """Crawls the given news links one after another and returns the number of saved news."""
+        saved = self.pipeline.saved
+        for news_link in news_links:
+            self._crawl_news(news_link)
+        self.pipeline.flush()
+        return self.pipeline.saved - saved
+
+    def crawl_news(self, news_url) -> bool:
+        """Crawls a single news article, saves it if not existed and returns whether it was saved."""
+        saved = self.pipeline.saved
+        self._crawl_news(news_url)
+        self.pipeline.flush()
+        return self.pipeline.saved > saved
+
+    def _crawl_news(self, news_url) -> bool:
         """
-        Crawls a single news article, finds html elements related to News attributes(title, text, and tags),
-        and extracts information from them by passing them to the related methods.
-        At the end, saves news if not existed.
+        Crawls a single news article. The rendered html is read from the browser in one call and the
+        News attributes (title, text, date and tags) are extracted from it by ZoomitParser.
+        At the end, passes the news to the pipeline and returns whether a news was found.
         """
-        self.driver.get(news_url)
-
-        title = self._get_news_title()
-        text = self._get_news_text()
-        date_time = self._get_news_datetime()
-
-        if (not title) or (not text):
-            return None
-
-        tags = self._get_news_tags()
-        self._save_news(title, text, news_url, date_time, tags)
-        
-    def _get_news_title(self) -> Optional[str]:
-        """Extracts the title of a news article from the page and returns it. If no title was found, simply returns None."""
-        try:
-            title_xpath = '//h1[@class="typography__StyledDynamicTypographyComponent-t787b7-0 jQMKGt" or @class="typography__StyledDynamicTypographyComponent-t787b7-0 fzMmhL"]'
-            title_element = self.driver.find_element(By.XPATH, title_xpath)
-            return title_element.text.strip()
-        except NoSuchElementException:
-            return None
-
-    def _get_news_text(self) -> Optional[str]:
-        """Extracts the text of a news article from the page and returns it. If no text was found, simply returns None."""
-        try:
-            text_xpath = (
-                '//p[@class="typography__StyledDynamicTypographyComponent-t787b7-0 fZZfUi ParagraphElement__ParagraphBase-sc-1soo3i3-0 gOVZGU"] | '
-                '//h2[@class="typography__StyledDynamicTypographyComponent-t787b7-0 cAPRcR HeadingTwo__HeadingTwoBase-sc-3nstjw-1 aMVhn"] | '
-                '//span[@font-size="1.6" and @class="typography__StyledDynamicTypographyComponent-t787b7-0 fNeDiY"]'
-            )
-            text_elements = self.driver.find_elements(By.XPATH, text_xpath)
-            return '\n'.join([element.text for element in text_elements])
-        except NoSuchElementException:
-            return None
-
-    def _get_news_tags(self) -> List[Tag]:
+        self._load_page(news_url, self.TITLE_XPATH)
+        return self._process_news(news_url, self.driver.page_source)
+
+    def _process_news(self, news_url, page: str) -> bool:
+        """Stores the html of a news page if snapshots are enabled, extracts the news and passes it to the pipeline."""
+        if self.snapshots is not None:
+            self.snapshots.append(news_url, page)
+
+        with self.timings.measure('parse'):
+            news = ZoomitParser.parse_news(page)
+        if news is None:
+            return False
+
+        self._save_news(news.title, news.text, news_url, news.date, news.tag_labels)
+        return True
+
+    def _get_archive_links(self, url) -> List[str]:
+        """Opens an archive page and returns the links of the news listed on it."""
+        self._load_page(url, self.LINKS_XPATH)
+        page = self.driver.page_source
+        with self.timings.measure('parse'):
+            return ZoomitParser.parse_archive(page, self.driver.current_url)
+
+    def _load_page(self, url, rendered_xpath) -> None:
         """
-        Extracts tags associated with a news article, saves new tags to the database and returns the list of 
-        associated tags. If no tag was found returns an empty list.
+        Loads a page in the browser, waits until an element matching rendered_xpath exists and counts
+        the page towards the driver's recycle limit. Pages where it never appears are read as they are.
         """
-        try:
-            tag_xpath = '//span[@class="typography__StyledDynamicTypographyComponent-t787b7-0 cHbulB" or @class="typography__StyledDynamicTypographyComponent-t787b7-0 bLZGOP"]'
-            tag_elements = self.driver.find_elements(By.XPATH, tag_xpath)
-            tag_labels = [element.text.strip() for element in tag_elements]
-            existing_tags = Tag.objects.filter(tag_label__in=tag_labels)
-            existing_tags_lables = set([tag.tag_label for tag in existing_tags])
-            new_tags = [Tag(tag_label=label) for label in tag_labels if label not in existing_tags_lables]
-            Tag.objects.bulk_create(new_tags)
-            
-            tags = list(existing_tags) + new_tags
-        except NoSuchElementException:
-            tags = []
-
-        return tags
-
-    def _get_news_datetime(self) -> Optional[datetime]:
-        PERSIAN_MONTHS = {
-            "فروردین": 1,
-            "اردیبهشت": 2,
-            "خرداد": 3,
-            "تیر": 4,
-            "مرداد": 5,
-            "شهریور": 6,
-            "مهر": 7,
-            "آبان": 8,
-            "آذر": 9,
-            "دی": 10,
-            "بهمن": 11,
-            "اسفند": 12
-        }
-
-        try:
-            datetime_xpath = '//span[@class="typography__StyledDynamicTypographyComponent-t787b7-0 fTxyQo fa" or @class="typography__StyledDynamicTypographyComponent-t787b7-0 cHbulB fa"]'
-            datetime_element = self.driver.find_element(By.XPATH, datetime_xpath)
-            dt = datetime_element.text.split()
-            date_time = datetime(int(dt[3]), PERSIAN_MONTHS.get(dt[2]), int(dt[1]), int(dt[-1].split(':')[0]),
-                                          int(dt[-1].split(':')[1]),
-                                          tzinfo=pytz.timezone('Asia/Tehran'))
-
-            return date_time
-
-        except NoSuchElementException:
-            return None
-
-    def _save_news(self, title, text, resource, date, tags) -> None:
-        """Saves a news item and its associated tags to the database."""
-        if not News.objects.filter(Q(title=title) | Q(resource=resource) | Q(text=text)).exists():
-            news_item = News(title=title, text=text, resource=resource, date=date)
-            news_item.save()
-            news_item.tags.set(tags)
+        with self.timings.measure('fetch'):
+            self.driver.get(url)
+            try:
+                WebDriverWait(self.driver, self.render_timeout).until(
+                    expected_conditions.presence_of_element_located((By.XPATH, rendered_xpath))
+                )
+            except TimeoutException:
+                pass
+        self.pages_loaded += 1
+        CRAWLER_PAGES.labels('selenium', 'ok').inc()
+
+    def _save_news(self, title, text, resource, date, tag_labels) -> None:
+        """Passes a news item and its tag labels to the pipeline, which saves them if the news does not exist yet."""
+        self.pipeline.add(title, text, resource, date, tag_labels)
 
     def quit(self) -> None:
-        """Shuts down the WebDriver instance."""
-        self.driver.quit()
\ No newline at end of file
+        """Saves the news left in the pipeline and returns the WebDriver instance to its pool, or shuts it down if the crawler owns it."""
+        try:
+            self.pipeline.flush()
+        finally:
+            if self.pool is not None:
+                self.pool.release(self.driver, pages=self.pages_loaded)
+            else:
+                self.driver.quit()
\ No newline at end of file
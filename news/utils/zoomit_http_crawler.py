@@ -0,0 +1,135 @@
+from news.metrics import CRAWLER_PAGES
+from .zoomit_crawler import ZoomitCrawler
+from .zoomit_parser import ZoomitParser
+from .news_pipeline import NewsPipeline
+from .snapshot_store import get_snapshot_store
+from .webdriver_pool import WebDriverPool
+from django.conf import settings
+from typing import List, Optional
+import asyncio
+import httpx
+
+
+class ZoomitHttpCrawler(ZoomitCrawler):
+    """
+    Crawler with the same interface as ZoomitCrawler which fetches pages over HTTP instead
+    of driving a browser. Pages are downloaded concurrently through one pooled asyncio HTTP
+    client and parsed by ZoomitParser. Pages which are fetched but contain no news (e.g.
+    because they are rendered by JavaScript) are handed to a Selenium ZoomitCrawler, which
+    is only started when it is needed.
+
+    Attributes:
+        concurrency: Max number of pages downloaded at the same time.
+        selenium_fallback: Whether pages without news content are retried with Selenium.
+        pool: WebDriverPool the Selenium fallback borrows its driver from, if any.
+        batch_size: Number of news pages downloaded before they are parsed.
+        pipeline: NewsPipeline saving the extracted news, shared with the Selenium fallback.
+        snapshots: SnapshotStore keeping the html of downloaded news pages, or None if CRAWLER_SNAPSHOT_DIR is not set.
+        timings: StageTimings of the fetch, parse and save stages. A fetch measurement covers a concurrent batch.
+    """
+    user_agent = 'Mozilla/5.0 (X11; Linux x86_64; TechNews crawler)'
+
+    def __init__(self, concurrency=None, timeout=None, selenium_fallback=True,
+                 pool: Optional[WebDriverPool] = None, pipeline: Optional[NewsPipeline] = None) -> None:
+        """Class constructor. Creates the pooled HTTP client and the event loop running it."""
+        self.concurrency = concurrency or settings.CRAWLER_HTTP_CONCURRENCY
+        self.selenium_fallback = selenium_fallback
+        self.pool = pool
+        self.batch_size = self.concurrency * 4
+        self.pipeline = pipeline or NewsPipeline()
+        self.timings = self.pipeline.timings
+        self.snapshots = get_snapshot_store()
+        self._fallback_crawler = None
+        self._runner = asyncio.Runner()
+        self._client = httpx.AsyncClient(
+            timeout=timeout or settings.CRAWLER_HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            headers={'User-Agent': self.user_agent},
+            follow_redirects=True,
+        )
+
+    @property
+    def fallback_crawler(self) -> ZoomitCrawler:
+        """Selenium crawler for pages which need JavaScript, started on first use."""
+        if self._fallback_crawler is None:
+            self._fallback_crawler = ZoomitCrawler(pool=self.pool, pipeline=self.pipeline)
+        return self._fallback_crawler
+
+    def collect_links(self, from_page, to_page, archive="https://www.zoomit.ir/archive/") -> List[str]:
+        """Downloads the archive pages of the range concurrently and returns the news links found on them."""
+        urls = [archive + '?pageNumber=' + str(page_number) for page_number in range(from_page, to_page + 1)]
+        collected_links = []
+        for url, page in zip(urls, self._fetch_pages(urls)):
+            if page is not None:
+                with self.timings.measure('parse'):
+                    collected_links.extend(ZoomitParser.parse_archive(page, url))
+        return collected_links
+
+    def _crawl_news(self, news_url) -> bool:
+        """Downloads and crawls a single news article, passes it to the pipeline and returns whether a news was found."""
+        return self._process_news(news_url, self._fetch_pages([news_url])[0])
+
+    def _get_archive_links(self, url) -> List[str]:
+        """Downloads an archive page and returns the links of the news listed on it."""
+        page = self._fetch_pages([url])[0]
+        if page is None:
+            return []
+        with self.timings.measure('parse'):
+            return ZoomitParser.parse_archive(page, url)
+
+    def crawl_links(self, news_links) -> int:
+        """Downloads the news pages concurrently in batches, saves the news found on them and returns their number."""
+        saved = self.pipeline.saved
+        for start in range(0, len(news_links), self.batch_size):
+            batch = news_links[start:start + self.batch_size]
+            for news_link, page in zip(batch, self._fetch_pages(batch)):
+                self._process_news(news_link, page)
+        self.pipeline.flush()
+        return self.pipeline.saved - saved
+
+    def _process_news(self, news_url, page: Optional[str]) -> bool:
+        """Extracts the news from a downloaded page and passes it to the pipeline, falling back to Selenium if the page has no news."""
+        if page is None:
+            return False
+        if super()._process_news(news_url, page):
+            return True
+        if self.selenium_fallback:
+            return self.fallback_crawler._crawl_news(news_url)
+        return False
+
+    def _fetch_pages(self, urls) -> List[Optional[str]]:
+        """Downloads the given urls concurrently and returns their html in the same order; None for failures."""
+        with self.timings.measure('fetch'):
+            return self._runner.run(self._fetch_all(urls))
+
+    async def _fetch_all(self, urls) -> List[Optional[str]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(url) -> Optional[str]:
+            async with semaphore:
+                try:
+                    response = await self._client.get(url)
+                    response.raise_for_status()
+                except httpx.HTTPError as error:
+                    print(f'Failed to fetch {url}: {error!r}')
+                    CRAWLER_PAGES.labels('http', 'error').inc()
+                    return None
+                CRAWLER_PAGES.labels('http', 'ok').inc()
+                return response.text
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+    def quit(self) -> None:
+        """Saves the news left in the pipeline and closes the HTTP connections and the Selenium fallback if it was started."""
+        # Every resource is closed even if saving the news or closing an earlier one fails.
+        try:
+            self.pipeline.flush()
+        finally:
+            try:
+                self._runner.run(self._client.aclose())
+            finally:
+                try:
+                    self._runner.close()
+                finally:
+                    if self._fallback_crawler is not None:
+                        self._fallback_crawler.quit()
@@ -0,0 +1,105 @@
+from lxml import etree, html
+from urllib.parse import urljoin
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+import pytz
+
+
+class ParsedNews(NamedTuple):
+    """Attributes of a news article extracted from a Zoomit page."""
+    title: str
+    text: str
+    date: Optional[datetime]
+    tag_labels: List[str]
+
+
+class ZoomitParser:
+    """
+    Parser extracting news links and news attributes from Zoomit html. It works on plain
+    html strings, so pages fetched over HTTP are parsed without a browser. The XPath
+    expressions are compiled once and shared by every call.
+
+    Attributes:
+        LINKS_XPATH: Selects the news links of an archive page.
+        TITLE_XPATH: Selects the title of a news page.
+        TEXT_XPATH: Selects the paragraphs and headings of a news page.
+        TAGS_XPATH: Selects the tag labels of a news page.
+        DATETIME_XPATH: Selects the publish date of a news page.
+        PERSIAN_MONTHS: Maps Persian month names to month numbers.
+    """
+    LINKS_XPATH = etree.XPath(
+        '//a[@class="link__CustomNextLink-sc-1r7l32j-0 eoKbWT BrowseArticleListItemDesktop__WrapperLink-zb6c6m-6 bzMtyO"]/@href'
+    )
+    TITLE_XPATH = etree.XPath(
+        '//h1[@class="typography__StyledDynamicTypographyComponent-t787b7-0 jQMKGt" or @class="typography__StyledDynamicTypographyComponent-t787b7-0 fzMmhL"]'
+    )
+    TEXT_XPATH = etree.XPath(
+        '//p[@class="typography__StyledDynamicTypographyComponent-t787b7-0 fZZfUi ParagraphElement__ParagraphBase-sc-1soo3i3-0 gOVZGU"] | '
+        '//h2[@class="typography__StyledDynamicTypographyComponent-t787b7-0 cAPRcR HeadingTwo__HeadingTwoBase-sc-3nstjw-1 aMVhn"] | '
+        '//span[@font-size="1.6" and @class="typography__StyledDynamicTypographyComponent-t787b7-0 fNeDiY"]'
+    )
+    TAGS_XPATH = etree.XPath(
+        '//span[@class="typography__StyledDynamicTypographyComponent-t787b7-0 cHbulB" or @class="typography__StyledDynamicTypographyComponent-t787b7-0 bLZGOP"]'
+    )
+    DATETIME_XPATH = etree.XPath(
+        '//span[@class="typography__StyledDynamicTypographyComponent-t787b7-0 fTxyQo fa" or @class="typography__StyledDynamicTypographyComponent-t787b7-0 cHbulB fa"]'
+    )
+    PERSIAN_MONTHS = {
+        "فروردین": 1,
+        "اردیبهشت": 2,
+        "خرداد": 3,
+        "تیر": 4,
+        "مرداد": 5,
+        "شهریور": 6,
+        "مهر": 7,
+        "آبان": 8,
+        "آذر": 9,
+        "دی": 10,
+        "بهمن": 11,
+        "اسفند": 12
+    }
+
+    @classmethod
+    def parse_archive(cls, page: str, base_url: str) -> List[str]:
+        """Returns the absolute urls of the news listed on an archive page."""
+        document = html.fromstring(page)
+        return [urljoin(base_url, href) for href in cls.LINKS_XPATH(document)]
+
+    @classmethod
+    def parse_news(cls, page: str) -> Optional[ParsedNews]:
+        """Returns the attributes of the news on the given page, or None if it has no title or text."""
+        document = html.fromstring(page)
+        title = cls._first_text(cls.TITLE_XPATH(document))
+        text = '\n'.join(cls._text(element) for element in cls.TEXT_XPATH(document))
+        if (not title) or (not text):
+            return None
+
+        return ParsedNews(
+            title=title,
+            text=text,
+            date=cls.parse_datetime(cls._first_text(cls.DATETIME_XPATH(document))),
+            tag_labels=[cls._text(element) for element in cls.TAGS_XPATH(document)],
+        )
+
+    @classmethod
+    def parse_datetime(cls, value: Optional[str]) -> Optional[datetime]:
+        """Converts a Zoomit date such as 'شنبه ۲۷ مرداد ۱۴۰۳ - ۱۲:۳۰' to a datetime, or returns None."""
+        if not value:
+            return None
+        try:
+            dt = value.split()
+            hour, minute = dt[-1].split(':')
+            return datetime(int(dt[3]), cls.PERSIAN_MONTHS[dt[2]], int(dt[1]), int(hour), int(minute),
+                            tzinfo=pytz.timezone('Asia/Tehran'))
+        except (IndexError, KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _text(element) -> str:
+        """Returns the whitespace-normalized text of an element, like a browser renders it."""
+        return ' '.join(element.text_content().split())
+
+    @classmethod
+    def _first_text(cls, elements) -> Optional[str]:
+        """Returns the text of the first element, or None if there is no element."""
+        return cls._text(elements[0]) if elements else None
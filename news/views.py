@@ -1,35 +1,77 @@
 from . import models, serializers
 from rest_framework.viewsets import ReadOnlyModelViewSet
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from .pagination import AsyncPageNumberPagination, NewsPagination
+from .filters import NewsSearchFilter
+from .cache import CachedResponseMixin, ConditionalGetMixin, cache_stats
+from .export import StreamingExportMixin
+from .metrics import render_metrics
+from django.db.models import OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
+from django.utils.http import quote_etag
+from django.views import View
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from datetime import datetime, time
 
 
-class NewsViewSet(ReadOnlyModelViewSet):
+class NewsViewSet(StreamingExportMixin, ConditionalGetMixin, CachedResponseMixin, ReadOnlyModelViewSet):
     """
     ViewSet for listing and retrieving news data. Providing listing,
     filtering, and searching of news list and read-only access to news items.
+    Responses are cached until the news data changes and conditional requests are answered with 304.
+    The whole filtered archive is streamed as NDJSON or CSV by the ``export`` action.
 
     Attributes:
         serializer_class: Serializer for news data.
         queryset: Queryset for retrieving all news items.
-        filter_backends: Filters for searching and filtering news items.
-        search_fields: Fields for searching in the news items.
+        filter_backends: Filters for searching and filtering news items. Searching is done by
+                         PostgreSQL full-text search over the news search vector.
+        search_fields: Fields covered by the news search vector.
         filterset_fields: Fields for filtering news items.
-        pagination_class: Control the pagination of the news list.
+        pagination_class: Control the pagination of the news list. Supports opt-in keyset
+                          pagination through the ``cursor`` query parameter.
+        deferrable_fields: Columns which are not loaded when left out by ``fields`` or ``omit``.
+        export_filename: File name of the streamed export.
     """
     serializer_class = serializers.NewsSerializer
-    queryset = models.News.objects.all().order_by('-date')
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    queryset = models.News.objects.defer('search_vector').order_by('-date', 'id')
+    filter_backends = [NewsSearchFilter, DjangoFilterBackend]
     search_fields = ('title', 'text')
     filterset_fields = ['tags', ]
-    pagination_class = PageNumberPagination
+    pagination_class = NewsPagination
+    deferrable_fields = ('title', 'text', 'resource')
+    export_filename = 'news'
 
+    def get_queryset(self):
+        """
+        Returns the news queryset without the columns which the requested fieldset leaves out.
+        Tags of the whole page are loaded in a single query when they are requested.
+        """
+        queryset = super().get_queryset()
+        selected = self.get_serializer_class().selected_fields(self.request)
+        if selected is None or 'tags' in selected:
+            queryset = queryset.prefetch_related('tags')
+        if selected is not None:
+            deferred = [name for name in self.deferrable_fields if name not in selected]
+            if deferred:
+                queryset = queryset.defer(*deferred)
+        return queryset
 
-class TagViewSet(ReadOnlyModelViewSet):
+
+class TagViewSet(ConditionalGetMixin, CachedResponseMixin, ReadOnlyModelViewSet):
     """
     ViewSet for listing and retrieving tag data. Providing listing
     and searching of tag entries and read-only access to tags.
+    Responses are cached until the tag data changes and conditional requests are answered with 304.
+    The ``popular`` action lists the tags with their news counts, most popular first. The counts
+    are maintained incrementally, so its cost does not grow with the size of the archive. Its
+    window of recent days moves at midnight without any data change, so its cache keys and
+    validators also depend on the day.
 
     Attributes:
         serializer_class: Serializer for tag data.
@@ -37,9 +79,78 @@ class TagViewSet(ReadOnlyModelViewSet):
         filter_backends: Filters for searching tag items.
         search_fields: Fields for searching in the tag items.
         pagination_class: Control the pagination of the tag list.
+        popular_sorts: Orderings of the popular tags by ``sort`` query parameter.
     """
     serializer_class = serializers.TagSerializer
     queryset = models.Tag.objects.all()
     filter_backends = [SearchFilter,]
     search_fields = ('tag_label', )
-    pagination_class = PageNumberPagination
\ No newline at end of file
+    pagination_class = AsyncPageNumberPagination
+    popular_sorts = {
+        'total': ('-news_count', 'id'),
+        'recent': ('-recent_count', '-news_count', 'id'),
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'popular':
+            queryset = self.get_popular_queryset(queryset)
+        return queryset
+
+    @action(detail=False, methods=['get'], url_path='popular', serializer_class=serializers.TagStatsSerializer)
+    def popular(self, request, *args, **kwargs):
+        """
+        Lists the tags by their total number of news, or with ``?sort=recent`` by their number
+        of news of the last ``days`` days (30 by default), together with the counts of those days.
+        """
+        return self.list(request, *args, **kwargs)
+
+    def get_cache_key(self, request, generation=None) -> str:
+        key = super().get_cache_key(request, generation)
+        if self.action == 'popular':
+            key = f'{key}:{models.TagDailyCount.window_start().isoformat()}'
+        return key
+
+    def get_validators(self, request):
+        etag, last_modified = super().get_validators(request)
+        if self.action == 'popular':
+            window_start = models.TagDailyCount.window_start().isoformat()
+            etag = quote_etag(etag.strip('"') + f'-{window_start}')
+            # The server's local midnight, the day boundary of the Persian news dates.
+            day_started = int(datetime.combine(datetime.now().date(), time.min).timestamp())
+            last_modified = max(last_modified, day_started)
+        return etag, last_modified
+
+    def get_popular_queryset(self, queryset):
+        """Annotates the tags with their counts of the requested recent days and orders them by popularity."""
+        query_params = self.request.query_params
+        sort = query_params.get('sort', 'total')
+        if sort not in self.popular_sorts:
+            raise ValidationError({'sort': f"Must be one of: {', '.join(self.popular_sorts)}."})
+        try:
+            days = int(query_params.get('days', models.TagDailyCount.KEPT_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= models.TagDailyCount.KEPT_DAYS:
+            raise ValidationError({'days': f'Must be a number from 1 to {models.TagDailyCount.KEPT_DAYS}.'})
+
+        recent = models.TagDailyCount.objects.filter(day__gte=models.TagDailyCount.window_start(days))
+        recent_count = recent.filter(tag=OuterRef('pk')).values('tag').annotate(total=Sum('count')).values('total')
+        return queryset.annotate(recent_count=Coalesce(Subquery(recent_count), 0)).prefetch_related(
+            Prefetch('daily_counts', recent.filter(count__gt=0).order_by('-day'), to_attr='recent_daily_counts')
+        ).order_by(*self.popular_sorts[sort])
+
+
+class CacheStatsView(APIView):
+    """View exposing the hit and miss counters of the API response cache."""
+
+    def get(self, request, format=None):
+        return Response(cache_stats())
+
+
+class MetricsView(View):
+    """View exposing the Prometheus metrics of the API, crawler and Celery worker processes in text format."""
+
+    def get(self, request):
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)